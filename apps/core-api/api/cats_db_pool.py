@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class PoolTimeoutError(sqlite3.OperationalError):
+    """Raised when no pooled connection became available within the acquire timeout."""
+
+
+class PoolClosedError(sqlite3.OperationalError):
+    """Raised when a connection is requested from a pool that has been shut down."""
+
+
+class ConnectionPool:
+    """
+    Bounded pool of long-lived SQLite connections for one database file.
+
+    - Connections are opened lazily up to `size` and reused LIFO so warm page caches stay hot.
+    - `on_connect` runs exactly once per physical connection (PRAGMA setup, row factory).
+    - Idle connections older than `health_check_interval` are probed with `select 1` before reuse
+      and transparently replaced when the probe fails.
+    - Thread-aware: a thread that re-enters `connection()` while already holding one gets the same
+      connection (and transaction) back instead of deadlocking on a second checkout.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        size: int,
+        *,
+        timeout: float = 30.0,
+        health_check_interval: float = 30.0,
+        busy_timeout: float = 5.0,
+        on_connect: Optional[Callable[[sqlite3.Connection], None]] = None,
+    ) -> None:
+        self.path = path
+        self.size = max(int(size), 1)
+        self._timeout = max(float(timeout), 0.0)
+        self._health_check_interval = max(float(health_check_interval), 0.0)
+        self._busy_timeout = max(float(busy_timeout), 0.0)
+        self._on_connect = on_connect
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._idle: List[Tuple[sqlite3.Connection, float]] = []
+        self._open = 0
+        self._closed = False
+        self._hits = 0
+        self._misses = 0
+        self._waits = 0
+        self._wait_time_s = 0.0
+        self._timeouts = 0
+        self._health_check_failures = 0
+
+    def _open_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self._busy_timeout, check_same_thread=False)
+        try:
+            conn.row_factory = sqlite3.Row
+            if self._on_connect is not None:
+                self._on_connect(conn)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("select 1").fetchone()
+        except sqlite3.Error:
+            return False
+        return True
+
+    def _acquire(self) -> sqlite3.Connection:
+        started = time.monotonic()
+        waited = False
+        conn: Optional[sqlite3.Connection] = None
+        last_used = 0.0
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolClosedError("CATS connection pool is closed.")
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    self._hits += 1
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    self._misses += 1
+                    break
+                if not waited:
+                    waited = True
+                    self._waits += 1
+                remaining = self._timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"Timed out after {self._timeout:.1f}s waiting for a CATS DB connection "
+                        f"(pool size {self.size})."
+                    )
+                self._cond.wait(remaining)
+            if waited:
+                self._wait_time_s += time.monotonic() - started
+
+        if conn is not None:
+            stale = (time.monotonic() - last_used) >= self._health_check_interval
+            if not stale or self._is_healthy(conn):
+                return conn
+            with self._cond:
+                self._health_check_failures += 1
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+        try:
+            return self._open_connection()
+        except BaseException:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                self._discard(conn)
+                return
+        with self._cond:
+            if not self._closed:
+                self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+                return
+            self._open -= 1
+        conn.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Check out a connection for the duration of the block.
+        The outermost block commits on success and rolls back on error.
+        """
+        held: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if held is not None:
+            yield held
+            return
+
+        conn = self._acquire()
+        self._local.conn = conn
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._local.conn = None
+            self._release(conn)
+
+    def close(self) -> None:
+        """Close idle connections now; connections still checked out are closed when returned."""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            checkouts = self._hits + self._misses
+            return {
+                "path": str(self.path),
+                "size": self.size,
+                "open": self._open,
+                "idle": len(self._idle),
+                "inUse": self._open - len(self._idle),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hitRate": (self._hits / checkouts) if checkouts else None,
+                "waits": self._waits,
+                "waitTimeMsTotal": round(self._wait_time_s * 1000.0, 3),
+                "timeouts": self._timeouts,
+                "healthCheckFailures": self._health_check_failures,
+                "closed": self._closed,
+            }
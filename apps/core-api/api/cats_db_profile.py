@@ -0,0 +1,161 @@
+"""
+Storage profiles for the CATS registry SQLite database.
+
+Selected with RGPT_CATS_DB_PROFILE (next to RGPT_CATS_DB_PATH):
+
+- default          rollback journal, synchronous=FULL. Matches the historical behaviour.
+- high-throughput  WAL, synchronous=NORMAL, 256 MiB mmap, 64 MiB page cache, passive checkpoint
+                   every 30s. Readers never block on writers; a power loss can drop the last
+                   few committed transactions but never corrupts the database.
+- max-durability   WAL, synchronous=FULL, no mmap, truncating checkpoint every 10s. Every commit
+                   is fsynced before it is acknowledged; readers still do not block on writers.
+
+See docs/modules/cats/CATS_REGISTRY_STORAGE.md and benchmarks/bench_cats_db_profiles.py.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, ContextManager, Dict, Optional
+
+DEFAULT_PROFILE = "default"
+
+
+class StorageConfigError(RuntimeError):
+    """The CATS storage configuration is invalid. A deployment problem, never a client error."""
+
+
+@dataclass(frozen=True)
+class StorageProfile:
+    name: str
+    journal_mode: str
+    synchronous: str
+    mmap_size: int
+    cache_size_kib: int
+    busy_timeout_ms: int
+    wal_autocheckpoint_pages: int
+    checkpoint_interval_s: float
+    checkpoint_mode: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+PROFILES: Dict[str, StorageProfile] = {
+    "default": StorageProfile(
+        name="default",
+        journal_mode="delete",
+        synchronous="full",
+        mmap_size=0,
+        cache_size_kib=2000,
+        busy_timeout_ms=5000,
+        wal_autocheckpoint_pages=1000,
+        checkpoint_interval_s=0.0,
+        checkpoint_mode="passive",
+    ),
+    "high-throughput": StorageProfile(
+        name="high-throughput",
+        journal_mode="wal",
+        synchronous="normal",
+        mmap_size=256 * 1024 * 1024,
+        cache_size_kib=64 * 1024,
+        busy_timeout_ms=5000,
+        wal_autocheckpoint_pages=1000,
+        checkpoint_interval_s=30.0,
+        checkpoint_mode="passive",
+    ),
+    "max-durability": StorageProfile(
+        name="max-durability",
+        journal_mode="wal",
+        synchronous="full",
+        mmap_size=0,
+        cache_size_kib=16 * 1024,
+        busy_timeout_ms=10000,
+        wal_autocheckpoint_pages=1000,
+        checkpoint_interval_s=10.0,
+        checkpoint_mode="truncate",
+    ),
+}
+
+
+def resolve_profile(name: Optional[str] = None) -> StorageProfile:
+    raw = name if name is not None else os.getenv("RGPT_CATS_DB_PROFILE", "")
+    key = (raw or "").strip().lower() or DEFAULT_PROFILE
+    profile = PROFILES.get(key)
+    if profile is None:
+        raise StorageConfigError(f"Unknown RGPT_CATS_DB_PROFILE '{raw}'. Allowed: {sorted(PROFILES)}")
+    return profile
+
+
+def apply_database_settings(conn: sqlite3.Connection, profile: StorageProfile) -> None:
+    """Database-level settings persisted in the file; run once when the store opens."""
+    conn.execute(f"pragma journal_mode = {profile.journal_mode};").fetchone()
+
+
+def apply_connection_settings(conn: sqlite3.Connection, profile: StorageProfile) -> None:
+    """Per-connection settings; run once for every physical connection."""
+    conn.execute(f"pragma synchronous = {profile.synchronous};")
+    conn.execute(f"pragma busy_timeout = {int(profile.busy_timeout_ms)};")
+    conn.execute(f"pragma cache_size = -{int(profile.cache_size_kib)};")
+    conn.execute(f"pragma mmap_size = {int(profile.mmap_size)};").fetchall()
+    if profile.journal_mode == "wal":
+        conn.execute(f"pragma wal_autocheckpoint = {int(profile.wal_autocheckpoint_pages)};").fetchall()
+
+
+class CheckpointScheduler:
+    """Runs `pragma wal_checkpoint(<mode>)` on a fixed interval from a daemon thread."""
+
+    def __init__(
+        self,
+        connection: Callable[[], ContextManager[sqlite3.Connection]],
+        profile: StorageProfile,
+    ) -> None:
+        self._connection = connection
+        self._profile = profile
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._runs = 0
+        self._errors = 0
+        self._last_result: Optional[Dict[str, int]] = None
+
+    @staticmethod
+    def enabled_for(profile: StorageProfile) -> bool:
+        return profile.journal_mode == "wal" and profile.checkpoint_interval_s > 0
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="cats-db-checkpoint", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def checkpoint(self) -> Dict[str, int]:
+        with self._connection() as conn:
+            row = conn.execute(f"pragma wal_checkpoint({self._profile.checkpoint_mode});").fetchone()
+        result = {"busy": int(row[0]), "walPages": int(row[1]), "checkpointedPages": int(row[2])}
+        self._runs += 1
+        self._last_result = result
+        return result
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self._profile.checkpoint_interval_s):
+            try:
+                self.checkpoint()
+            except sqlite3.Error:
+                self._errors += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "intervalS": self._profile.checkpoint_interval_s,
+            "mode": self._profile.checkpoint_mode,
+            "runs": self._runs,
+            "errors": self._errors,
+            "last": self._last_result,
+        }
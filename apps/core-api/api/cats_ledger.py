@@ -1,15 +1,34 @@
 from __future__ import annotations
 
+import atexit
 import json
 import os
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from threading import Lock
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from api.cats_ledger_segments import DEFAULT_INDEX_EVERY, SegmentedLedger, iter_ledger_lines
+from api.cats_ledger_writer import FSYNC_POLICIES, GroupCommitWriter
 
 _WRITE_LOCK = Lock()
+_WRITER_LOCK = Lock()
+_WRITER: Optional[GroupCommitWriter] = None
+_LEDGERS: Dict[Path, SegmentedLedger] = {}
+
+# RGPT_CATS_LEDGER_MODE: "direct" appends and flushes under a process lock on every call (default);
+# "group" hands events to a background GroupCommitWriter that batches them before flushing.
+LEDGER_MODES = ("direct", "group")
+DEFAULT_GROUP_MAX_BATCH = 256
+DEFAULT_GROUP_FLUSH_MS = 5.0
+DEFAULT_GROUP_ACK_TIMEOUT_S = 10.0
+# Segment rotation; 0 disables the trigger. The active segment keeps the configured ledger path.
+DEFAULT_SEGMENT_MAX_BYTES = 0
+DEFAULT_SEGMENT_MAX_AGE_S = 0.0
 
 
+@lru_cache(maxsize=1)
 def _repo_root() -> Path:
     current = Path(__file__).resolve().parent
     while True:
@@ -28,18 +47,133 @@ def _ledger_path() -> Path:
     return _repo_root() / "docs" / "ops" / "ledgers" / "runtime" / "CATS_GOVERNANCE.jsonl"
 
 
-def append_cats_event(event: Dict[str, Any]) -> bool:
+def _env_number(name: str, default: float) -> float:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def _ledger_mode() -> str:
+    mode = os.getenv("RGPT_CATS_LEDGER_MODE", "").strip().lower() or "direct"
+    return mode if mode in LEDGER_MODES else "direct"
+
+
+def _get_ledger(path: Path) -> SegmentedLedger:
+    max_bytes = int(_env_number("RGPT_CATS_LEDGER_SEGMENT_MAX_BYTES", DEFAULT_SEGMENT_MAX_BYTES))
+    max_age_s = _env_number("RGPT_CATS_LEDGER_SEGMENT_MAX_AGE_S", DEFAULT_SEGMENT_MAX_AGE_S)
+    index_every = int(_env_number("RGPT_CATS_LEDGER_INDEX_EVERY", DEFAULT_INDEX_EVERY))
+    settings = (path, max(max_bytes, 0), max(max_age_s, 0.0), max(index_every, 1))
+    with _WRITER_LOCK:
+        ledger = _LEDGERS.get(path)
+        if ledger is None or ledger.settings != settings:
+            if ledger is not None:
+                ledger.close()
+            ledger = SegmentedLedger(path, max_bytes=max_bytes, max_age_s=max_age_s, index_every=index_every)
+            _LEDGERS[path] = ledger
+        return ledger
+
+
+def _get_writer(path: Path) -> GroupCommitWriter:
+    global _WRITER
+    ledger = _get_ledger(path)
+    fsync = os.getenv("RGPT_CATS_LEDGER_FSYNC", "").strip().lower() or "batch"
+    if fsync not in FSYNC_POLICIES:
+        fsync = "batch"
+    max_batch = int(_env_number("RGPT_CATS_LEDGER_BATCH_MAX", DEFAULT_GROUP_MAX_BATCH))
+    flush_s = _env_number("RGPT_CATS_LEDGER_FLUSH_MS", DEFAULT_GROUP_FLUSH_MS) / 1000.0
+    writer = _WRITER
+    settings = (ledger, fsync, max(max_batch, 1), max(flush_s, 0.0))
+    if writer is not None and not writer.closed and _writer_settings(writer) == settings:
+        return writer
+    with _WRITER_LOCK:
+        if _WRITER is None or _WRITER.closed or _writer_settings(_WRITER) != settings:
+            if _WRITER is not None:
+                _WRITER.close()
+            _WRITER = GroupCommitWriter(ledger, max_batch=max_batch, flush_interval_s=flush_s, fsync=fsync)
+        return _WRITER
+
+
+def _writer_settings(writer: GroupCommitWriter) -> tuple[SegmentedLedger, str, int, float]:
+    return (writer.ledger, writer.fsync, writer.max_batch, writer.flush_interval_s)
+
+
+def close_ledger_writer() -> None:
+    """Drain and close the group-commit writer, if one is running, and close open ledger segments."""
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is not None:
+            _WRITER.close()
+            _WRITER = None
+        for ledger in _LEDGERS.values():
+            ledger.close()
+        _LEDGERS.clear()
+
+
+def get_ledger_writer_metrics() -> Dict[str, Any]:
+    """Writer and segment counters; the ledger path is left out."""
+    writer = _WRITER
+    ledger = _LEDGERS.get(_ledger_path())
+    writer_metrics = writer.metrics() if writer is not None and not writer.closed else None
+    if writer_metrics is not None:
+        writer_metrics.pop("path", None)
+    return {
+        "mode": _ledger_mode(),
+        "writer": writer_metrics,
+        "segments": ledger.metrics() if ledger is not None else None,
+    }
+
+
+def iter_cats_events(
+    from_seq: Optional[int] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> Iterator[Tuple[int, bytes]]:
+    """Raw (seq, line) pairs from the governance ledger, seeking via the segment indexes."""
+    return iter_ledger_lines(_ledger_path(), from_seq=from_seq, since=since, until=until)
+
+
+atexit.register(close_ledger_writer)
+
+
+def _event_line(event: Dict[str, Any], ts: str) -> str:
     payload = {
-        "ts": datetime.now(timezone.utc).isoformat(),
+        "ts": ts,
         **event,
     }
-    path = _ledger_path()
-    line = json.dumps(payload, separators=(",", ":"), ensure_ascii=False) + "\n"
-    try:
-        with _WRITE_LOCK:
-            path.parent.mkdir(parents=True, exist_ok=True)
-            with path.open("a", encoding="utf-8") as handle:
-                handle.write(line)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+
+def append_cats_event(event: Dict[str, Any]) -> bool:
+    return append_cats_events([event])
+
+
+def append_cats_events(events: List[Dict[str, Any]]) -> bool:
+    """
+    Append several events with one lock acquisition and one write; all share the same timestamp.
+    In group mode this returns only after the batch holding the events has been written (and
+    fsynced, per RGPT_CATS_LEDGER_FSYNC), or False on error or ack timeout.
+    """
+    if not events:
         return True
-    except OSError:
-        return False
+    ts = datetime.now(timezone.utc).isoformat()
+    path = _ledger_path()
+    data = "".join(_event_line(event, ts) for event in events)
+    if _ledger_mode() == "group":
+        ticket = _get_writer(path).submit(data.encode("utf-8"))
+        return ticket.wait(_env_number("RGPT_CATS_LEDGER_ACK_TIMEOUT_S", DEFAULT_GROUP_ACK_TIMEOUT_S))
+    ledger = _get_ledger(path)
+    with _WRITE_LOCK:
+        try:
+            ledger.append(data.encode("utf-8"))
+            ledger.flush()
+            return True
+        except OSError:
+            try:
+                ledger.reset()
+            except OSError:
+                pass
+            return False
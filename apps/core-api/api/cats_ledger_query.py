@@ -0,0 +1,132 @@
+"""
+Streaming filtered reads over the CATS governance ledger.
+
+Events are matched in three steps, cheapest first:
+  1. the segment indexes seek to the cursor / `since` position and stop before segments that start after `until`;
+  2. each raw line must contain the exact serialized `"field":value` bytes of every equality filter
+     (the ledger is written with compact separators, so this is a byte-substring test);
+  3. only lines that pass are parsed with `json.loads` and checked exactly.
+The ts range is checked on the raw `"ts"` value before parsing as well.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from api.cats_ledger import iter_cats_events
+from api.cats_ledger_segments import event_ts, ts_key
+
+DEFAULT_EVENT_LIMIT = 100
+MAX_EVENT_LIMIT = 1000
+
+
+@dataclass(frozen=True)
+class EventFilter:
+    org_id: Optional[str] = None
+    cat_id: Optional[str] = None
+    event_types: Tuple[str, ...] = ()
+    since: Optional[str] = None
+    until: Optional[str] = None
+
+
+def _needle(field: str, value: str) -> bytes:
+    return (json.dumps(field) + ":" + json.dumps(value, ensure_ascii=False)).encode("utf-8")
+
+
+def parse_ts_bound(name: str, value: Optional[str]) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    key = ts_key(value)
+    if key is None:
+        raise ValueError(f"Invalid {name} timestamp '{value}'. Use ISO-8601, e.g. 2026-01-31T00:00:00Z.")
+    return key
+
+
+def decode_event_cursor(cursor: Optional[str]) -> Optional[int]:
+    if cursor is None or cursor == "":
+        return None
+    try:
+        seq = int(cursor)
+    except ValueError as exc:
+        raise ValueError("Invalid cursor.") from exc
+    if seq < 0:
+        raise ValueError("Invalid cursor.")
+    return seq
+
+
+def _matches(event: Dict[str, Any], flt: EventFilter) -> bool:
+    if flt.org_id is not None and event.get("org_id") != flt.org_id:
+        return False
+    if flt.event_types and event.get("event_type") not in flt.event_types:
+        return False
+    if flt.cat_id is not None:
+        payload = event.get("payload")
+        if not isinstance(payload, dict) or payload.get("catId") != flt.cat_id:
+            return False
+    return True
+
+
+def stream_events(
+    flt: EventFilter,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_EVENT_LIMIT,
+) -> Iterator[bytes]:
+    """
+    Yield matching ledger lines as NDJSON (unchanged bytes), then one trailing
+    `{"nextCursor": "<seq>", "hasMore": bool, "scanned": n, "matched": m}` line.
+    Pass `nextCursor` back as `cursor` to continue after the last line that was read.
+    Raises ValueError for a bad cursor or ts bound before anything is yielded.
+    """
+    from_seq = decode_event_cursor(cursor)
+    since_key = parse_ts_bound("since", flt.since)
+    until_key = parse_ts_bound("until", flt.until)
+    limit = max(1, min(int(limit), MAX_EVENT_LIMIT))
+
+    required: List[bytes] = []
+    if flt.org_id is not None:
+        required.append(_needle("org_id", flt.org_id))
+    if flt.cat_id is not None:
+        required.append(_needle("catId", flt.cat_id))
+    any_type: Sequence[bytes] = [_needle("event_type", t) for t in flt.event_types]
+
+    return _stream(flt, from_seq, since_key, until_key, limit, required, any_type)
+
+
+def _stream(
+    flt: EventFilter,
+    from_seq: Optional[int],
+    since_key: Optional[float],
+    until_key: Optional[float],
+    limit: int,
+    required: List[bytes],
+    any_type: Sequence[bytes],
+) -> Iterator[bytes]:
+    next_seq = from_seq or 0
+    scanned = 0
+    matched = 0
+    has_more = False
+    for seq, line in iter_cats_events(from_seq=from_seq, since=flt.since, until=flt.until):
+        if matched >= limit:
+            has_more = True
+            break
+        scanned += 1
+        next_seq = seq + 1
+        if any(needle not in line for needle in required):
+            continue
+        if any_type and not any(needle in line for needle in any_type):
+            continue
+        if since_key is not None or until_key is not None:
+            key = ts_key(event_ts(line))
+            if key is None or (since_key is not None and key < since_key) or (until_key is not None and key > until_key):
+                continue
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(event, dict) or not _matches(event, flt):
+            continue
+        matched += 1
+        yield line
+    trailer = {"nextCursor": str(next_seq), "hasMore": has_more, "scanned": scanned, "matched": matched}
+    yield (json.dumps(trailer, separators=(",", ":")) + "\n").encode("utf-8")
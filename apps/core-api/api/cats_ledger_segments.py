@@ -0,0 +1,498 @@
+"""
+Segmented JSONL ledgers with a sparse sidecar offset index.
+
+Layout for a ledger at `<dir>/NAME.jsonl`:
+
+  NAME.jsonl                    active segment (appended to; same path readers always used)
+  NAME.jsonl.idx                sparse index for the active segment
+  NAME.jsonl.lock               advisory lock file serializing writer processes
+  NAME.000000001024.jsonl       sealed segment whose first event has sequence number 1024
+  NAME.000000001024.jsonl.idx   its index
+
+Sequence numbers are the 0-based ordinal of an event across all segments. Each index line is
+`{"seq": <n>, "offset": <byte offset of the event line>, "ts": <event ts>}` and is written for the
+first event of a segment and then every `index_every` events, so a reader can binary-search to the
+nearest indexed event before a sequence number or timestamp and scan forward from there.
+Readers never write an index: where one is missing they count lines in memory, and the writer
+rebuilds it under the ledger lock the next time it recovers.
+
+Indexes can also be built for ledgers written by other runtimes (EXECUTION_GUARD, POLICY_GATE, ...):
+
+  cd apps/core-api && python -m api.cats_ledger_segments index ../../docs/ops/ledgers/runtime/EXECUTION_GUARD.jsonl
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: single writer process only
+    fcntl = None  # type: ignore[assignment]
+
+INDEX_SUFFIX = ".idx"
+LOCK_SUFFIX = ".lock"
+DEFAULT_INDEX_EVERY = 64
+
+_TS_RE = re.compile(rb'"ts"\s*:\s*"([^"]+)"')
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    seq: int
+    offset: int
+    ts: Optional[str]
+
+
+def index_path(segment_path: Path) -> Path:
+    return segment_path.with_name(segment_path.name + INDEX_SUFFIX)
+
+
+def sealed_segment_path(base: Path, first_seq: int) -> Path:
+    return base.with_name(f"{base.stem}.{first_seq:012d}{base.suffix}")
+
+
+def list_sealed_segments(base: Path) -> List[Tuple[int, Path]]:
+    """Sealed segments of `base` as (first_seq, path), oldest first."""
+    pattern = re.compile(rf"^{re.escape(base.stem)}\.(\d{{12}}){re.escape(base.suffix)}$")
+    found: List[Tuple[int, Path]] = []
+    if not base.parent.is_dir():
+        return found
+    with os.scandir(base.parent) as entries:
+        for entry in entries:
+            match = pattern.match(entry.name)
+            if match and entry.is_file():
+                found.append((int(match.group(1)), Path(entry.path)))
+    found.sort()
+    return found
+
+
+def event_ts(line: bytes) -> Optional[str]:
+    match = _TS_RE.search(line)
+    return match.group(1).decode("utf-8", "replace") if match else None
+
+
+def ts_key(ts: Optional[str]) -> Optional[float]:
+    """Comparable epoch seconds for an ISO-8601 timestamp (accepts a trailing Z); None if unparseable."""
+    if not ts:
+        return None
+    try:
+        parsed = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def read_index(segment_path: Path) -> List[IndexEntry]:
+    """Load a sidecar index; returns [] when it is missing or does not match the segment on disk."""
+    try:
+        raw = index_path(segment_path).read_bytes()
+        size = segment_path.stat().st_size
+    except OSError:
+        return []
+    entries: List[IndexEntry] = []
+    for line in raw.splitlines():
+        try:
+            obj = json.loads(line)
+            entry = IndexEntry(seq=int(obj["seq"]), offset=int(obj["offset"]), ts=obj.get("ts"))
+        except (ValueError, KeyError, TypeError):
+            continue
+        if entries and (entry.seq <= entries[-1].seq or entry.offset <= entries[-1].offset):
+            return []
+        entries.append(entry)
+    if entries and entries[-1].offset >= size:
+        return []
+    return entries
+
+
+def _index_line(entry: IndexEntry) -> bytes:
+    return (json.dumps({"seq": entry.seq, "offset": entry.offset, "ts": entry.ts}, separators=(",", ":")) + "\n").encode(
+        "utf-8"
+    )
+
+
+def iter_segment_lines(segment_path: Path, start_offset: int = 0) -> Iterator[Tuple[int, bytes]]:
+    """Yield (offset, line) for complete lines from `start_offset`; a torn trailing line is skipped."""
+    with segment_path.open("rb") as handle:
+        if start_offset:
+            handle.seek(start_offset - 1)
+            if handle.read(1) != b"\n":
+                # Index offset no longer lands on a line boundary; fall back to a full scan.
+                start_offset = 0
+                handle.seek(0)
+        offset = start_offset
+        for line in handle:
+            if not line.endswith(b"\n"):
+                return
+            yield offset, line
+            offset += len(line)
+
+
+def scan_index(segment_path: Path, first_seq: int = 0, every: int = DEFAULT_INDEX_EVERY) -> Tuple[List[IndexEntry], int]:
+    """Scan a segment and return (entries, next_seq) without writing anything."""
+    every = max(int(every), 1)
+    entries: List[IndexEntry] = []
+    seq = first_seq
+    for offset, line in iter_segment_lines(segment_path):
+        if (seq - first_seq) % every == 0:
+            entries.append(IndexEntry(seq=seq, offset=offset, ts=event_ts(line)))
+        seq += 1
+    return entries, seq
+
+
+def build_index(segment_path: Path, first_seq: int = 0, every: int = DEFAULT_INDEX_EVERY) -> Tuple[List[IndexEntry], int]:
+    """
+    Scan a segment, write its sidecar index atomically, and return (entries, next_seq). Writers call
+    this under the ledger lock; the tmp file is unique so concurrent builders never share it.
+    """
+    entries, next_seq = scan_index(segment_path, first_seq, every)
+    target = index_path(segment_path)
+    fd, tmp = tempfile.mkstemp(prefix=target.name + ".", suffix=".tmp", dir=str(target.parent))
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(b"".join(_index_line(entry) for entry in entries))
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return entries, next_seq
+
+
+def _segment_next_seq(segment_path: Path, first_seq: int, entries: List[IndexEntry]) -> int:
+    """Sequence number after a segment's last event, counted in memory; never writes an index."""
+    if not entries:
+        return first_seq + sum(1 for _ in iter_segment_lines(segment_path))
+    last = entries[-1]
+    return last.seq + sum(1 for _ in iter_segment_lines(segment_path, last.offset))
+
+
+def _seek_entry(entries: List[IndexEntry], from_seq: Optional[int], since_key: Optional[float]) -> Optional[IndexEntry]:
+    """Last index entry that is guaranteed to precede the requested position."""
+    if not entries:
+        return None
+    candidate = entries[0]
+    if from_seq is not None:
+        pos = bisect.bisect_right([e.seq for e in entries], from_seq) - 1
+        if pos >= 0:
+            candidate = entries[pos]
+    if since_key is not None:
+        # Timestamps are nearly but not strictly monotonic; stop at the last entry strictly before `since`.
+        best = entries[0]
+        for entry in entries:
+            key = ts_key(entry.ts)
+            if key is None or key >= since_key:
+                break
+            best = entry
+        if best.seq > candidate.seq:
+            candidate = best
+    return candidate
+
+
+def iter_ledger_lines(
+    base: Path,
+    from_seq: Optional[int] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> Iterator[Tuple[int, bytes]]:
+    """
+    Yield (seq, raw line) across sealed segments then the active one, seeking via the sparse indexes.
+    Lines before `from_seq` are skipped. `since` only moves the starting point and `until` only stops
+    before segments that start after it; callers still filter individual lines by ts.
+    """
+    since_key = ts_key(since)
+    until_key = ts_key(until)
+    resolved = [(first_seq, path, read_index(path)) for first_seq, path in list_sealed_segments(base)]
+    if base.is_file():
+        entries = read_index(base)
+        if entries:
+            active_first = entries[0].seq
+        elif resolved:
+            last_first, last_path, last_entries = resolved[-1]
+            active_first = _segment_next_seq(last_path, last_first, last_entries)
+        else:
+            active_first = 0
+        resolved.append((active_first, base, entries))
+
+    start = 0
+    for i, (first_seq, _, entries) in enumerate(resolved):
+        if from_seq is not None and first_seq <= from_seq:
+            start = max(start, i)
+        first_key = ts_key(entries[0].ts) if entries else None
+        if since_key is not None and first_key is not None and first_key < since_key:
+            start = max(start, i)
+
+    for first_seq, path, entries in resolved[start:]:
+        first_key = ts_key(entries[0].ts) if entries else None
+        if until_key is not None and first_key is not None and first_key > until_key:
+            return
+        entry = _seek_entry(entries, from_seq, since_key)
+        offset = entry.offset if entry is not None else 0
+        seq = entry.seq if entry is not None else first_seq
+        first_line = True
+        try:
+            for line_offset, line in iter_segment_lines(path, offset):
+                if first_line:
+                    first_line = False
+                    if line_offset != offset:
+                        # The boundary check rejected the index offset; counting restarts at the segment start.
+                        seq = first_seq
+                if from_seq is None or seq >= from_seq:
+                    yield seq, line
+                seq += 1
+        except FileNotFoundError:
+            # Rotated away between listing and opening; the sealed copy is picked up on the next read.
+            continue
+
+
+class SegmentedLedger:
+    """
+    Appender for a segmented ledger. Keeps one open handle on the active segment and its index,
+    assigns sequence numbers, and seals the active segment once it exceeds `max_bytes` or `max_age_s`
+    (0 disables either trigger).
+
+    Several processes (e.g. uvicorn workers) may append to the same ledger: recovery, rotation and
+    every append run under an exclusive flock on `NAME.jsonl.lock`, and appended lines reach the OS
+    before the lock is released. If the active file changed size or was replaced by another writer,
+    state is recovered from disk before the next append. Without fcntl (Windows) there is no
+    cross-process lock, so run a single writer process per ledger there.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_bytes: int = 0,
+        max_age_s: float = 0.0,
+        index_every: int = DEFAULT_INDEX_EVERY,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max(int(max_bytes), 0)
+        self.max_age_s = max(float(max_age_s), 0.0)
+        self.index_every = max(int(index_every), 1)
+        self._lock = threading.RLock()
+        self._handle: Optional[BinaryIO] = None
+        self._index_handle: Optional[BinaryIO] = None
+        self._size = 0
+        self._first_seq = 0
+        self._next_seq = 0
+        self._since_index = 0
+        self._segment_started: Optional[float] = None
+        self._rotations = 0
+        self._lock_fd: Optional[int] = None
+        with self._exclusive():
+            self._recover()
+
+    @property
+    def settings(self) -> Tuple[Path, int, float, int]:
+        return (self.path, self.max_bytes, self.max_age_s, self.index_every)
+
+    @property
+    def next_seq(self) -> int:
+        return self._next_seq
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """Thread lock plus the cross-process flock; not re-entrant, so take it once per operation."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            if self._lock_fd is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                lock_path = self.path.with_name(self.path.name + LOCK_SUFFIX)
+                self._lock_fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _recover(self) -> None:
+        """Rebuild state from disk; caller holds `_exclusive()`."""
+        self._close_handles()
+        sealed = list_sealed_segments(self.path)
+        sealed_end = 0
+        if sealed:
+            last_first, last_path = sealed[-1]
+            sealed_entries = read_index(last_path)
+            if sealed_entries:
+                sealed_end = _segment_next_seq(last_path, last_first, sealed_entries)
+            else:
+                # Restore a missing sealed index while we hold the lock; readers only count lines.
+                sealed_end = build_index(last_path, last_first, self.index_every)[1]
+        size = self.path.stat().st_size if self.path.is_file() else 0
+        if size == 0:
+            self._first_seq = self._next_seq = sealed_end
+            self._size = 0
+            self._since_index = 0
+            self._segment_started = None
+            if index_path(self.path).exists():
+                index_path(self.path).unlink()
+            return
+        entries = read_index(self.path)
+        if not entries or entries[0].seq != sealed_end:
+            entries, _ = build_index(self.path, sealed_end, self.index_every)
+        self._first_seq = entries[0].seq if entries else sealed_end
+        last = entries[-1] if entries else IndexEntry(seq=sealed_end, offset=0, ts=None)
+        tail = 0
+        end = last.offset
+        for offset, line in iter_segment_lines(self.path, last.offset):
+            tail += 1
+            end = offset + len(line)
+        if end < size:
+            # Drop a torn trailing line so the next append starts on a line boundary.
+            with self.path.open("r+b") as handle:
+                handle.truncate(end)
+        self._next_seq = last.seq + tail
+        self._since_index = max(tail - 1, 0)
+        self._size = end
+        self._segment_started = ts_key(entries[0].ts) if entries else None
+
+    def _open(self) -> BinaryIO:
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = self.path.open("ab")
+            self._index_handle = index_path(self.path).open("ab")
+        return self._handle
+
+    def _is_stale(self) -> bool:
+        """True when the active file was replaced, removed or written to by someone else."""
+        assert self._handle is not None
+        held = os.fstat(self._handle.fileno())
+        try:
+            current = os.stat(self.path)
+        except FileNotFoundError:
+            return True
+        return (held.st_dev, held.st_ino) != (current.st_dev, current.st_ino) or held.st_size != self._size
+
+    def _needs_rotation(self, now: float) -> bool:
+        if self._size == 0:
+            return False
+        if self.max_bytes and self._size >= self.max_bytes:
+            return True
+        if self.max_age_s and self._segment_started is not None and now - self._segment_started >= self.max_age_s:
+            return True
+        return False
+
+    def _rotate(self) -> None:
+        self._close_handles()
+        target = sealed_segment_path(self.path, self._first_seq)
+        os.replace(self.path, target)
+        if index_path(self.path).exists():
+            os.replace(index_path(self.path), index_path(target))
+        self._first_seq = self._next_seq
+        self._size = 0
+        self._since_index = 0
+        self._segment_started = None
+        self._rotations += 1
+
+    def append(self, data: bytes) -> None:
+        """
+        Append one or more newline-terminated event lines. They are handed to the OS before the
+        writer lock is released; call `flush(fsync=True)` to make them durable.
+        """
+        with self._exclusive():
+            # Another writer may have appended or rotated since this process last held the lock.
+            if self._handle is None or self._is_stale():
+                self._recover()
+            now = time.time()
+            for line in data.splitlines(keepends=True):
+                if not line.endswith(b"\n"):
+                    line += b"\n"
+                if self._needs_rotation(now):
+                    self._rotate()
+                handle = self._open()
+                if self._size == 0 or self._since_index >= self.index_every - 1:
+                    ts = event_ts(line)
+                    assert self._index_handle is not None
+                    self._index_handle.write(_index_line(IndexEntry(seq=self._next_seq, offset=self._size, ts=ts)))
+                    self._since_index = 0
+                    if self._size == 0:
+                        self._segment_started = ts_key(ts) or now
+                else:
+                    self._since_index += 1
+                handle.write(line)
+                self._size += len(line)
+                self._next_seq += 1
+            self._flush_handles()
+
+    def _flush_handles(self, fsync: bool = False) -> None:
+        for handle in (self._handle, self._index_handle):
+            if handle is None:
+                continue
+            handle.flush()
+            if fsync:
+                os.fsync(handle.fileno())
+
+    def flush(self, fsync: bool = False) -> None:
+        with self._lock:
+            self._flush_handles(fsync)
+
+    def _close_handles(self) -> None:
+        for handle in (self._handle, self._index_handle):
+            if handle is None:
+                continue
+            try:
+                handle.close()
+            except OSError:
+                pass
+        self._handle = None
+        self._index_handle = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_handles()
+            if self._lock_fd is not None:
+                os.close(self._lock_fd)
+                self._lock_fd = None
+
+    def reset(self) -> None:
+        """Forget cached state after a failed write; it is rebuilt from disk on the next append."""
+        with self._exclusive():
+            self._recover()
+
+    def metrics(self) -> dict:
+        return {
+            "activeBytes": self._size,
+            "firstSeq": self._first_seq,
+            "nextSeq": self._next_seq,
+            "rotations": self._rotations,
+            "maxBytes": self.max_bytes,
+            "maxAgeS": self.max_age_s,
+            "indexEvery": self.index_every,
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Maintain sparse offset indexes for JSONL ledgers.")
+    sub = ap.add_subparsers(dest="command", required=True)
+    index_cmd = sub.add_parser("index", help="(Re)build the .idx sidecar for one or more ledger files")
+    index_cmd.add_argument("paths", nargs="+")
+    index_cmd.add_argument("--every", type=int, default=DEFAULT_INDEX_EVERY)
+    args = ap.parse_args(argv)
+
+    for raw in args.paths:
+        path = Path(raw)
+        entries, next_seq = build_index(path, 0, args.every)
+        print(f"{path}: {next_seq} events, {len(entries)} index entries")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from api.cats_ledger_segments import SegmentedLedger
+
+FSYNC_POLICIES = ("none", "batch", "event")
+
+
+class LedgerTicket:
+    """Completion handle for one submitted write; `wait()` returns True once its batch is durable."""
+
+    __slots__ = ("_done", "ok", "enqueued_at")
+
+    def __init__(self) -> None:
+        self._done = threading.Event()
+        self.ok = False
+        self.enqueued_at = time.monotonic()
+
+    def resolve(self, ok: bool) -> None:
+        self.ok = ok
+        self._done.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        if not self._done.wait(timeout):
+            return False
+        return self.ok
+
+
+class GroupCommitWriter:
+    """
+    Background group-commit writer for one (segmented) append-only JSONL ledger.
+
+    Callers `submit()` pre-serialized lines and block on the returned ticket. A single writer thread
+    drains the queue in batches into the ledger's long-lived handle, flushing when `max_batch` entries
+    are queued or when the oldest entry has waited `flush_interval_s`, whichever comes first.
+
+    fsync policy:
+      none   flush to the OS page cache only
+      batch  one fsync per batch (default)
+      event  one fsync per submitted entry
+    """
+
+    def __init__(
+        self,
+        ledger: SegmentedLedger,
+        *,
+        max_batch: int = 256,
+        flush_interval_s: float = 0.005,
+        fsync: str = "batch",
+    ) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown ledger fsync policy '{fsync}'. Allowed: {list(FSYNC_POLICIES)}")
+        self.ledger = ledger
+        self.max_batch = max(int(max_batch), 1)
+        self.flush_interval_s = max(float(flush_interval_s), 0.0)
+        self.fsync = fsync
+        self._cond = threading.Condition()
+        self._queue: Deque[tuple[bytes, LedgerTicket]] = deque()
+        self._closing = False
+        self._batches = 0
+        self._entries = 0
+        self._bytes = 0
+        self._fsyncs = 0
+        self._errors = 0
+        self._max_batch_seen = 0
+        self._thread = threading.Thread(target=self._run, name="cats-ledger-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, data: bytes) -> LedgerTicket:
+        ticket = LedgerTicket()
+        with self._cond:
+            if self._closing:
+                ticket.resolve(False)
+                return ticket
+            self._queue.append((data, ticket))
+            self._cond.notify()
+        return ticket
+
+    def _next_batch(self) -> List[tuple[bytes, LedgerTicket]]:
+        with self._cond:
+            while not self._queue and not self._closing:
+                self._cond.wait()
+            if not self._queue:
+                return []
+            deadline = self._queue[0][1].enqueued_at + self.flush_interval_s
+            while len(self._queue) < self.max_batch and not self._closing:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            count = min(len(self._queue), self.max_batch)
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _write_batch(self, batch: List[tuple[bytes, LedgerTicket]]) -> None:
+        for data, _ in batch:
+            self.ledger.append(data)
+            if self.fsync == "event":
+                self.ledger.flush(fsync=True)
+                self._fsyncs += 1
+        self.ledger.flush(fsync=self.fsync == "batch")
+        if self.fsync == "batch":
+            self._fsyncs += 1
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                break
+            try:
+                self._write_batch(batch)
+                ok = True
+            except OSError:
+                ok = False
+                self._errors += 1
+                try:
+                    self.ledger.reset()
+                except OSError:
+                    pass
+            self._batches += 1
+            self._entries += len(batch)
+            self._bytes += sum(len(data) for data, _ in batch) if ok else 0
+            self._max_batch_seen = max(self._max_batch_seen, len(batch))
+            for _, ticket in batch:
+                ticket.resolve(ok)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop accepting entries, write everything already queued, then stop the writer thread."""
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    @property
+    def closed(self) -> bool:
+        return self._closing
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            queued = len(self._queue)
+        return {
+            "path": str(self.ledger.path),
+            "fsync": self.fsync,
+            "maxBatch": self.max_batch,
+            "flushIntervalMs": self.flush_interval_s * 1000.0,
+            "queued": queued,
+            "batches": self._batches,
+            "entries": self._entries,
+            "bytes": self._bytes,
+            "fsyncs": self._fsyncs,
+            "errors": self._errors,
+            "largestBatch": self._max_batch_seen,
+        }
@@ -1,40 +1,40 @@
 from __future__ import annotations
 
-import re
 import sqlite3
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Header, HTTPException, Query
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
 
-from api.cats_ledger import append_cats_event
+from api.cats_ledger import append_cats_event, append_cats_events, get_ledger_writer_metrics
+from api.cats_ledger_query import DEFAULT_EVENT_LIMIT, MAX_EVENT_LIMIT, EventFilter, stream_events
 from api.cats_store import (
+    # The lifecycle state machine lives in cats_store; re-exported for callers that import it from here.
+    ALLOWED_EDIT_STATUSES as ALLOWED_EDIT_STATUSES,
+    ALLOWED_PUBLISH_STATUSES as ALLOWED_PUBLISH_STATUSES,
+    TRANSITIONS as TRANSITIONS,
+    VALID_STATUSES as VALID_STATUSES,
+    SEMVER_RE,
+    CatStatusConflict,
     create_cat,
-    create_version,
+    create_cats_batch,
     get_cat,
     get_connection_error_detail,
-    get_status,
+    get_pool_metrics,
     is_unique_violation,
     list_cats,
     list_versions,
-    transition_cat,
-    update_cat,
+    publish_version,
+    publish_versions_batch,
+    transition_cat_checked,
+    update_cat_if_editable,
 )
+from api.request_context import org_user, require_operator
 
 router = APIRouter(prefix="/api/cats", tags=["cats-lifecycle"])
 
-VALID_STATUSES = {"Draft", "Review", "Approved", "Rejected", "Deprecated", "Archived"}
-ALLOWED_EDIT_STATUSES = {"Draft", "Review"}
-ALLOWED_PUBLISH_STATUSES = {"Draft", "Approved"}  # Chosen policy for v1.
-TRANSITIONS = {
-    "Draft": {"Review", "Archived"},
-    "Review": {"Draft", "Approved", "Rejected"},
-    "Approved": {"Deprecated", "Archived"},
-    "Rejected": {"Draft", "Archived"},
-    "Deprecated": {"Approved", "Archived"},
-    "Archived": set(),
-}
-SEMVER_RE = re.compile(r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)(?:[-+][0-9A-Za-z-.]+)?$")
+MAX_BATCH_ITEMS = 1000
 
 
 class CreateCatBody(BaseModel):
@@ -58,31 +58,52 @@ class TransitionBody(BaseModel):
     targetStatus: str = Field(min_length=1, max_length=64)
 
 
-def _org_user(owner_org_id: Optional[str], owner_user_id: Optional[str]) -> tuple[str, str]:
-    return (owner_org_id or "org_demo"), (owner_user_id or "usr_demo")
+class BatchBody(BaseModel):
+    # Items are validated one by one so a bad item is reported as "invalid" instead of failing the batch.
+    items: List[Dict[str, Any]] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+def _event(event_type: str, owner_org_id: str, owner_user_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "event_type": event_type,
+        "org_id": owner_org_id,
+        "user_id": owner_user_id,
+        "payload": payload,
+    }
 
 
 def _append_event(event_type: str, owner_org_id: str, owner_user_id: str, payload: Dict[str, Any]) -> bool:
-    return append_cats_event(
-        {
-            "event_type": event_type,
-            "org_id": owner_org_id,
-            "user_id": owner_user_id,
-            "payload": payload,
-        }
+    return append_cats_event(_event(event_type, owner_org_id, owner_user_id, payload))
+
+
+def _validation_detail(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err.get('loc', ())) or 'item'}: {err.get('msg', 'invalid')}"
+        for err in exc.errors()
     )
 
 
+def _batch_response(results: List[Dict[str, Any]], ledger_written: bool) -> Dict[str, Any]:
+    summary = {"created": 0, "conflict": 0, "invalid": 0}
+    for item in results:
+        summary[item["result"]] += 1
+    return {"summary": summary, "items": results, "ledgerWritten": ledger_written}
+
+
 @router.get("")
 def get_cats(
     page: int = Query(default=1, ge=1),
     pageSize: int = Query(default=20, ge=1, le=200),
+    cursor: Optional[str] = Query(default=None, max_length=512),
+    includeTotal: bool = Query(default=True),
     x_org_id: Optional[str] = Header(default=None),
     x_user_id: Optional[str] = Header(default=None),
 ) -> Dict[str, Any]:
-    owner_org_id, _ = _org_user(x_org_id, x_user_id)
+    owner_org_id, _ = org_user(x_org_id, x_user_id)
     try:
-        return list_cats(owner_org_id, page, pageSize)
+        return list_cats(owner_org_id, page, pageSize, cursor=cursor, include_total=includeTotal)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     except sqlite3.Error as exc:
         raise HTTPException(status_code=500, detail=get_connection_error_detail(exc)) from exc
 
@@ -93,7 +114,7 @@ def post_cats(
     x_org_id: Optional[str] = Header(default=None),
     x_user_id: Optional[str] = Header(default=None),
 ) -> Dict[str, Any]:
-    owner_org_id, owner_user_id = _org_user(x_org_id, x_user_id)
+    owner_org_id, owner_user_id = org_user(x_org_id, x_user_id)
     try:
         created = create_cat(
             owner_org_id=owner_org_id,
@@ -118,13 +139,64 @@ def post_cats(
     return {**created, "ledgerWritten": ledger_written}
 
 
+@router.post(":batch")
+def post_cats_batch(
+    body: BatchBody,
+    x_org_id: Optional[str] = Header(default=None),
+    x_user_id: Optional[str] = Header(default=None),
+) -> Dict[str, Any]:
+    owner_org_id, owner_user_id = org_user(x_org_id, x_user_id)
+    results: List[Dict[str, Any]] = [{"index": i} for i in range(len(body.items))]
+    valid_indexes: List[int] = []
+    valid_items: List[tuple[str, Optional[str]]] = []
+    for index, raw in enumerate(body.items):
+        try:
+            item = CreateCatBody.model_validate(raw)
+        except ValidationError as exc:
+            results[index].update({"result": "invalid", "detail": _validation_detail(exc)})
+            continue
+        valid_indexes.append(index)
+        valid_items.append((item.name.strip(), (item.description or "").strip() or None))
+
+    try:
+        stored = create_cats_batch(owner_org_id, owner_user_id, valid_items) if valid_items else []
+    except sqlite3.Error as exc:
+        raise HTTPException(status_code=500, detail=get_connection_error_detail(exc)) from exc
+
+    events: List[Dict[str, Any]] = []
+    for index, outcome in zip(valid_indexes, stored):
+        results[index].update(outcome)
+        if outcome["result"] == "created":
+            cat = outcome["cat"]
+            events.append(
+                _event(
+                    "cats.created",
+                    owner_org_id,
+                    owner_user_id,
+                    {"catId": cat["catId"], "name": cat["name"], "status": cat["status"]},
+                )
+            )
+    ledger_written = append_cats_events(events)
+    return _batch_response(results, ledger_written)
+
+
+@router.get("/_store/pool", dependencies=[Depends(require_operator)])
+def get_store_pool_metrics() -> Dict[str, Any]:
+    return get_pool_metrics()
+
+
+@router.get("/_store/ledger", dependencies=[Depends(require_operator)])
+def get_store_ledger_metrics() -> Dict[str, Any]:
+    return get_ledger_writer_metrics()
+
+
 @router.get("/{cat_id}")
 def get_cat_by_id(
     cat_id: str,
     x_org_id: Optional[str] = Header(default=None),
     x_user_id: Optional[str] = Header(default=None),
 ) -> Dict[str, Any]:
-    owner_org_id, _ = _org_user(x_org_id, x_user_id)
+    owner_org_id, _ = org_user(x_org_id, x_user_id)
     cat = get_cat(owner_org_id, cat_id)
     if cat is None:
         raise HTTPException(status_code=404, detail="CAT not found.")
@@ -138,20 +210,16 @@ def put_cat(
     x_org_id: Optional[str] = Header(default=None),
     x_user_id: Optional[str] = Header(default=None),
 ) -> Dict[str, Any]:
-    owner_org_id, owner_user_id = _org_user(x_org_id, x_user_id)
-    status = get_status(owner_org_id, cat_id)
-    if status is None:
-        raise HTTPException(status_code=404, detail="CAT not found.")
-    if status not in ALLOWED_EDIT_STATUSES:
-        raise HTTPException(status_code=409, detail="Metadata edits are only allowed in Draft/Review.")
-
+    owner_org_id, owner_user_id = org_user(x_org_id, x_user_id)
     try:
-        updated = update_cat(
+        updated = update_cat_if_editable(
             owner_org_id=owner_org_id,
             cat_id=cat_id,
             name=body.name.strip(),
             description=(body.description or "").strip() or None,
         )
+    except CatStatusConflict as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
     except sqlite3.IntegrityError as exc:
         if is_unique_violation(exc):
             raise HTTPException(status_code=409, detail="CAT name must be unique per tenant.") from exc
@@ -177,20 +245,9 @@ def post_version(
     x_org_id: Optional[str] = Header(default=None),
     x_user_id: Optional[str] = Header(default=None),
 ) -> Dict[str, Any]:
-    owner_org_id, owner_user_id = _org_user(x_org_id, x_user_id)
-    status = get_status(owner_org_id, cat_id)
-    if status is None:
-        raise HTTPException(status_code=404, detail="CAT not found.")
-    if status not in ALLOWED_PUBLISH_STATUSES:
-        raise HTTPException(
-            status_code=409,
-            detail="Version publish allowed only when CAT is Draft or Approved.",
-        )
-    if not SEMVER_RE.match(body.version.strip()):
-        raise HTTPException(status_code=422, detail="Version must be a semantic version string.")
-
+    owner_org_id, owner_user_id = org_user(x_org_id, x_user_id)
     try:
-        version = create_version(
+        version = publish_version(
             owner_org_id=owner_org_id,
             cat_id=cat_id,
             version=body.version.strip(),
@@ -198,6 +255,10 @@ def post_version(
             rulebook_json=body.rulebookJson,
             command_bundle_ref=body.commandBundleRef.strip(),
         )
+    except CatStatusConflict as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
     except sqlite3.IntegrityError as exc:
         if is_unique_violation(exc):
             raise HTTPException(status_code=409, detail="Version already exists for this CAT.") from exc
@@ -216,19 +277,102 @@ def post_version(
     return {**version, "ledgerWritten": ledger_written}
 
 
+@router.post("/{cat_id}/versions:batch")
+def post_versions_batch(
+    cat_id: str,
+    body: BatchBody,
+    x_org_id: Optional[str] = Header(default=None),
+    x_user_id: Optional[str] = Header(default=None),
+) -> Dict[str, Any]:
+    owner_org_id, owner_user_id = org_user(x_org_id, x_user_id)
+    results: List[Dict[str, Any]] = [{"index": i} for i in range(len(body.items))]
+    valid_indexes: List[int] = []
+    valid_items: List[tuple[str, Dict[str, Any], Dict[str, Any], str]] = []
+    for index, raw in enumerate(body.items):
+        try:
+            item = PublishVersionBody.model_validate(raw)
+        except ValidationError as exc:
+            results[index].update({"result": "invalid", "detail": _validation_detail(exc)})
+            continue
+        if not SEMVER_RE.match(item.version.strip()):
+            results[index].update({"result": "invalid", "detail": "Version must be a semantic version string."})
+            continue
+        valid_indexes.append(index)
+        valid_items.append(
+            (item.version.strip(), item.manifestJson, item.rulebookJson, item.commandBundleRef.strip())
+        )
+
+    try:
+        stored = publish_versions_batch(owner_org_id, cat_id, valid_items)
+    except CatStatusConflict as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    except sqlite3.Error as exc:
+        raise HTTPException(status_code=500, detail=get_connection_error_detail(exc)) from exc
+    if stored is None:
+        raise HTTPException(status_code=404, detail="CAT not found.")
+
+    events: List[Dict[str, Any]] = []
+    for index, outcome in zip(valid_indexes, stored):
+        results[index].update(outcome)
+        if outcome["result"] == "created":
+            version = outcome["version"]
+            events.append(
+                _event(
+                    "cats.version_published",
+                    owner_org_id,
+                    owner_user_id,
+                    {"catId": cat_id, "catVersionId": version["catVersionId"], "version": version["version"]},
+                )
+            )
+    ledger_written = append_cats_events(events)
+    return _batch_response(results, ledger_written)
+
+
 @router.get("/{cat_id}/versions")
 def get_versions(
     cat_id: str,
     x_org_id: Optional[str] = Header(default=None),
     x_user_id: Optional[str] = Header(default=None),
 ) -> Dict[str, Any]:
-    owner_org_id, _ = _org_user(x_org_id, x_user_id)
+    owner_org_id, _ = org_user(x_org_id, x_user_id)
     versions = list_versions(owner_org_id, cat_id)
     if versions is None:
         raise HTTPException(status_code=404, detail="CAT not found.")
     return {"items": versions}
 
 
+@router.get("/{cat_id}/events")
+def get_cat_events(
+    cat_id: str,
+    eventType: Optional[List[str]] = Query(default=None),
+    since: Optional[str] = Query(default=None, max_length=64),
+    until: Optional[str] = Query(default=None, max_length=64),
+    cursor: Optional[str] = Query(default=None, max_length=32),
+    limit: int = Query(default=DEFAULT_EVENT_LIMIT, ge=1, le=MAX_EVENT_LIMIT),
+    x_org_id: Optional[str] = Header(default=None),
+    x_user_id: Optional[str] = Header(default=None),
+) -> StreamingResponse:
+    owner_org_id, _ = org_user(x_org_id, x_user_id)
+    try:
+        cat = get_cat(owner_org_id, cat_id)
+    except sqlite3.Error as exc:
+        raise HTTPException(status_code=500, detail=get_connection_error_detail(exc)) from exc
+    if cat is None:
+        raise HTTPException(status_code=404, detail="CAT not found.")
+    flt = EventFilter(
+        org_id=owner_org_id,
+        cat_id=cat_id,
+        event_types=tuple(eventType or ()),
+        since=since,
+        until=until,
+    )
+    try:
+        lines = stream_events(flt, cursor=cursor, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
 @router.post("/{cat_id}/transition")
 def post_transition(
     cat_id: str,
@@ -236,27 +380,19 @@ def post_transition(
     x_org_id: Optional[str] = Header(default=None),
     x_user_id: Optional[str] = Header(default=None),
 ) -> Dict[str, Any]:
-    owner_org_id, owner_user_id = _org_user(x_org_id, x_user_id)
-    current_status = get_status(owner_org_id, cat_id)
-    if current_status is None:
-        raise HTTPException(status_code=404, detail="CAT not found.")
-
+    owner_org_id, owner_user_id = org_user(x_org_id, x_user_id)
     target = body.targetStatus.strip()
-    if target not in VALID_STATUSES:
-        raise HTTPException(status_code=422, detail=f"Invalid targetStatus. Allowed: {sorted(VALID_STATUSES)}")
-    allowed_targets = TRANSITIONS.get(current_status, set())
-    if target not in allowed_targets:
-        raise HTTPException(
-            status_code=409,
-            detail=f"Transition not allowed: {current_status} -> {target}. Allowed: {sorted(allowed_targets)}",
-        )
-
     try:
-        updated = transition_cat(owner_org_id, cat_id, target)
+        transitioned = transition_cat_checked(owner_org_id, cat_id, target)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except CatStatusConflict as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
     except sqlite3.Error as exc:
         raise HTTPException(status_code=500, detail=get_connection_error_detail(exc)) from exc
-    if updated is None:
+    if transitioned is None:
         raise HTTPException(status_code=404, detail="CAT not found.")
+    current_status, updated = transitioned
 
     ledger_written = _append_event(
         "cats.lifecycle_transitioned",
@@ -0,0 +1,129 @@
+"""
+In-process cache for the JSON documents under cats/ (registry index, police register, definitions).
+
+A document is parsed once and kept. After RGPT_CATS_REGISTRY_CACHE_TTL_S seconds (default 1) the
+next read stats the file and re-reads it only if mtime_ns or size changed; a TTL of 0 stats on
+every read. `clear()` drops everything (exposed to operators as POST /cats/registry/reload).
+
+Each document keeps its raw bytes and their sha256, which the router serves as a strong ETag.
+For a definition this equals the bundle digest the replay runner and police register use.
+Responses carry `Cache-Control: public, max-age=<RGPT_CATS_REGISTRY_MAX_AGE_S, default 0>, must-revalidate`.
+
+Parsed documents are shared between callers and must be treated as read-only.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_TTL_S = 1.0
+
+
+@dataclass(frozen=True)
+class CachedDocument:
+    path: Path
+    data: Any
+    raw: bytes
+    sha256: str
+    mtime_ns: int
+    size: int
+    loaded_at: float
+    _derived: Dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+
+    def derive(self, key: str, builder: Callable[[Any], T]) -> T:
+        """Build a value from `data` once per loaded document (e.g. lookup indexes) and memoize it."""
+        try:
+            return self._derived[key]
+        except KeyError:
+            value = builder(self.data)
+            self._derived[key] = value
+            return value
+
+
+def _env_ttl() -> float:
+    raw = os.getenv("RGPT_CATS_REGISTRY_CACHE_TTL_S", "").strip()
+    if not raw:
+        return DEFAULT_TTL_S
+    try:
+        return max(float(raw), 0.0)
+    except ValueError:
+        return DEFAULT_TTL_S
+
+
+class DocumentCache:
+    def __init__(self, ttl_s: Optional[float] = None) -> None:
+        self._ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._entries: Dict[Path, CachedDocument] = {}
+        self._checked_at: Dict[Path, float] = {}
+        self._hits = 0
+        self._revalidations = 0
+        self._loads = 0
+
+    @property
+    def ttl_s(self) -> float:
+        return self._ttl_s if self._ttl_s is not None else _env_ttl()
+
+    def get(self, path: Path, *, revalidate: bool = False) -> CachedDocument:
+        """
+        Return the parsed document at `path`; `revalidate` stats the file even inside the TTL.
+        Raises FileNotFoundError / OSError when it cannot be read and ValueError when it is not valid JSON;
+        failed loads are not cached.
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is not None and not revalidate and now - self._checked_at.get(path, 0.0) < self.ttl_s:
+                self._hits += 1
+                return cached
+
+        stat = path.stat()
+        if cached is not None and (stat.st_mtime_ns, stat.st_size) == (cached.mtime_ns, cached.size):
+            with self._lock:
+                self._revalidations += 1
+                self._checked_at[path] = now
+            return cached
+
+        raw = path.read_bytes()
+        document = CachedDocument(
+            path=path,
+            data=json.loads(raw.decode("utf-8-sig")),
+            raw=raw,
+            sha256=hashlib.sha256(raw).hexdigest(),
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            loaded_at=time.time(),
+        )
+        with self._lock:
+            self._loads += 1
+            self._entries[path] = document
+            self._checked_at[path] = now
+        return document
+
+    def clear(self) -> int:
+        with self._lock:
+            dropped = len(self._entries)
+            self._entries.clear()
+            self._checked_at.clear()
+        return dropped
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ttlS": self.ttl_s,
+                "documents": len(self._entries),
+                "hits": self._hits,
+                "revalidations": self._revalidations,
+                "loads": self._loads,
+            }
+
+
+REGISTRY_CACHE = DocumentCache()
@@ -0,0 +1,71 @@
+"""
+Lookup indexes over the CATS registry documents.
+
+Built once per loaded document (see CachedDocument.derive) so lookups by passport_id, cat_id,
+canonical_name or publisher namespace are dict hits instead of scans over the passports list.
+When a key occurs more than once the first occurrence wins, matching the previous linear scans.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from api.cats_registry_cache import CachedDocument
+
+
+@dataclass(frozen=True)
+class PoliceRegisterIndex:
+    passports_by_id: Dict[str, Dict[str, Any]]
+    passports_by_cat_id: Dict[str, Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class RegistryIndex:
+    entries_by_canonical: Dict[str, Dict[str, Any]]
+    canonical_by_cat_id: Dict[str, str]
+    owners_by_namespace: Dict[str, Dict[str, Any]]
+
+
+def build_police_register_index(register: Any) -> PoliceRegisterIndex:
+    by_id: Dict[str, Dict[str, Any]] = {}
+    by_cat_id: Dict[str, Dict[str, Any]] = {}
+    raw = register.get("passports", []) if isinstance(register, dict) else []
+    for passport in raw if isinstance(raw, list) else []:
+        if not isinstance(passport, dict):
+            continue
+        by_id.setdefault(str(passport.get("passport_id", "")), passport)
+        cat_id = passport.get("cat_id")
+        if cat_id is not None:
+            by_cat_id.setdefault(str(cat_id), passport)
+    return PoliceRegisterIndex(passports_by_id=by_id, passports_by_cat_id=by_cat_id)
+
+
+def build_registry_index(registry: Any) -> RegistryIndex:
+    entries: Dict[str, Dict[str, Any]] = {}
+    canonical_by_cat_id: Dict[str, str] = {}
+    owners: Dict[str, Dict[str, Any]] = {}
+    raw = registry if isinstance(registry, dict) else {}
+    namespaces = raw.get("namespaces", {})
+    for canonical_name, entry in (namespaces.items() if isinstance(namespaces, dict) else ()):
+        if not isinstance(entry, dict):
+            continue
+        entries[canonical_name] = entry
+        if entry.get("cat_id") is not None:
+            canonical_by_cat_id.setdefault(str(entry["cat_id"]), canonical_name)
+    publisher_owners = raw.get("publisher_owners", {})
+    for namespace, owner in (publisher_owners.items() if isinstance(publisher_owners, dict) else ()):
+        if isinstance(owner, dict):
+            owners[namespace] = owner
+    return RegistryIndex(
+        entries_by_canonical=entries,
+        canonical_by_cat_id=canonical_by_cat_id,
+        owners_by_namespace=owners,
+    )
+
+
+def police_register_index(document: CachedDocument) -> PoliceRegisterIndex:
+    return document.derive("police_register_index", build_police_register_index)
+
+
+def registry_index(document: CachedDocument) -> RegistryIndex:
+    return document.derive("registry_index", build_registry_index)
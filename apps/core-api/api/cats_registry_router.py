@@ -1,14 +1,28 @@
 from __future__ import annotations
 
-import json
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
-
-from fastapi import APIRouter, HTTPException, Query
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import Response
+
+from api.cats_registry_cache import REGISTRY_CACHE, CachedDocument
+from api.cats_registry_snapshot import (
+    DEFINITIONS_DIR,
+    POLICE_REGISTER_FILE,
+    REGISTRY_FILE,
+    RegistrySnapshot,
+    current_snapshot,
+    registry_watcher,
+)
+from api.request_context import require_operator
 
 router = APIRouter()
 
 
+@lru_cache(maxsize=1)
 def _repo_root() -> Path:
     current = Path(__file__).resolve().parent
     while True:
@@ -27,18 +41,55 @@ def _cats_root() -> Path:
     return _repo_root() / "cats"
 
 
-def _read_json(path: Path) -> Any:
-    try:
-        payload = path.read_text(encoding="utf-8")
-    except FileNotFoundError as exc:
-        raise HTTPException(status_code=404, detail=f"Missing file: {path.name}") from exc
-    except OSError as exc:
-        raise HTTPException(status_code=500, detail="Failed to read registry data.") from exc
-
+def _cache_control() -> str:
+    raw = os.getenv("RGPT_CATS_REGISTRY_MAX_AGE_S", "").strip()
     try:
-        return json.loads(payload)
-    except json.JSONDecodeError as exc:
-        raise HTTPException(status_code=500, detail="Invalid registry JSON.") from exc
+        max_age = max(int(raw), 0) if raw else 0
+    except ValueError:
+        max_age = 0
+    return f"public, max-age={max_age}, must-revalidate"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _snapshot() -> RegistrySnapshot:
+    return current_snapshot(_cats_root())
+
+
+def _require(snapshot: RegistrySnapshot, document: Optional[CachedDocument], relative: str) -> CachedDocument:
+    if document is not None:
+        return document
+    error = snapshot.error_for(relative)
+    if error == "invalid":
+        raise HTTPException(status_code=500, detail="Invalid registry JSON.")
+    if error == "unreadable":
+        raise HTTPException(status_code=500, detail="Failed to read registry data.")
+    raise HTTPException(status_code=404, detail=f"Missing file: {Path(relative).name}")
+
+
+def _document_response(snapshot: RegistrySnapshot, document: CachedDocument, if_none_match: Optional[str]) -> Response:
+    """Serve the file bytes as-is with a strong ETag (sha256 of the bytes); 304 when the client has them."""
+    headers = {
+        "ETag": f'"{document.sha256}"',
+        "Cache-Control": _cache_control(),
+        "X-Registry-Generation": str(snapshot.generation),
+    }
+    if _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    body = document.raw[3:] if document.raw.startswith(b"\xef\xbb\xbf") else document.raw
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 def _validate_cat_id(cat_id: str) -> None:
@@ -47,38 +98,55 @@ def _validate_cat_id(cat_id: str) -> None:
 
 
 @router.get("/cats/registry")
-def get_registry_index() -> Any:
-    return _read_json(_cats_root() / "registry_index.json")
+def get_registry_index(if_none_match: Optional[str] = Header(default=None)) -> Response:
+    snapshot = _snapshot()
+    document = _require(snapshot, snapshot.registry, REGISTRY_FILE)
+    return _document_response(snapshot, document, if_none_match)
+
+
+@router.post("/cats/registry/reload", dependencies=[Depends(require_operator)])
+def reload_registry() -> Dict[str, Any]:
+    """Operator-only: drop the document cache and force a full rebuild of the snapshot."""
+    dropped = REGISTRY_CACHE.clear()
+    watcher = registry_watcher(_cats_root())
+    watcher.refresh(force=True)
+    metrics = watcher.metrics()
+    metrics.pop("root", None)
+    return {"reloaded": True, "dropped": dropped, "watcher": metrics, "cache": REGISTRY_CACHE.metrics()}
 
 
 @router.get("/cats/police-register")
-def get_police_register() -> Any:
-    return _read_json(_cats_root() / "police_register.demo.json")
+def get_police_register(if_none_match: Optional[str] = Header(default=None)) -> Response:
+    snapshot = _snapshot()
+    document = _require(snapshot, snapshot.police_register, POLICE_REGISTER_FILE)
+    return _document_response(snapshot, document, if_none_match)
 
 
 @router.get("/cats/{cat_id}/definition")
-def get_cat_definition(cat_id: str) -> Any:
+def get_cat_definition(cat_id: str, if_none_match: Optional[str] = Header(default=None)) -> Response:
     _validate_cat_id(cat_id)
-    definition_path = _cats_root() / "definitions" / f"{cat_id}.json"
-    return _read_json(definition_path)
+    snapshot = _snapshot()
+    relative = f"{DEFINITIONS_DIR}/{cat_id}.json"
+    document = _require(snapshot, snapshot.definitions.get(cat_id), relative)
+    return _document_response(snapshot, document, if_none_match)
 
 
 @router.get("/cats/{cat_id}/passport")
 def get_cat_passport(cat_id: str) -> Dict[str, Any]:
     _validate_cat_id(cat_id)
-    registry = _read_json(_cats_root() / "police_register.demo.json")
-    passports = registry.get("passports", [])
-    for passport in passports:
-        if passport.get("cat_id") == cat_id:
-            return passport
-    raise HTTPException(status_code=404, detail="Passport not found.")
+    snapshot = _snapshot()
+    _require(snapshot, snapshot.police_register, POLICE_REGISTER_FILE)
+    passport = snapshot.police_index.passports_by_cat_id.get(cat_id)
+    if passport is None:
+        raise HTTPException(status_code=404, detail="Passport not found.")
+    return passport
 
 
 @router.get("/cats/resolve")
 def resolve_cat(canonical_name: str = Query(..., min_length=1)) -> Dict[str, Any]:
-    registry = _read_json(_cats_root() / "registry_index.json")
-    namespaces = registry.get("namespaces", {})
-    entry = namespaces.get(canonical_name)
+    snapshot = _snapshot()
+    _require(snapshot, snapshot.registry, REGISTRY_FILE)
+    entry = snapshot.registry_index.entries_by_canonical.get(canonical_name)
     if not entry:
         raise HTTPException(status_code=404, detail="CAT namespace not found.")
     return {
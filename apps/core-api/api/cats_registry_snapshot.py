@@ -0,0 +1,282 @@
+"""
+Consistent, hot-reloaded snapshots of the cats/ registry tree.
+
+A RegistrySnapshot holds every document under cats/ that the API and replay runner read
+(registry_index.json, police_register.demo.json, definitions/*.json) together with their sha256
+digests and lookup indexes, stamped with a generation number. Readers take `current()` once per
+request and use only that object, so they never mix files from two generations and never parse
+or stat on the hot path.
+
+A RegistryWatcher polls the tree every RGPT_CATS_REGISTRY_WATCH_INTERVAL_S seconds (default 2)
+by comparing (name, mtime_ns, size) of the watched files; with 0 there is no background thread
+and `current()` makes that comparison itself on every call. When they change it builds a new
+snapshot off to the side and swaps it in with a single assignment. A candidate in which a
+previously good document is missing or invalid does not replace the current snapshot; the error
+is kept in `metrics()` and the build is retried on the next change. A forced refresh (the
+operator-only POST /cats/registry/reload) always swaps. Unchanged files are reused from the
+shared DocumentCache, so a renewal that touches the police register re-parses only that file.
+
+Polling is used rather than inotify so the watcher works the same on every platform without
+extra dependencies.
+"""
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from api.cats_registry_cache import REGISTRY_CACHE, CachedDocument
+from api.cats_registry_index import (
+    PoliceRegisterIndex,
+    RegistryIndex,
+    build_police_register_index,
+    build_registry_index,
+    police_register_index,
+    registry_index,
+)
+
+REGISTRY_FILE = "registry_index.json"
+POLICE_REGISTER_FILE = "police_register.demo.json"
+DEFINITIONS_DIR = "definitions"
+DEFAULT_WATCH_INTERVAL_S = 2.0
+
+Fingerprint = Tuple[Tuple[str, int, int], ...]
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    generation: int
+    root: Path
+    fingerprint: Fingerprint
+    registry: Optional[CachedDocument]
+    police_register: Optional[CachedDocument]
+    definitions: Dict[str, CachedDocument]
+    registry_index: RegistryIndex
+    police_index: PoliceRegisterIndex
+    # relative path -> "missing" | "unreadable" | "invalid"
+    errors: Dict[str, str] = field(default_factory=dict)
+    loaded_at: float = 0.0
+
+    def error_for(self, relative: str) -> Optional[str]:
+        return self.errors.get(relative)
+
+
+def _watch_interval() -> float:
+    raw = os.getenv("RGPT_CATS_REGISTRY_WATCH_INTERVAL_S", "").strip()
+    if not raw:
+        return DEFAULT_WATCH_INTERVAL_S
+    try:
+        return max(float(raw), 0.0)
+    except ValueError:
+        return DEFAULT_WATCH_INTERVAL_S
+
+
+def fingerprint(root: Path) -> Fingerprint:
+    """Cheap change detector: (relative name, mtime_ns, size) for every watched file."""
+    found = []
+    for relative in (REGISTRY_FILE, POLICE_REGISTER_FILE):
+        try:
+            st = (root / relative).stat()
+        except OSError:
+            continue
+        found.append((relative, st.st_mtime_ns, st.st_size))
+    try:
+        with os.scandir(root / DEFINITIONS_DIR) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    st = entry.stat()
+                    found.append((f"{DEFINITIONS_DIR}/{entry.name}", st.st_mtime_ns, st.st_size))
+    except OSError:
+        pass
+    found.sort()
+    return tuple(found)
+
+
+def _load(path: Path, relative: str, errors: Dict[str, str]) -> Optional[CachedDocument]:
+    try:
+        document = REGISTRY_CACHE.get(path, revalidate=True)
+    except FileNotFoundError:
+        errors[relative] = "missing"
+        return None
+    except OSError:
+        errors[relative] = "unreadable"
+        return None
+    except ValueError:
+        errors[relative] = "invalid"
+        return None
+    if not isinstance(document.data, dict):
+        errors[relative] = "invalid"
+        return None
+    return document
+
+
+def build_snapshot(root: Path, generation: int) -> RegistrySnapshot:
+    """Load and validate the whole tree. Never raises for bad documents; see `errors`."""
+    fp = fingerprint(root)
+    errors: Dict[str, str] = {}
+
+    registry = _load(root / REGISTRY_FILE, REGISTRY_FILE, errors)
+    if registry is not None and not isinstance(registry.data.get("namespaces", {}), dict):
+        errors[REGISTRY_FILE] = "invalid"
+        registry = None
+    police = _load(root / POLICE_REGISTER_FILE, POLICE_REGISTER_FILE, errors)
+    if police is not None and not isinstance(police.data.get("passports", []), list):
+        errors[POLICE_REGISTER_FILE] = "invalid"
+        police = None
+
+    definitions: Dict[str, CachedDocument] = {}
+    for relative, _, _ in fp:
+        if not relative.startswith(f"{DEFINITIONS_DIR}/"):
+            continue
+        document = _load(root / relative, relative, errors)
+        if document is not None:
+            definitions[Path(relative).stem] = document
+
+    return RegistrySnapshot(
+        generation=generation,
+        root=root,
+        fingerprint=fp,
+        registry=registry,
+        police_register=police,
+        definitions=definitions,
+        registry_index=registry_index(registry) if registry is not None else build_registry_index({}),
+        police_index=police_register_index(police) if police is not None else build_police_register_index({}),
+        errors=errors,
+        loaded_at=time.time(),
+    )
+
+
+class RegistryWatcher:
+    def __init__(self, root: Path, interval_s: Optional[float] = None) -> None:
+        self.root = root
+        self._interval_s = interval_s
+        self._lock = threading.Lock()
+        # Guards the first load and the poller's start/stop; re-entrant because current() starts it.
+        self._start_lock = threading.RLock()
+        self._snapshot: Optional[RegistrySnapshot] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._polls = 0
+        self._swaps = 0
+        self._rejected = 0
+        self._last_error: Optional[Dict[str, str]] = None
+        self._rejected_fingerprint: Optional[Fingerprint] = None
+
+    @property
+    def interval_s(self) -> float:
+        return self._interval_s if self._interval_s is not None else _watch_interval()
+
+    def current(self, revalidate: bool = False) -> RegistrySnapshot:
+        """
+        The active snapshot; loaded synchronously on first use, which also starts the poller. With
+        no poller running (interval 0), or with `revalidate`, the tree's fingerprint is re-checked
+        first so a change the poller has not seen yet is picked up.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._start_lock:
+                # Concurrent first readers: only one loads the tree and starts the poller.
+                if self._snapshot is None:
+                    self.refresh(force=True)
+                    self.start()
+                snapshot = self._snapshot
+            assert snapshot is not None
+            return snapshot
+        if revalidate or self._thread is None:
+            self.refresh()
+            return self._snapshot or snapshot
+        return snapshot
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rebuild if the tree changed (or `force`); returns True when a new generation was swapped in."""
+        with self._lock:
+            self._polls += 1
+            previous = self._snapshot
+            if not force and previous is not None:
+                current_fp = fingerprint(self.root)
+                if current_fp in (previous.fingerprint, self._rejected_fingerprint):
+                    return False
+            candidate = build_snapshot(self.root, (previous.generation if previous else 0) + 1)
+            if previous is not None and not force and set(candidate.errors) - set(previous.errors):
+                # Something that was fine is now broken (e.g. a half-written file); keep serving the old tree.
+                self._rejected += 1
+                self._rejected_fingerprint = candidate.fingerprint
+                self._last_error = dict(candidate.errors)
+                return False
+            self._rejected_fingerprint = None
+            self._last_error = dict(candidate.errors) if candidate.errors else None
+            self._snapshot = candidate
+            self._swaps += 1
+            return True
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None or self.interval_s <= 0:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="cats-registry-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._start_lock:
+            self._stop.set()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            try:
+                self.refresh()
+            except Exception:
+                # Keep serving the last good snapshot; the next poll retries.
+                with self._lock:
+                    self._rejected += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "root": str(self.root),
+            "intervalS": self.interval_s,
+            "running": self._thread is not None,
+            "generation": snapshot.generation if snapshot is not None else None,
+            "definitions": len(snapshot.definitions) if snapshot is not None else 0,
+            "polls": self._polls,
+            "swaps": self._swaps,
+            "rejected": self._rejected,
+            "lastError": self._last_error,
+        }
+
+
+_WATCHERS: Dict[Path, RegistryWatcher] = {}
+_WATCHERS_LOCK = threading.Lock()
+
+
+def registry_watcher(root: Path) -> RegistryWatcher:
+    watcher = _WATCHERS.get(root)
+    if watcher is not None:
+        return watcher
+    with _WATCHERS_LOCK:
+        watcher = _WATCHERS.get(root)
+        if watcher is None:
+            watcher = RegistryWatcher(root)
+            _WATCHERS[root] = watcher
+        return watcher
+
+
+def current_snapshot(root: Path, revalidate: bool = False) -> RegistrySnapshot:
+    return registry_watcher(root).current(revalidate=revalidate)
+
+
+def close_registry_watchers() -> None:
+    with _WATCHERS_LOCK:
+        for watcher in _WATCHERS.values():
+            watcher.stop()
+        _WATCHERS.clear()
+
+
+atexit.register(close_registry_watchers)
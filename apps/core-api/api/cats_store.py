@@ -1,19 +1,63 @@
 from __future__ import annotations
 
+import atexit
+import base64
 import hashlib
 import json
 import os
+import re
 import sqlite3
 import uuid
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from threading import Lock
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Union
 
-_SCHEMA_LOCK = Lock()
-_INITIALIZED_DB: Optional[Path] = None
+from api.cats_db_pool import ConnectionPool
+from api.cats_db_profile import (
+    CheckpointScheduler,
+    StorageProfile,
+    apply_connection_settings,
+    apply_database_settings,
+    resolve_profile,
+)
 
+_POOL_LOCK = Lock()
+_POOL: Optional[ConnectionPool] = None
+_PROFILE: Optional[StorageProfile] = None
+_CHECKPOINTER: Optional[CheckpointScheduler] = None
 
+DEFAULT_POOL_SIZE = 8
+DEFAULT_POOL_TIMEOUT_S = 30.0
+DEFAULT_POOL_HEALTHCHECK_S = 30.0
+
+VALID_STATUSES = {"Draft", "Review", "Approved", "Rejected", "Deprecated", "Archived"}
+ALLOWED_EDIT_STATUSES = {"Draft", "Review"}
+ALLOWED_PUBLISH_STATUSES = {"Draft", "Approved"}  # Chosen policy for v1.
+TRANSITIONS = {
+    "Draft": {"Review", "Archived"},
+    "Review": {"Draft", "Approved", "Rejected"},
+    "Approved": {"Deprecated", "Archived"},
+    "Rejected": {"Draft", "Archived"},
+    "Deprecated": {"Approved", "Archived"},
+    "Archived": set(),
+}
+
+
+SEMVER_RE = re.compile(r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)(?:[-+][0-9A-Za-z-.]+)?$")
+
+
+class CatStatusConflict(Exception):
+    """The CAT's current status does not permit the requested lifecycle operation."""
+
+    def __init__(self, current_status: str, message: str) -> None:
+        super().__init__(message)
+        self.current_status = current_status
+
+
+@lru_cache(maxsize=1)
 def _repo_root() -> Path:
     current = Path(__file__).resolve().parent
     while True:
@@ -32,6 +76,16 @@ def _db_path() -> Path:
     return _repo_root() / "apps" / "core-api" / ".data" / "cats_registry.sqlite3"
 
 
+def _env_number(name: str, default: float) -> float:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
@@ -56,6 +110,42 @@ def _ensure_schema(conn: sqlite3.Connection) -> None:
         """
     )
     conn.execute("create unique index if not exists uq_cats_org_name on cats (owner_org_id, name);")
+    conn.execute("create index if not exists ix_cats_org_recent on cats (owner_org_id, created_at desc, cat_id);")
+    counters_exist = conn.execute(
+        "select 1 from sqlite_master where type = 'table' and name = 'cats_org_counters'"
+    ).fetchone()
+    conn.execute(
+        """
+        create table if not exists cats_org_counters (
+          owner_org_id text primary key,
+          cat_count integer not null default 0
+        );
+        """
+    )
+    if counters_exist is None:
+        conn.execute(
+            """
+            insert into cats_org_counters (owner_org_id, cat_count)
+            select owner_org_id, count(1) from cats group by owner_org_id
+            """
+        )
+    conn.execute(
+        """
+        create trigger if not exists trg_cats_org_count_insert after insert on cats
+        begin
+          insert into cats_org_counters (owner_org_id, cat_count) values (new.owner_org_id, 1)
+          on conflict (owner_org_id) do update set cat_count = cat_count + 1;
+        end;
+        """
+    )
+    conn.execute(
+        """
+        create trigger if not exists trg_cats_org_count_delete after delete on cats
+        begin
+          update cats_org_counters set cat_count = cat_count - 1 where owner_org_id = old.owner_org_id;
+        end;
+        """
+    )
     conn.execute(
         """
         create table if not exists cats_versions (
@@ -117,18 +207,104 @@ def _ensure_schema(conn: sqlite3.Connection) -> None:
     conn.commit()
 
 
-def _connect() -> sqlite3.Connection:
-    global _INITIALIZED_DB
+def check_storage_config() -> StorageProfile:
+    """
+    Resolve the storage profile up front so a bad RGPT_CATS_DB_PROFILE stops startup with a
+    StorageConfigError instead of failing each request.
+    """
+    return resolve_profile()
+
+
+def _get_pool() -> ConnectionPool:
+    global _POOL, _PROFILE, _CHECKPOINTER
     path = _db_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(path)
-    conn.row_factory = sqlite3.Row
-    with _SCHEMA_LOCK:
-        if _INITIALIZED_DB != path:
-            _ensure_schema(conn)
-            _INITIALIZED_DB = path
-    conn.execute("pragma foreign_keys = on;")
-    return conn
+    profile = resolve_profile()
+    pool = _POOL
+    if pool is not None and pool.path == path and _PROFILE == profile and not pool.closed:
+        return pool
+    with _POOL_LOCK:
+        if _POOL is None or _POOL.path != path or _PROFILE != profile or _POOL.closed:
+            _close_pool_locked()
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            def prepare_connection(conn: sqlite3.Connection) -> None:
+                conn.execute("pragma foreign_keys = on;")
+                apply_connection_settings(conn, profile)
+
+            pool = ConnectionPool(
+                path,
+                size=int(_env_number("RGPT_CATS_DB_POOL_SIZE", DEFAULT_POOL_SIZE)),
+                timeout=_env_number("RGPT_CATS_DB_POOL_TIMEOUT_S", DEFAULT_POOL_TIMEOUT_S),
+                health_check_interval=_env_number("RGPT_CATS_DB_POOL_HEALTHCHECK_S", DEFAULT_POOL_HEALTHCHECK_S),
+                busy_timeout=profile.busy_timeout_ms / 1000.0,
+                on_connect=prepare_connection,
+            )
+            with pool.connection() as conn:
+                apply_database_settings(conn, profile)
+                _ensure_schema(conn)
+            if CheckpointScheduler.enabled_for(profile):
+                _CHECKPOINTER = CheckpointScheduler(pool.connection, profile)
+                _CHECKPOINTER.start()
+            _POOL = pool
+            _PROFILE = profile
+        return _POOL
+
+
+@contextmanager
+def _connect() -> Iterator[sqlite3.Connection]:
+    with _get_pool().connection() as conn:
+        yield conn
+
+
+@contextmanager
+def _immediate_transaction() -> Iterator[sqlite3.Connection]:
+    """
+    Take the write lock up front (BEGIN IMMEDIATE) so the status read and the write that depends on it
+    cannot interleave with another writer. Commits on success, rolls back on error.
+    """
+    with _connect() as conn:
+        if not conn.in_transaction:
+            conn.execute("begin immediate")
+        yield conn
+
+
+def _current_status(conn: sqlite3.Connection, owner_org_id: str, cat_id: str) -> Optional[str]:
+    row = conn.execute(
+        "select status from cats where owner_org_id = ? and cat_id = ?", (owner_org_id, cat_id)
+    ).fetchone()
+    return None if row is None else str(row["status"])
+
+
+def get_pool_metrics() -> Dict[str, Any]:
+    """Counters of the open pool, or {} if none is open; never opens one. The db path is left out."""
+    pool = _POOL
+    if pool is None or pool.closed:
+        return {}
+    metrics = pool.metrics()
+    metrics.pop("path", None)
+    metrics["profile"] = _PROFILE.to_dict() if _PROFILE is not None else None
+    checkpointer = _CHECKPOINTER
+    metrics["checkpoints"] = checkpointer.metrics() if checkpointer is not None else None
+    return metrics
+
+
+def _close_pool_locked() -> None:
+    global _POOL, _PROFILE, _CHECKPOINTER
+    if _CHECKPOINTER is not None:
+        _CHECKPOINTER.stop()
+        _CHECKPOINTER = None
+    if _POOL is not None:
+        _POOL.close()
+        _POOL = None
+    _PROFILE = None
+
+
+def close_pool() -> None:
+    with _POOL_LOCK:
+        _close_pool_locked()
+
+
+atexit.register(close_pool)
 
 
 def _parse_json(raw: str) -> Any:
@@ -138,7 +314,20 @@ def _parse_json(raw: str) -> Any:
         return {}
 
 
-def _cat_row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+_CAT_COLUMNS = ("cat_id", "owner_org_id", "owner_user_id", "name", "description", "status", "created_at", "updated_at")
+_VERSION_COLUMNS = (
+    "cat_version_id",
+    "cat_id",
+    "version",
+    "manifest_json",
+    "rulebook_json",
+    "command_bundle_ref",
+    "status",
+    "created_at",
+)
+
+
+def _cat_row_to_dict(row: Union[sqlite3.Row, Mapping[str, Any]]) -> Dict[str, Any]:
     return {
         "catId": row["cat_id"],
         "ownerOrgId": row["owner_org_id"],
@@ -151,7 +340,7 @@ def _cat_row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
     }
 
 
-def _version_row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+def _version_row_to_dict(row: Union[sqlite3.Row, Mapping[str, Any]]) -> Dict[str, Any]:
     return {
         "catVersionId": row["cat_version_id"],
         "catId": row["cat_id"],
@@ -164,24 +353,79 @@ def _version_row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
     }
 
 
-def list_cats(owner_org_id: str, page: int, page_size: int) -> Dict[str, Any]:
-    offset = (page - 1) * page_size
+def encode_cursor(created_at: str, cat_id: str) -> str:
+    raw = json.dumps([created_at, cat_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, cat_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError, UnicodeError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+    if not isinstance(created_at, str) or not isinstance(cat_id, str):
+        raise ValueError("Invalid cursor.")
+    return created_at, cat_id
+
+
+def _count_cats(conn: sqlite3.Connection, owner_org_id: str) -> int:
+    row = conn.execute("select cat_count from cats_org_counters where owner_org_id = ?", (owner_org_id,)).fetchone()
+    return 0 if row is None else int(row["cat_count"])
+
+
+def list_cats(
+    owner_org_id: str,
+    page: int,
+    page_size: int,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+) -> Dict[str, Any]:
+    """
+    Page through an org's CATs newest first, ordered by (created_at desc, cat_id).
+
+    With `cursor` the page is found by a keyset seek on ix_cats_org_recent instead of OFFSET.
+    `nextCursor` is returned in both modes so page-based clients can switch over.
+    The total comes from the trigger-maintained cats_org_counters row, not a count(1) scan.
+    """
+    after = decode_cursor(cursor) if cursor else None
     with _connect() as conn:
-        total = conn.execute("select count(1) as c from cats where owner_org_id = ?", (owner_org_id,)).fetchone()["c"]
-        rows = conn.execute(
-            """
-            select * from cats
-            where owner_org_id = ?
-            order by created_at desc
-            limit ? offset ?
-            """,
-            (owner_org_id, page_size, offset),
-        ).fetchall()
+        if after is None:
+            rows = conn.execute(
+                """
+                select * from cats
+                where owner_org_id = ?
+                order by created_at desc, cat_id
+                limit ? offset ?
+                """,
+                (owner_org_id, page_size + 1, (page - 1) * page_size),
+            ).fetchall()
+        else:
+            after_created_at, after_cat_id = after
+            rows = conn.execute(
+                """
+                select * from cats
+                where owner_org_id = ?
+                  and created_at <= ?
+                  and (created_at < ? or cat_id > ?)
+                order by created_at desc, cat_id
+                limit ?
+                """,
+                (owner_org_id, after_created_at, after_created_at, after_cat_id, page_size + 1),
+            ).fetchall()
+        total: Optional[int] = None
+        if include_total:
+            total = _count_cats(conn, owner_org_id)
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["cat_id"]) if has_more and rows else None
     return {
-        "page": page,
+        "page": None if after is not None else page,
         "pageSize": page_size,
-        "total": int(total),
+        "total": total,
         "items": [_cat_row_to_dict(row) for row in rows],
+        "nextCursor": next_cursor,
     }
 
 
@@ -208,37 +452,76 @@ def get_cat(owner_org_id: str, cat_id: str) -> Optional[Dict[str, Any]]:
     return None if row is None else _cat_row_to_dict(row)
 
 
-def update_cat(owner_org_id: str, cat_id: str, name: str, description: Optional[str]) -> Optional[Dict[str, Any]]:
-    now = _now_iso()
-    with _connect() as conn:
-        conn.execute(
-            """
-            update cats
-            set name = ?, description = ?, updated_at = ?
-            where owner_org_id = ? and cat_id = ?
-            """,
-            (name, description, now, owner_org_id, cat_id),
-        )
-        row = conn.execute("select * from cats where owner_org_id = ? and cat_id = ?", (owner_org_id, cat_id)).fetchone()
-    return None if row is None else _cat_row_to_dict(row)
+def _version_fingerprint(manifest_raw: str, rulebook_raw: str, command_bundle_ref: str) -> str:
+    return hashlib.sha256(f"{manifest_raw}|{rulebook_raw}|{command_bundle_ref}".encode("utf-8")).hexdigest()
 
 
-def transition_cat(owner_org_id: str, cat_id: str, target_status: str) -> Optional[Dict[str, Any]]:
+def _insert_version(
+    conn: sqlite3.Connection,
+    cat_id: str,
+    version: str,
+    manifest_json: Dict[str, Any],
+    rulebook_json: Dict[str, Any],
+    command_bundle_ref: str,
+) -> Dict[str, Any]:
     now = _now_iso()
-    with _connect() as conn:
-        conn.execute(
+    cat_version_id = _new_id()
+    manifest_raw = json.dumps(manifest_json, separators=(",", ":"), ensure_ascii=False)
+    rulebook_raw = json.dumps(rulebook_json, separators=(",", ":"), ensure_ascii=False)
+    digest = _version_fingerprint(manifest_raw, rulebook_raw, command_bundle_ref)
+
+    row = conn.execute(
+        """
+        insert into cats_versions
+          (cat_version_id, cat_id, version, manifest_json, rulebook_json, command_bundle_ref, status, created_at)
+        values (?, ?, ?, ?, ?, ?, ?, ?)
+        returning *
+        """,
+        (cat_version_id, cat_id, version, manifest_raw, rulebook_raw, command_bundle_ref, "Published", now),
+    ).fetchone()
+    conn.execute(
+        """
+        insert into cats_fingerprints (fingerprint_id, cat_version_id, algo, digest, signed_by, created_at)
+        values (?, ?, ?, ?, ?, ?)
+        """,
+        (_new_id(), cat_version_id, "sha256", digest, None, now),
+    )
+    conn.execute(
+        """
+        insert into cats_metrics
+          (metric_id, cat_version_id, success_count, fail_count, avg_exec_ms, last_run_at, created_at, updated_at)
+        values (?, ?, 0, 0, null, null, ?, ?)
+        """,
+        (_new_id(), cat_version_id, now, now),
+    )
+    if row is None:
+        raise RuntimeError("version creation failed")
+    return _version_row_to_dict(row)
+
+
+def update_cat_if_editable(
+    owner_org_id: str, cat_id: str, name: str, description: Optional[str]
+) -> Optional[Dict[str, Any]]:
+    """Status check against ALLOWED_EDIT_STATUSES and the update in one BEGIN IMMEDIATE transaction."""
+    with _immediate_transaction() as conn:
+        status = _current_status(conn, owner_org_id, cat_id)
+        if status is None:
+            return None
+        if status not in ALLOWED_EDIT_STATUSES:
+            raise CatStatusConflict(status, "Metadata edits are only allowed in Draft/Review.")
+        row = conn.execute(
             """
             update cats
-            set status = ?, updated_at = ?
+            set name = ?, description = ?, updated_at = ?
             where owner_org_id = ? and cat_id = ?
+            returning *
             """,
-            (target_status, now, owner_org_id, cat_id),
-        )
-        row = conn.execute("select * from cats where owner_org_id = ? and cat_id = ?", (owner_org_id, cat_id)).fetchone()
+            (name, description, _now_iso(), owner_org_id, cat_id),
+        ).fetchone()
     return None if row is None else _cat_row_to_dict(row)
 
 
-def create_version(
+def publish_version(
     owner_org_id: str,
     cat_id: str,
     version: str,
@@ -246,51 +529,157 @@ def create_version(
     rulebook_json: Dict[str, Any],
     command_bundle_ref: str,
 ) -> Optional[Dict[str, Any]]:
-    cat = get_cat(owner_org_id, cat_id)
-    if cat is None:
+    """
+    Status check against ALLOWED_PUBLISH_STATUSES and the version inserts in one BEGIN IMMEDIATE transaction.
+    Returns None when the CAT does not exist. Raises CatStatusConflict for a disallowed status and then
+    ValueError for a version that is not semver, in that order.
+    """
+    with _immediate_transaction() as conn:
+        status = _current_status(conn, owner_org_id, cat_id)
+        if status is None:
+            return None
+        if status not in ALLOWED_PUBLISH_STATUSES:
+            raise CatStatusConflict(status, "Version publish allowed only when CAT is Draft or Approved.")
+        if not SEMVER_RE.match(version):
+            raise ValueError("Version must be a semantic version string.")
+        return _insert_version(conn, cat_id, version, manifest_json, rulebook_json, command_bundle_ref)
+
+
+def transition_cat_checked(
+    owner_org_id: str, cat_id: str, target_status: str
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Validate `target_status` against TRANSITIONS and apply it in one BEGIN IMMEDIATE transaction.
+    Returns (from_status, updated_cat), or None when the CAT does not exist.
+    Raises ValueError for an unknown target and CatStatusConflict for a disallowed transition.
+    """
+    with _immediate_transaction() as conn:
+        status = _current_status(conn, owner_org_id, cat_id)
+        if status is None:
+            return None
+        if target_status not in VALID_STATUSES:
+            raise ValueError(f"Invalid targetStatus. Allowed: {sorted(VALID_STATUSES)}")
+        allowed_targets = TRANSITIONS.get(status, set())
+        if target_status not in allowed_targets:
+            raise CatStatusConflict(
+                status,
+                f"Transition not allowed: {status} -> {target_status}. Allowed: {sorted(allowed_targets)}",
+            )
+        row = conn.execute(
+            """
+            update cats
+            set status = ?, updated_at = ?
+            where owner_org_id = ? and cat_id = ? and status = ?
+            returning *
+            """,
+            (target_status, _now_iso(), owner_org_id, cat_id, status),
+        ).fetchone()
+    if row is None:
         return None
+    return status, _cat_row_to_dict(row)
+
 
+def create_cats_batch(
+    owner_org_id: str,
+    owner_user_id: str,
+    items: List[Tuple[str, Optional[str]]],
+    status: str = "Draft",
+) -> List[Dict[str, Any]]:
+    """
+    Insert many (name, description) CATs with one executemany in one transaction.
+    Returns one result per input, in order: {"result": "created", "cat": {...}} or
+    {"result": "conflict", "detail": ...} for names already taken in the org or repeated in the batch.
+    """
     now = _now_iso()
-    cat_version_id = _new_id()
-    manifest_raw = json.dumps(manifest_json, separators=(",", ":"), ensure_ascii=False)
-    rulebook_raw = json.dumps(rulebook_json, separators=(",", ":"), ensure_ascii=False)
-    digest = hashlib.sha256(f"{manifest_raw}|{rulebook_raw}|{command_bundle_ref}".encode("utf-8")).hexdigest()
+    results: List[Dict[str, Any]] = []
+    rows: List[Tuple[Any, ...]] = []
+    with _immediate_transaction() as conn:
+        existing = {
+            row["name"]
+            for row in conn.execute(
+                "select name from cats where owner_org_id = ? and name in (select value from json_each(?))",
+                (owner_org_id, json.dumps([name for name, _ in items])),
+            )
+        }
+        for name, description in items:
+            if name in existing:
+                results.append({"result": "conflict", "detail": "CAT name must be unique per tenant."})
+                continue
+            existing.add(name)
+            row = (_new_id(), owner_org_id, owner_user_id, name, description, status, now, now)
+            rows.append(row)
+            results.append({"result": "created", "cat": _cat_row_to_dict(dict(zip(_CAT_COLUMNS, row)))})
+        conn.executemany(
+            f"insert into cats ({', '.join(_CAT_COLUMNS)}) values (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+    return results
 
-    with _connect() as conn:
-        conn.execute(
-            """
-            insert into cats_versions
-              (cat_version_id, cat_id, version, manifest_json, rulebook_json, command_bundle_ref, status, created_at)
-            values (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (cat_version_id, cat_id, version, manifest_raw, rulebook_raw, command_bundle_ref, "Published", now),
+
+def publish_versions_batch(
+    owner_org_id: str,
+    cat_id: str,
+    items: List[Tuple[str, Dict[str, Any], Dict[str, Any], str]],
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Publish many (version, manifest_json, rulebook_json, command_bundle_ref) items for one CAT.
+    The status check and all inserts share one BEGIN IMMEDIATE transaction; each table gets one executemany.
+    Returns None when the CAT does not exist; raises CatStatusConflict when its status forbids publishing.
+    """
+    now = _now_iso()
+    results: List[Dict[str, Any]] = []
+    version_rows: List[Tuple[Any, ...]] = []
+    with _immediate_transaction() as conn:
+        status = _current_status(conn, owner_org_id, cat_id)
+        if status is None:
+            return None
+        if status not in ALLOWED_PUBLISH_STATUSES:
+            raise CatStatusConflict(status, "Version publish allowed only when CAT is Draft or Approved.")
+        existing = {
+            row["version"]
+            for row in conn.execute(
+                "select version from cats_versions where cat_id = ? and version in (select value from json_each(?))",
+                (cat_id, json.dumps([item[0] for item in items])),
+            )
+        }
+        for version, manifest_json, rulebook_json, command_bundle_ref in items:
+            if version in existing:
+                results.append({"result": "conflict", "detail": "Version already exists for this CAT."})
+                continue
+            existing.add(version)
+            manifest_raw = json.dumps(manifest_json, separators=(",", ":"), ensure_ascii=False)
+            rulebook_raw = json.dumps(rulebook_json, separators=(",", ":"), ensure_ascii=False)
+            row = (_new_id(), cat_id, version, manifest_raw, rulebook_raw, command_bundle_ref, "Published", now)
+            version_rows.append(row)
+            results.append({"result": "created", "version": _version_row_to_dict(dict(zip(_VERSION_COLUMNS, row)))})
+
+        digests = [_version_fingerprint(row[3], row[4], row[5]) for row in version_rows]
+        conn.executemany(
+            f"insert into cats_versions ({', '.join(_VERSION_COLUMNS)}) values (?, ?, ?, ?, ?, ?, ?, ?)",
+            version_rows,
         )
-        conn.execute(
+        conn.executemany(
             """
             insert into cats_fingerprints (fingerprint_id, cat_version_id, algo, digest, signed_by, created_at)
-            values (?, ?, ?, ?, ?, ?)
+            values (?, ?, 'sha256', ?, null, ?)
             """,
-            (_new_id(), cat_version_id, "sha256", digest, None, now),
+            [(_new_id(), row[0], digest, now) for row, digest in zip(version_rows, digests)],
         )
-        conn.execute(
+        conn.executemany(
             """
             insert into cats_metrics
               (metric_id, cat_version_id, success_count, fail_count, avg_exec_ms, last_run_at, created_at, updated_at)
             values (?, ?, 0, 0, null, null, ?, ?)
             """,
-            (_new_id(), cat_version_id, now, now),
+            [(_new_id(), row[0], now, now) for row in version_rows],
         )
-        row = conn.execute("select * from cats_versions where cat_version_id = ?", (cat_version_id,)).fetchone()
-    if row is None:
-        raise RuntimeError("version creation failed")
-    return _version_row_to_dict(row)
+    return results
 
 
 def list_versions(owner_org_id: str, cat_id: str) -> Optional[List[Dict[str, Any]]]:
-    cat = get_cat(owner_org_id, cat_id)
-    if cat is None:
-        return None
     with _connect() as conn:
+        if _current_status(conn, owner_org_id, cat_id) is None:
+            return None
         rows = conn.execute(
             """
             select * from cats_versions
@@ -309,12 +698,5 @@ def is_unique_violation(exc: Exception) -> bool:
     return "unique constraint failed" in message
 
 
-def get_status(owner_org_id: str, cat_id: str) -> Optional[str]:
-    cat = get_cat(owner_org_id, cat_id)
-    if cat is None:
-        return None
-    return str(cat["status"])
-
-
 def get_connection_error_detail(exc: Exception) -> str:
     return str(exc)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from api.cats_ledger_query import DEFAULT_EVENT_LIMIT, MAX_EVENT_LIMIT, EventFilter, stream_events
+from api.request_context import org_user
+
+router = APIRouter(prefix="/api/ledger", tags=["ledger"])
+
+
+@router.get("/events")
+def get_ledger_events(
+    orgId: Optional[str] = Query(default=None, max_length=200),
+    catId: Optional[str] = Query(default=None, max_length=200),
+    eventType: Optional[List[str]] = Query(default=None),
+    since: Optional[str] = Query(default=None, max_length=64),
+    until: Optional[str] = Query(default=None, max_length=64),
+    cursor: Optional[str] = Query(default=None, max_length=32),
+    limit: int = Query(default=DEFAULT_EVENT_LIMIT, ge=1, le=MAX_EVENT_LIMIT),
+    x_org_id: Optional[str] = Header(default=None),
+    x_user_id: Optional[str] = Header(default=None),
+) -> StreamingResponse:
+    """
+    Governance events as NDJSON, one ledger line per event, followed by a trailing
+    {"nextCursor", "hasMore", "scanned", "matched"} line. Pass nextCursor back to continue.
+    Always scoped to the caller's x-org-id; an orgId naming another org is rejected.
+    """
+    owner_org_id, _ = org_user(x_org_id, x_user_id)
+    if orgId is not None and orgId != owner_org_id:
+        raise HTTPException(status_code=403, detail="orgId does not match the caller's organization.")
+    flt = EventFilter(
+        org_id=owner_org_id,
+        cat_id=catId,
+        event_types=tuple(eventType or ()),
+        since=since,
+        until=until,
+    )
+    try:
+        lines = stream_events(flt, cursor=cursor, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return StreamingResponse(lines, media_type="application/x-ndjson")
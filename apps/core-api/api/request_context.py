@@ -0,0 +1,30 @@
+"""
+Caller identity shared by the API routers.
+
+Requests name their tenant and user with the x-org-id / x-user-id headers; demo defaults stand in
+when they are absent. Operator endpoints (store internals) additionally require the x-ops-token
+header to match RGPT_OPS_TOKEN, and are disabled while it is unset.
+"""
+from __future__ import annotations
+
+import hmac
+import os
+from typing import Optional, Tuple
+
+from fastapi import Header, HTTPException
+
+DEFAULT_ORG_ID = "org_demo"
+DEFAULT_USER_ID = "usr_demo"
+
+
+def org_user(owner_org_id: Optional[str], owner_user_id: Optional[str]) -> Tuple[str, str]:
+    return (owner_org_id or DEFAULT_ORG_ID), (owner_user_id or DEFAULT_USER_ID)
+
+
+def require_operator(x_ops_token: Optional[str] = Header(default=None)) -> None:
+    """FastAPI dependency for operator-only routes."""
+    expected = os.getenv("RGPT_OPS_TOKEN", "").strip()
+    if not expected:
+        raise HTTPException(status_code=403, detail="Operator endpoints are disabled.")
+    if not x_ops_token or not hmac.compare_digest(x_ops_token.encode("utf-8"), expected.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="Operator token required.")
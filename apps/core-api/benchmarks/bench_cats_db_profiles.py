@@ -0,0 +1,102 @@
+"""
+Concurrent read/write throughput of the CATS registry store per storage profile.
+
+Usage (from apps/core-api):
+  python benchmarks/bench_cats_db_profiles.py --seconds 5 --readers 8 --writers 2
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from api import cats_store  # noqa: E402
+from api.cats_db_profile import PROFILES  # noqa: E402
+
+
+def _bench_profile(profile: str, seconds: float, readers: int, writers: int, seed: int) -> Dict[str, Any]:
+    tmp = tempfile.mkdtemp(prefix=f"cats_bench_{profile}_")
+    os.environ["RGPT_CATS_DB_PATH"] = str(Path(tmp) / "cats.sqlite3")
+    os.environ["RGPT_CATS_DB_PROFILE"] = profile
+    os.environ["RGPT_CATS_DB_POOL_SIZE"] = str(readers + writers + 1)
+    org = "org_bench"
+    try:
+        for i in range(seed):
+            cats_store.create_cat(org, "usr_bench", f"seed-{i}", None, "Draft")
+
+        stop = threading.Event()
+        reads: List[int] = [0] * readers
+        writes: List[int] = [0] * writers
+        errors: List[str] = []
+
+        def reader(slot: int) -> None:
+            while not stop.is_set():
+                try:
+                    cats_store.list_cats(org, 1, 20)
+                    reads[slot] += 1
+                except Exception as exc:  # pragma: no cover - benchmark diagnostics
+                    errors.append(f"read:{type(exc).__name__}:{exc}")
+
+        def writer(slot: int) -> None:
+            n = 0
+            while not stop.is_set():
+                try:
+                    created = cats_store.create_cat(org, "usr_bench", f"w{slot}-{n}", None, "Draft")
+                    cats_store.transition_cat_checked(org, created["catId"], "Review")
+                    writes[slot] += 1
+                    n += 1
+                except Exception as exc:  # pragma: no cover - benchmark diagnostics
+                    errors.append(f"write:{type(exc).__name__}:{exc}")
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+        threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+        return {
+            "profile": profile,
+            "seconds": round(elapsed, 3),
+            "reads_per_s": round(sum(reads) / elapsed, 1),
+            "writes_per_s": round(sum(writes) / elapsed, 1),
+            "errors": len(errors),
+            "first_error": errors[0] if errors else None,
+        }
+    finally:
+        cats_store.close_pool()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--profiles", default=",".join(PROFILES))
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--readers", type=int, default=8)
+    ap.add_argument("--writers", type=int, default=2)
+    ap.add_argument("--seed", type=int, default=500, help="CATs inserted before timing starts")
+    args = ap.parse_args()
+
+    results = [
+        _bench_profile(name.strip(), args.seconds, args.readers, args.writers, args.seed)
+        for name in args.profiles.split(",")
+        if name.strip()
+    ]
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
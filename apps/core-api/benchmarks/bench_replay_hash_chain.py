@@ -0,0 +1,104 @@
+"""
+Hash-chain verification throughput on a synthetic NDJSON execution ledger.
+
+Usage (from apps/core-api):
+  python benchmarks/bench_replay_hash_chain.py --events 10000000 --workers 1,4,8
+  python benchmarks/bench_replay_hash_chain.py --ledger /tmp/chain.ndjson --keep   # reuse a generated file
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from replay.validators.hash_chain_validator import chain_events, validate_hash_chain  # noqa: E402
+
+
+def _synthetic_events(count: int) -> Iterator[Dict[str, Any]]:
+    for idx in range(count):
+        yield {
+            "idx": idx,
+            "ts_utc": f"2026-02-13T00:{(idx // 60) % 60:02d}:{idx % 60:02d}Z",
+            "type": "STEP",
+            "payload": {"step": idx % 97, "ok": idx % 13 != 0},
+        }
+
+
+def _generate(path: Path, count: int) -> float:
+    started = time.perf_counter()
+    with open(path, "w", encoding="utf-8", newline="\n") as fh:
+        batch = []
+        for event in chain_events(_synthetic_events(count)):
+            batch.append(json.dumps(event, separators=(",", ":")))
+            if len(batch) >= 10_000:
+                fh.write("\n".join(batch) + "\n")
+                batch.clear()
+        if batch:
+            fh.write("\n".join(batch) + "\n")
+    return time.perf_counter() - started
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--events", type=int, default=10_000_000)
+    ap.add_argument("--workers", default="1,4,8", help="comma-separated worker counts to time")
+    ap.add_argument("--ledger", help="ledger path; generated if missing")
+    ap.add_argument("--keep", action="store_true", help="keep the generated ledger")
+    args = ap.parse_args()
+
+    tmp = None
+    if args.ledger:
+        ledger = Path(args.ledger)
+    else:
+        tmp = tempfile.mkdtemp(prefix="replay_hash_chain_bench_")
+        ledger = Path(tmp) / "execution_ledger.ndjson"
+    try:
+        generated_s = None
+        if not ledger.exists():
+            generated_s = round(_generate(ledger, args.events), 3)
+        size = ledger.stat().st_size
+
+        runs = []
+        for workers in (int(w) for w in args.workers.split(",") if w.strip()):
+            started = time.perf_counter()
+            result = validate_hash_chain(str(ledger), workers=workers)
+            elapsed = time.perf_counter() - started
+            runs.append(
+                {
+                    "workers": workers,
+                    "segments": result.segments,
+                    "status": result.ledger_hash_chain_valid,
+                    "errors": result.errors,
+                    "seconds": round(elapsed, 3),
+                    "events_per_s": round(result.events_checked / elapsed, 1),
+                    "mb_per_s": round(size / elapsed / 1e6, 1),
+                }
+            )
+        print(
+            json.dumps(
+                {
+                    "ledger": str(ledger),
+                    "bytes": size,
+                    "generated_s": generated_s,
+                    "cpu_count": os.cpu_count(),
+                    "runs": runs,
+                },
+                indent=2,
+            )
+        )
+        return 0
+    finally:
+        if tmp and not args.keep:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+"""
+Side-effect policy matching: per-pattern fnmatch against the compiled PatternSet.
+
+Usage (from apps/core-api):
+  python benchmarks/bench_replay_pattern_match.py --paths 100000 --patterns 500
+  python benchmarks/bench_replay_pattern_match.py --naive-sample 0   # time fnmatch over every path
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from replay.side_effect_tracker import PatternSet  # noqa: E402
+
+SEGMENTS = ["apps", "core-api", "replay", "evidence", "docs", "ops", "executions", "cats", "ledger", "tmp", "out"]
+EXTS = [".json", ".md", ".log", ".tmp", ".txt", ".ndjson"]
+
+
+def _paths(rng: random.Random, count: int) -> List[str]:
+    out = []
+    for i in range(count):
+        depth = rng.randint(1, 6)
+        dirs = [rng.choice(SEGMENTS) + (f"-{rng.randint(0, 99)}" if rng.random() < 0.4 else "") for _ in range(depth)]
+        out.append("/".join(dirs + [f"f{i}{rng.choice(EXTS)}"]))
+    return out
+
+
+def _patterns(rng: random.Random, paths: List[str], count: int) -> List[str]:
+    out = []
+    for i in range(count):
+        kind = i % 5
+        base = rng.choice(paths).split("/")
+        if kind == 0:
+            out.append(rng.choice(paths))  # literal path
+        elif kind == 1:
+            out.append("/".join(base[:-1]) + "/**")
+        elif kind == 2:
+            out.append("/".join(base[:-1]) + "/*" + rng.choice(EXTS))
+        elif kind == 3:
+            out.append(f"{base[0]}/*/{rng.choice(SEGMENTS)}-?{rng.randint(0, 9)}/**")
+        else:
+            out.append(f"**/[a-f]{rng.randint(0, 9)}*{rng.choice(EXTS)}")
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--paths", type=int, default=100_000)
+    ap.add_argument("--patterns", type=int, default=500)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--naive-sample", type=int, default=10_000, help="paths timed with per-pattern fnmatch; 0 = all")
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    paths = _paths(rng, args.paths)
+    patterns = _patterns(rng, paths, args.patterns)
+
+    started = time.perf_counter()
+    compiled = PatternSet(patterns)
+    compile_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    fast = [compiled.matches(p) for p in paths]
+    fast_s = time.perf_counter() - started
+
+    sample = paths if args.naive_sample <= 0 else paths[: args.naive_sample]
+    started = time.perf_counter()
+    naive = [any(fnmatch.fnmatch(p, pat) for pat in patterns) for p in sample]
+    naive_s = time.perf_counter() - started
+    naive_full_s = naive_s * len(paths) / len(sample)
+
+    print(
+        json.dumps(
+            {
+                "paths": len(paths),
+                "patterns": len(patterns),
+                "matched": sum(fast),
+                "results_agree": naive == fast[: len(sample)],
+                "compile_s": round(compile_s, 4),
+                "pattern_set_s": round(fast_s, 3),
+                "fnmatch_sampled_paths": len(sample),
+                "fnmatch_s_extrapolated": round(naive_full_s, 3),
+                "speedup": round(naive_full_s / fast_s, 1) if fast_s else None,
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
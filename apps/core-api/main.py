@@ -1,11 +1,28 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from api.cats_ledger import close_ledger_writer
 from api.cats_lifecycle_router import router as cats_lifecycle_router
 from api.cats_registry_router import router as cats_registry_router
+from api.cats_registry_snapshot import close_registry_watchers
+from api.cats_store import check_storage_config, close_pool
+from api.ledger_router import router as ledger_router
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    check_storage_config()
+    yield
+    close_ledger_writer()
+    close_pool()
+    close_registry_watchers()
+
 
-app = FastAPI(title="RocketGPT Core API (Demo)", version="0.1.0")
+app = FastAPI(title="RocketGPT Core API (Demo)", version="0.1.0", lifespan=lifespan)
 app.include_router(cats_registry_router)
 app.include_router(cats_lifecycle_router)
+app.include_router(ledger_router)
 
 # Demo smoke (read-only endpoints):
 # python -m py_compile main.py api/cats_registry_router.py
@@ -14,3 +31,4 @@ app.include_router(cats_lifecycle_router)
 # curl http://localhost:8080/cats/RGPT-CAT-01/definition
 # curl http://localhost:8080/cats/RGPT-CAT-01/passport
 # curl "http://localhost:8080/cats/resolve?canonical_name=protea/policy-validator"
+# curl -X POST -H "x-ops-token: $RGPT_OPS_TOKEN" http://localhost:8080/cats/registry/reload
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from ..semantic_normalizer import canonicalize_intent_outcome_pair
 from ..semantic_diff import semantic_diff
+from ..utils.io import summarize_ledger
 
 
 
@@ -36,35 +37,74 @@ def compare_ledgers_semantic(
       mismatch_fields: list[str]
       notes: str
     """
+    mismatch_fields = _minimal_mismatches(
+        execution_ledger,
+        decision_ledger,
+        _event_count(execution_ledger),
+        _event_count(decision_ledger),
+    )
+    notes = "minimal_compare(schema_version, execution_id, events.count)"
+    return (len(mismatch_fields) > 0), mismatch_fields, notes
+
+
+def _minimal_mismatches(
+    exec_fields: Dict[str, Any],
+    dec_fields: Dict[str, Any],
+    exec_events: Optional[int],
+    dec_events: Optional[int],
+) -> List[str]:
     mismatch_fields: List[str] = []
 
     # Common fields used in our ledgers (best-effort)
-    exec_schema = execution_ledger.get("schema_version")
-    dec_schema = decision_ledger.get("schema_version")
+    exec_schema = exec_fields.get("schema_version")
+    dec_schema = dec_fields.get("schema_version")
     if exec_schema is not None or dec_schema is not None:
         if exec_schema != dec_schema:
             mismatch_fields.append("schema_version")
 
-    exec_id = execution_ledger.get("execution_id")
-    dec_exec_id = decision_ledger.get("execution_id")
+    exec_id = exec_fields.get("execution_id")
+    dec_exec_id = dec_fields.get("execution_id")
     if exec_id is not None or dec_exec_id is not None:
         if exec_id != dec_exec_id:
             mismatch_fields.append("execution_id")
 
-    exec_events = _event_count(execution_ledger)
-    dec_events = _event_count(decision_ledger)
     if exec_events is not None or dec_events is not None:
         if exec_events != dec_events:
             mismatch_fields.append("events.count")
 
+    return mismatch_fields
+
+
+def compare_ledger_files(
+    execution_ledger_path: str,
+    decision_ledger_path: str,
+    from_event_idx: int = 0,
+    to_event_idx: Optional[int] = None,
+) -> Tuple[bool, List[str], str]:
+    """
+    Same comparison as compare_ledgers_semantic, but streams both ledgers (JSON object,
+    JSON array or NDJSON) and counts only events inside [from_event_idx, to_event_idx],
+    so ledger size does not bound the judge's memory. Events past to_event_idx are skipped
+    over without being decoded; top-level fields after the events array are still compared.
+    """
+    exec_summary = summarize_ledger(execution_ledger_path, from_event_idx, to_event_idx)
+    dec_summary = summarize_ledger(decision_ledger_path, from_event_idx, to_event_idx)
+    mismatch_fields = _minimal_mismatches(
+        exec_summary.fields,
+        dec_summary.fields,
+        exec_summary.event_count,
+        dec_summary.event_count,
+    )
     notes = "minimal_compare(schema_version, execution_id, events.count)"
+    if from_event_idx or to_event_idx is not None:
+        notes += f" window[{from_event_idx}..{'' if to_event_idx is None else to_event_idx}]"
     return (len(mismatch_fields) > 0), mismatch_fields, notes
 
 
 # ---------------------------------------------------------------------------
 # Compatibility wrapper
-# replay_runner imports compare_ledgers from this module.
-# Route it to the current judge implementation.
+# replay_runner uses compare_ledger_files; compare_ledgers stays for callers that
+# still pass in-memory ledgers. Route it to the current judge implementation.
 # ---------------------------------------------------------------------------
 def compare_ledgers(
     execution_ledger: Dict[str, Any],
@@ -0,0 +1,125 @@
+"""
+Per-stage resource metering for the replay runner.
+
+StageMeter.stage(name) records, for the enclosed block:
+  wall_ms              perf_counter delta
+  cpu_ms               process_time delta (user + system, all threads of this process)
+  read_bytes/write_bytes
+                       rchar/wchar deltas from /proc/self/io: bytes passed through read/write
+                       syscalls, including page-cache hits (None where /proc is unavailable)
+  peak_rss_delta_kb    growth of the process high-water RSS (ru_maxrss) during the block; 0 when
+                       the block stayed under an earlier peak (None without the resource module)
+
+Counters are process-wide, so stages must not run concurrently within one process.
+"""
+from __future__ import annotations
+
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+_PROC_IO = "/proc/self/io"
+
+
+@dataclass(frozen=True)
+class StageProfile:
+    stage: str
+    wall_ms: float
+    cpu_ms: float
+    read_bytes: Optional[int]
+    write_bytes: Optional[int]
+    peak_rss_delta_kb: Optional[int]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _io_counters() -> Tuple[Optional[int], Optional[int], int]:
+    """(rchar, wchar, bytes this call itself read from /proc); rchar does not include the latter yet."""
+    try:
+        with open(_PROC_IO, "rb") as fh:
+            raw = fh.read()
+        fields = dict(line.split(b":", 1) for line in raw.splitlines() if b":" in line)
+        return int(fields[b"rchar"]), int(fields[b"wchar"]), len(raw)
+    except (OSError, KeyError, ValueError):
+        return None, None, 0
+
+
+def _peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB elsewhere.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _delta(after: Optional[int], before: Optional[int]) -> Optional[int]:
+    if after is None or before is None:
+        return None
+    return max(after - before, 0)
+
+
+class StageMeter:
+    def __init__(self) -> None:
+        self.stages: Dict[str, StageProfile] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        read_before, write_before, own_read = _io_counters()
+        if read_before is not None:
+            # Don't charge the stage for reading /proc/self/io.
+            read_before += own_read
+        rss_before = _peak_rss_kb()
+        cpu_before = time.process_time()
+        wall_before = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_ms = (time.perf_counter() - wall_before) * 1000.0
+            cpu_ms = (time.process_time() - cpu_before) * 1000.0
+            read_after, write_after, _ = _io_counters()
+            self.stages[name] = StageProfile(
+                stage=name,
+                wall_ms=round(wall_ms, 3),
+                cpu_ms=round(cpu_ms, 3),
+                read_bytes=_delta(read_after, read_before),
+                write_bytes=_delta(write_after, write_before),
+                peak_rss_delta_kb=_delta(_peak_rss_kb(), rss_before),
+            )
+
+    def profile(self, name: str) -> Optional[Dict[str, Any]]:
+        found = self.stages.get(name)
+        return found.to_dict() if found is not None else None
+
+    def timings_ms(self) -> Dict[str, float]:
+        return {name: p.wall_ms for name, p in self.stages.items()}
+
+    def rollup(self) -> Dict[str, Any]:
+        """Per-stage profiles plus totals, for replay_result.json."""
+        stages = [p.to_dict() for p in self.stages.values()]
+
+        def total(key: str) -> Any:
+            values = [s[key] for s in stages if s[key] is not None]
+            if not values:
+                return None
+            return round(sum(values), 3) if isinstance(values[0], float) else sum(values)
+
+        slowest = max(self.stages.values(), key=lambda p: p.wall_ms, default=None)
+        return {
+            "stages": stages,
+            "total": {
+                "wall_ms": total("wall_ms"),
+                "cpu_ms": total("cpu_ms"),
+                "read_bytes": total("read_bytes"),
+                "write_bytes": total("write_bytes"),
+                "peak_rss_delta_kb": total("peak_rss_delta_kb"),
+            },
+            "slowest_stage": slowest.stage if slowest is not None else None,
+        }
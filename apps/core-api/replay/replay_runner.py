@@ -1,21 +1,27 @@
 from __future__ import annotations
 
 import argparse
-import hashlib
+import cProfile
+import errno
+import glob
 import json
 import os
 import re
 import sys
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
 try:
     from .commissioner.decision_engine import CommissionerInputs, decide
     from .models import ReplayConfig, ReplayContext, ReplayPaths, TriState
     from .utils.io import read_json, write_json
-    from .judge.judge_engine import compare_ledgers
+    from .judge.judge_engine import compare_ledger_files
     from .validators.artifact_manifest_validator import (
         validate_artifacts_manifest,
     )
@@ -25,6 +31,11 @@ try:
     )
     from .side_effect_tracker import SideEffectTracker
     from .side_effects_snapshot import collect_snapshot, diff_snapshots
+    from .utils.fs_scan import FileScan
+    from .utils.hash_cache import FileDigestCache
+    from .profiling import StageMeter
+    from api.cats_registry_index import build_police_register_index
+    from api.cats_registry_snapshot import RegistrySnapshot, current_snapshot
 except ImportError:  # pragma: no cover - local execution fallback
     package_root = Path(__file__).resolve().parents[1]
     if str(package_root) not in sys.path:
@@ -41,7 +52,7 @@ except ImportError:  # pragma: no cover - local execution fallback
             TriState,
         )
         from replay.utils.io import read_json, write_json
-        from replay.judge.judge_engine import compare_ledgers
+        from replay.judge.judge_engine import compare_ledger_files
         from replay.validators.artifact_manifest_validator import (
             validate_artifacts_manifest,
         )
@@ -51,6 +62,11 @@ except ImportError:  # pragma: no cover - local execution fallback
         )
         from replay.side_effect_tracker import SideEffectTracker
         from replay.side_effects_snapshot import collect_snapshot, diff_snapshots
+        from replay.utils.fs_scan import FileScan
+        from replay.utils.hash_cache import FileDigestCache
+        from replay.profiling import StageMeter
+        from api.cats_registry_index import build_police_register_index
+        from api.cats_registry_snapshot import RegistrySnapshot, current_snapshot
     except ImportError as exc:
         raise SystemExit(
             "Replay runner import failed. Ensure PYTHONPATH includes "
@@ -67,10 +83,16 @@ def _utc_now_iso(frozen_ts: datetime | None = None) -> str:
 
 
 def _default_run_dir(
-    base: str, execution_id: str, frozen_ts: datetime | None = None
+    base: str,
+    execution_id: str,
+    frozen_ts: datetime | None = None,
+    run_label: str | None = None,
 ) -> str:
     ts = frozen_ts if frozen_ts else datetime.now(timezone.utc)
     ts_str = ts.strftime("%Y%m%d-%H%M%SZ")
+    if run_label:
+        # Batch runs start many contracts per second; keep their evidence dirs apart.
+        ts_str = f"{ts_str}-{run_label}"
     safe_exec = execution_id or "unknown_execution"
     return str(Path(base) / safe_exec / ts_str)
 
@@ -255,6 +277,7 @@ def _verify_passport_cross_links(
     cat_def: Dict[str, Any],
     registry_entry: Dict[str, Any] | None,
     police_register: Dict[str, Any] | None,
+    passports_by_id: Mapping[str, Dict[str, Any]] | None = None,
 ) -> tuple[str | None, str | None]:
     if not isinstance(registry_entry, dict):
         return (
@@ -277,20 +300,9 @@ def _verify_passport_cross_links(
             f"registry passport_id '{registry_passport_id}' != definition '{def_passport_id}'.",
         )
 
-    passports = []
-    if isinstance(police_register, dict):
-        raw_passports = police_register.get("passports", []) or []
-        if isinstance(raw_passports, list):
-            passports = raw_passports
-    passport = next(
-        (
-            p
-            for p in passports
-            if isinstance(p, dict)
-            and str(p.get("passport_id", "")) == registry_passport_id
-        ),
-        None,
-    )
+    if passports_by_id is None:
+        passports_by_id = build_police_register_index(police_register).passports_by_id
+    passport = passports_by_id.get(registry_passport_id)
     if passport is None:
         return (
             "police<->registry",
@@ -315,6 +327,242 @@ def _verify_passport_cross_links(
     return None, None
 
 
+_Failure = Tuple[str, str, Optional[str]]
+
+
+class _VerificationAborted(Exception):
+    """A required verification file was unusable; the failure has already been recorded."""
+
+
+@dataclass(frozen=True)
+class _CatsStaticVerification:
+    """Result of every CAT verification check that depends only on file contents."""
+
+    canonical_name: Any
+    allowed_side_effects_declared: Tuple[str, ...]
+    passport_required: bool
+    passport: Dict[str, Any] | None
+    # Failures in the order they are reported; the passport expiry check runs between the two.
+    pre_expiry_failures: Tuple[_Failure, ...]
+    post_expiry_failures: Tuple[_Failure, ...]
+    aborted: bool
+
+
+class _VerificationCache:
+    """
+    Bounded map of (definition digest, registry digest, police register digest) -> static result.
+    Keys are content digests, so any edit to one of the three files is a different key.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Any, ...], _CatsStaticVerification]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[Any, ...]) -> _CatsStaticVerification | None:
+        with self._lock:
+            found = self._entries.get(key)
+            if found is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return found
+
+    def put(self, key: Tuple[Any, ...], value: _CatsStaticVerification) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_CATS_VERIFICATION_CACHE = _VerificationCache()
+_CATS_ROOT = Path(__file__).resolve().parents[3] / "cats"
+
+
+def _snapshot_error(snapshot: RegistrySnapshot, relative: str, path: Path) -> Exception:
+    error = snapshot.error_for(relative)
+    if error in (None, "missing"):
+        return FileNotFoundError(errno.ENOENT, "No such file or directory", str(path))
+    # Error path only: re-read so the reported exception matches what a direct read would raise.
+    try:
+        read_json(str(path))
+    except Exception as exc:
+        return exc
+    return ValueError(f"{relative} is {error}")
+
+
+def _verification_file_failure(exc: BaseException) -> _Failure:
+    if isinstance(exc, FileNotFoundError):
+        return (
+            "MISSING",
+            f"Required verification file missing: {exc.filename}",
+            f"missing_file:{exc.filename}",
+        )
+    return (
+        "MISSING",
+        f"Verification exception: {type(exc).__name__}",
+        f"verification_exception:{type(exc).__name__}:{exc}",
+    )
+
+
+def _verify_cats_definition(
+    *,
+    cat_def: Dict[str, Any],
+    computed_bundle_digest: str,
+    registry: Dict[str, Any] | None,
+    registry_error: Exception | None,
+    register: Dict[str, Any] | None,
+    register_error: Exception | None,
+    passports_by_id: Mapping[str, Dict[str, Any]],
+) -> _CatsStaticVerification:
+    failures: List[_Failure] = []
+    post_expiry: List[_Failure] = []
+
+    canonical_name = cat_def.get("canonical_name")
+    allowed_side_effects_declared = tuple(cat_def.get("allowed_side_effects", []) or [])
+    passport_required = bool(cat_def.get("passport_required"))
+    passport_id = cat_def.get("passport_id")
+
+    def result(passport: Dict[str, Any] | None, aborted: bool) -> _CatsStaticVerification:
+        return _CatsStaticVerification(
+            canonical_name=canonical_name,
+            allowed_side_effects_declared=allowed_side_effects_declared,
+            passport_required=passport_required,
+            passport=passport,
+            pre_expiry_failures=tuple(failures),
+            post_expiry_failures=tuple(post_expiry),
+            aborted=aborted,
+        )
+
+    registry_entry = None
+    try:
+        if registry_error is not None:
+            raise registry_error
+        registry_error_msg = _verify_cat_registry_entry(
+            registry, canonical_name, cat_def.get("cat_id")
+        )
+        if registry_error_msg:
+            failures.append(
+                (
+                    "PASSPORT_MISMATCH",
+                    f"Passport cross-verification failed (registry<->def): {registry_error_msg}",
+                    "registry_mismatch",
+                )
+            )
+        registry_entry = _get_cat_registry_record(registry, canonical_name)
+        registry_binding_error = _verify_cat_registry_namespace_binding(
+            registry_entry, canonical_name
+        )
+        if registry_binding_error:
+            failures.append(
+                (
+                    "PASSPORT_MISMATCH",
+                    (
+                        "Passport cross-verification failed (registry<->def): "
+                        f"{registry_binding_error}"
+                    ),
+                    "registry_mismatch",
+                )
+            )
+        registry_non_active = _cat_registry_non_active_block(registry, registry_entry)
+        if registry_non_active:
+            failures.append(
+                (
+                    "REGISTRY_NOT_ACTIVE",
+                    f"Registry not active: {registry_non_active}. Side effects downgraded to read_only.",
+                    "registry_not_active",
+                )
+            )
+    except FileNotFoundError as exc:
+        failures.append(
+            (
+                "PASSPORT_MISMATCH",
+                f"Passport cross-verification failed (registry<->def): registry missing: {exc.filename}",
+                f"registry_missing:{exc.filename}",
+            )
+        )
+    except Exception as exc:
+        failures.append(
+            (
+                "PASSPORT_MISMATCH",
+                f"Passport cross-verification failed (registry<->def): {type(exc).__name__}",
+                f"registry_exception:{type(exc).__name__}:{exc}",
+            )
+        )
+
+    if not isinstance(canonical_name, str) or not re.fullmatch(
+        r"[a-z0-9-]+/[a-z0-9-]+", canonical_name
+    ):
+        failures.append(
+            ("INVALID_NAME", "CAT canonical_name is invalid.", "canonical_name_invalid")
+        )
+
+    if register_error is not None:
+        failures.append(_verification_file_failure(register_error))
+        return result(None, aborted=True)
+
+    cross_link, cross_link_detail = _verify_passport_cross_links(
+        cat_def=cat_def,
+        registry_entry=registry_entry,
+        police_register=register,
+        passports_by_id=passports_by_id,
+    )
+    if cross_link:
+        failures.append(
+            (
+                "PASSPORT_MISMATCH",
+                f"Passport cross-verification failed ({cross_link}): {cross_link_detail}",
+                f"passport_mismatch:{cross_link}",
+            )
+        )
+
+    if not passport_required:
+        return result(None, aborted=False)
+
+    if not passport_id:
+        failures.append(
+            ("MISSING", "CAT definition missing passport_id.", "passport_id_missing")
+        )
+    passport = passports_by_id.get(str(passport_id))
+    if passport is None:
+        failures.append(
+            ("MISSING", "Passport not found in police register.", "passport_missing")
+        )
+        return result(None, aborted=False)
+
+    passport_status = passport.get("status")
+    if passport_status != "ACTIVE":
+        if passport_status == "REVOKED":
+            failures.append(("REVOKED", "Passport status REVOKED.", "passport_revoked"))
+        elif passport_status == "SUSPENDED":
+            failures.append(("SUSPENDED", "Passport status SUSPENDED.", "passport_suspended"))
+        else:
+            failures.append(
+                (
+                    "REVOKED",
+                    f"Passport status {passport_status or 'MISSING'}.",
+                    "passport_not_active",
+                )
+            )
+    if passport.get("bundle_digest") != computed_bundle_digest:
+        post_expiry.append(
+            (
+                "DIGEST_MISMATCH",
+                "Passport bundle_digest does not match definition.",
+                "bundle_digest_mismatch",
+            )
+        )
+    return result(passport, aborted=False)
+
+
 def _cats_demo_stub_output(cat_id: str, payload: Any) -> Dict[str, Any]:
     if cat_id == "RGPT-CAT-01":
         return {
@@ -360,10 +608,9 @@ def _run_cats_demo_execution(
         payload = {"_raw": payload_raw}
         notes.append(f"payload_json_parse_failed:{type(exc).__name__}")
 
-    repo_root = Path(__file__).resolve().parents[3]
-    cat_def_path = repo_root / "cats" / "definitions" / f"{cat_id}.json"
-    police_register_path = repo_root / "cats" / "police_register.demo.json"
-    registry_index_path = repo_root / "cats" / "registry_index.json"
+    cat_def_path = _CATS_ROOT / "definitions" / f"{cat_id}.json"
+    police_register_path = _CATS_ROOT / "police_register.demo.json"
+    registry_index_path = _CATS_ROOT / "registry_index.json"
 
     canonical_name = None
     passport_status = None
@@ -374,7 +621,6 @@ def _run_cats_demo_execution(
     allowed_side_effects_effective: List[str] = ["read_only"]
     verification_ok = False
     passport_required = False
-    registry_entry = None
     passport: Dict[str, Any] | None = None
     register: Dict[str, Any] | None = None
     passport_verification_status = "MISSING"
@@ -394,149 +640,74 @@ def _run_cats_demo_execution(
             failure_note = note
 
     try:
-        cat_bytes = cat_def_path.read_bytes()
-        computed_bundle_digest = hashlib.sha256(cat_bytes).hexdigest()
-        cat_def = json.loads(cat_bytes.decode("utf-8"))
-        canonical_name = cat_def.get("canonical_name")
-        allowed_side_effects_declared = list(
-            cat_def.get("allowed_side_effects", []) or []
-        )
-        passport_required = bool(cat_def.get("passport_required"))
-        passport_id = cat_def.get("passport_id")
-
-        try:
-            registry_index = read_json(str(registry_index_path))
-            registry_error = _verify_cat_registry_entry(
-                registry_index, canonical_name, cat_def.get("cat_id")
-            )
-            if registry_error:
-                record_failure(
-                    "PASSPORT_MISMATCH",
-                    f"Passport cross-verification failed (registry<->def): {registry_error}",
-                    "registry_mismatch",
-                )
-            registry_entry = _get_cat_registry_record(registry_index, canonical_name)
-            registry_binding_error = _verify_cat_registry_namespace_binding(
-                registry_entry, canonical_name
-            )
-            if registry_binding_error:
-                record_failure(
-                    "PASSPORT_MISMATCH",
-                    (
-                        "Passport cross-verification failed (registry<->def): "
-                        f"{registry_binding_error}"
-                    ),
-                    "registry_mismatch",
-                )
-            registry_non_active = _cat_registry_non_active_block(
-                registry_index, registry_entry
-            )
-            if registry_non_active:
-                record_failure(
-                    "REGISTRY_NOT_ACTIVE",
-                    f"Registry not active: {registry_non_active}. Side effects downgraded to read_only.",
-                    "registry_not_active",
-                )
-        except FileNotFoundError as exc:
-            record_failure(
-                "PASSPORT_MISMATCH",
-                f"Passport cross-verification failed (registry<->def): registry missing: {exc.filename}",
-                f"registry_missing:{exc.filename}",
-            )
-        except Exception as exc:
-            record_failure(
-                "PASSPORT_MISMATCH",
-                f"Passport cross-verification failed (registry<->def): {type(exc).__name__}",
-                f"registry_exception:{type(exc).__name__}:{exc}",
-            )
-
-        if not isinstance(canonical_name, str) or not re.fullmatch(
-            r"[a-z0-9-]+/[a-z0-9-]+", canonical_name
-        ):
-            record_failure(
-                "INVALID_NAME",
-                "CAT canonical_name is invalid.",
-                "canonical_name_invalid",
-            )
-
-        register = read_json(str(police_register_path))
-        passports = register.get("passports", []) or []
-        cross_link, cross_link_detail = _verify_passport_cross_links(
-            cat_def=cat_def,
-            registry_entry=registry_entry,
-            police_register=register,
+        # Re-check the tree before trusting the snapshot (and the verification cache keyed on
+        # it): a revocation must not wait for the watcher's next poll.
+        snapshot = current_snapshot(_CATS_ROOT, revalidate=True)
+        cat_doc = snapshot.definitions.get(cat_id)
+        if cat_doc is None:
+            raise _snapshot_error(snapshot, f"definitions/{cat_id}.json", cat_def_path)
+        computed_bundle_digest = cat_doc.sha256
+        registry_doc = snapshot.registry
+        register_doc = snapshot.police_register
+        key = (
+            cat_doc.sha256,
+            registry_doc.sha256 if registry_doc is not None else None,
+            register_doc.sha256 if register_doc is not None else None,
         )
-        if cross_link:
-            record_failure(
-                "PASSPORT_MISMATCH",
-                f"Passport cross-verification failed ({cross_link}): {cross_link_detail}",
-                f"passport_mismatch:{cross_link}",
+        static = _CATS_VERIFICATION_CACHE.get(key)
+        if static is None:
+            static = _verify_cats_definition(
+                cat_def=cat_doc.data,
+                computed_bundle_digest=computed_bundle_digest,
+                registry=registry_doc.data if registry_doc is not None else None,
+                registry_error=(
+                    _snapshot_error(snapshot, "registry_index.json", registry_index_path)
+                    if registry_doc is None
+                    else None
+                ),
+                register=register_doc.data if register_doc is not None else None,
+                register_error=(
+                    _snapshot_error(snapshot, "police_register.demo.json", police_register_path)
+                    if register_doc is None
+                    else None
+                ),
+                passports_by_id=(
+                    snapshot.police_index.passports_by_id if register_doc is not None else {}
+                ),
             )
-        if passport_required:
-            if not passport_id:
+            _CATS_VERIFICATION_CACHE.put(key, static)
+
+        canonical_name = static.canonical_name
+        allowed_side_effects_declared = list(static.allowed_side_effects_declared)
+        passport_required = static.passport_required
+        register = register_doc.data if register_doc is not None else None
+        passport = static.passport
+
+        for failure in static.pre_expiry_failures:
+            record_failure(*failure)
+        if static.aborted:
+            raise _VerificationAborted()
+
+        # Time-dependent checks run on every replay; everything else comes from the cache.
+        if passport is not None:
+            passport_status = passport.get("status")
+            passport_expires = passport.get("expires_at_utc")
+            passport_bundle_digest = passport.get("bundle_digest")
+            expires_dt = _parse_utc_datetime(passport_expires)
+            if expires_dt is None:
                 record_failure(
-                    "MISSING",
-                    "CAT definition missing passport_id.",
-                    "passport_id_missing",
+                    "EXPIRED",
+                    "Passport expiry invalid.",
+                    "passport_expiry_invalid",
                 )
-            passport = next(
-                (
-                    p
-                    for p in passports
-                    if str(p.get("passport_id", "")) == str(passport_id)
-                ),
-                None,
-            )
-            if passport is None:
+            elif expires_dt <= now_utc:
                 record_failure(
-                    "MISSING",
-                    "Passport not found in police register.",
-                    "passport_missing",
+                    "EXPIRED",
+                    "Passport expired.",
+                    "passport_expired",
                 )
-            else:
-                passport_status = passport.get("status")
-                passport_expires = passport.get("expires_at_utc")
-                passport_bundle_digest = passport.get("bundle_digest")
-                if passport_status != "ACTIVE":
-                    if passport_status == "REVOKED":
-                        record_failure(
-                            "REVOKED",
-                            "Passport status REVOKED.",
-                            "passport_revoked",
-                        )
-                    elif passport_status == "SUSPENDED":
-                        record_failure(
-                            "SUSPENDED",
-                            "Passport status SUSPENDED.",
-                            "passport_suspended",
-                        )
-                    else:
-                        record_failure(
-                            "REVOKED",
-                            f"Passport status {passport_status or 'MISSING'}.",
-                            "passport_not_active",
-                        )
-                expires_dt = _parse_utc_datetime(passport_expires)
-                if expires_dt is None:
-                    record_failure(
-                        "EXPIRED",
-                        "Passport expiry invalid.",
-                        "passport_expiry_invalid",
-                    )
-                elif expires_dt <= now_utc:
-                    record_failure(
-                        "EXPIRED",
-                        "Passport expired.",
-                        "passport_expired",
-                    )
-                if passport_bundle_digest != computed_bundle_digest:
-                    record_failure(
-                        "DIGEST_MISMATCH",
-                        "Passport bundle_digest does not match definition.",
-                        "bundle_digest_mismatch",
-                    )
-        else:
-            passport = None
+        for failure in static.post_expiry_failures:
+            record_failure(*failure)
 
         verification_ok = failure_status is None
         if verification_ok:
@@ -550,18 +721,10 @@ def _run_cats_demo_execution(
         else:
             passport_verification_status = str(failure_status)
             passport_verification_note = str(failure_note)
-    except FileNotFoundError as exc:
-        record_failure(
-            "MISSING",
-            f"Required verification file missing: {exc.filename}",
-            f"missing_file:{exc.filename}",
-        )
-    except Exception as exc:  # pragma: no cover - demo safety fallback
-        record_failure(
-            "MISSING",
-            f"Verification exception: {type(exc).__name__}",
-            f"verification_exception:{type(exc).__name__}:{exc}",
-        )
+    except _VerificationAborted:
+        pass
+    except Exception as exc:
+        record_failure(*_verification_file_failure(exc))
 
     forced_status = _demo_deny_status(demo_deny_reason)
     if forced_status:
@@ -712,6 +875,7 @@ def _inspector_stage(
     ctx: ReplayContext,
     collector_report: Dict[str, Any],
     frozen_ts: datetime | None = None,
+    scan: FileScan | None = None,
 ) -> Dict[str, Any]:
     missing_inputs = collector_report.get("missing_inputs", [])
 
@@ -727,6 +891,8 @@ def _inspector_stage(
 
     errors: List[str] = []
     executed_checks: List[str] = []
+    artifact_hash_stats: Dict[str, Any] = {}
+    schema_stats: Dict[str, Any] = {}
 
     if "execution_ledger_path" not in missing_inputs:
         executed_checks.append("ledger_hash_chain_valid")
@@ -736,9 +902,10 @@ def _inspector_stage(
 
     if "artifacts_manifest_path" not in missing_inputs:
         executed_checks.append("artifact_hashes_valid")
-        r = validate_artifacts_manifest(ctx.paths.artifacts_manifest_path)
+        r = validate_artifacts_manifest(ctx.paths.artifacts_manifest_path, scan=scan)
         checks["artifact_hashes_valid"] = r.artifact_hashes_valid
         errors.extend([f"artifacts:{e}" for e in r.errors])
+        artifact_hash_stats = r.stats
 
     if (
         "execution_ledger_path" not in missing_inputs
@@ -750,6 +917,7 @@ def _inspector_stage(
         )
         checks["schema_versions_compatible"] = r.schema_versions_compatible
         errors.extend([f"schema:{e}" for e in r.errors])
+        schema_stats = r.stats
 
     return {
         "stage": "inspector",
@@ -758,6 +926,8 @@ def _inspector_stage(
         "status": _compute_inspector_status(checks),
         "timestamp_utc": _utc_now_iso(frozen_ts),
         "errors": errors,
+        "artifact_hash_stats": artifact_hash_stats,
+        "schema_stats": schema_stats,
     }
 
 
@@ -872,10 +1042,11 @@ def _judge_stage(
     errors: List[str] = []
 
     try:
-        exec_ledger = read_json(ctx.paths.execution_ledger_path)
-        dec_ledger = read_json(ctx.paths.decision_ledger_path)
-        mismatched, mismatch_fields, notes = compare_ledgers(
-            exec_ledger, dec_ledger
+        mismatched, mismatch_fields, notes = compare_ledger_files(
+            ctx.paths.execution_ledger_path,
+            ctx.paths.decision_ledger_path,
+            ctx.config.from_event_idx,
+            ctx.config.to_event_idx,
         )
         diff_obj = {
             "compared": True,
@@ -909,7 +1080,9 @@ def _judge_stage(
 
 
 def build_context(
-    contract: Dict[str, Any], frozen_ts: datetime | None = None
+    contract: Dict[str, Any],
+    frozen_ts: datetime | None = None,
+    run_label: str | None = None,
 ) -> ReplayContext:
     r = contract["replay"]
     inputs = r.get("inputs", {}) or {}
@@ -936,7 +1109,7 @@ def build_context(
             if cats_demo_cat_id:
                 evidence_execution_id = cats_demo_cat_id
         evidence_dir = _default_run_dir(
-            base_evidence_root, evidence_execution_id, frozen_ts
+            base_evidence_root, evidence_execution_id, frozen_ts, run_label
         )
     if not stage_reports_dir:
         stage_reports_dir = str(Path(evidence_dir) / "stage_reports")
@@ -967,7 +1140,74 @@ def build_context(
     )
 
 
-def run(contract_path: str, mode_override: str | None = None) -> int:
+@dataclass(frozen=True)
+class ReplayOutcome:
+    contract_path: str
+    exit_code: int
+    status: str
+    reason: str | None
+    evidence_dir: str | None
+    stage_timings_ms: Dict[str, float]
+    error: str | None = None
+    profile_dump_path: str | None = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "contract_path": self.contract_path,
+            "exit_code": self.exit_code,
+            "status": self.status,
+            "reason": self.reason,
+            "evidence_dir": self.evidence_dir,
+            "stage_timings_ms": dict(self.stage_timings_ms),
+            "error": self.error,
+            "profile_dump_path": self.profile_dump_path,
+        }
+
+
+PROFILE_DUMP_NAME = "replay_profile.pstats"
+
+
+def run(
+    contract_path: str, mode_override: str | None = None, profile: bool = False
+) -> int:
+    return run_detailed(contract_path, mode_override, profile=profile).exit_code
+
+
+def run_detailed(
+    contract_path: str,
+    mode_override: str | None = None,
+    *,
+    verbose: bool = True,
+    run_label: str | None = None,
+    profile: bool = False,
+) -> ReplayOutcome:
+    """
+    Run one contract and report how it ended and what each stage cost.
+
+    With `profile`, the whole run is also recorded with cProfile and dumped to
+    <evidence_dir>/replay_profile.pstats (inspect with `python -m pstats`).
+    """
+    if not profile:
+        return _replay(contract_path, mode_override, verbose, run_label, False)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        outcome = _replay(contract_path, mode_override, verbose, run_label, True)
+    finally:
+        profiler.disable()
+    dump_path = Path(outcome.evidence_dir or ".") / PROFILE_DUMP_NAME
+    profiler.dump_stats(str(dump_path))
+    return replace(outcome, profile_dump_path=str(dump_path))
+
+
+def _replay(
+    contract_path: str,
+    mode_override: str | None,
+    verbose: bool,
+    run_label: str | None,
+    profiled: bool,
+) -> ReplayOutcome:
+    meter = StageMeter()
     contract = read_json(contract_path)
 
     # Determine frozen timestamp if determinism.freeze_time_utc is enabled
@@ -976,7 +1216,7 @@ def run(contract_path: str, mode_override: str | None = None) -> int:
     if determinism.get("freeze_time_utc", False):
         frozen_ts = datetime.now(timezone.utc)
 
-    ctx = build_context(contract, frozen_ts)
+    ctx = build_context(contract, frozen_ts, run_label)
 
     # Compute effective_runtime_mode without mutating ctx
     effective_runtime_mode = (
@@ -989,60 +1229,99 @@ def run(contract_path: str, mode_override: str | None = None) -> int:
     repo_root = Path(__file__).resolve().parents[3]
     snapshot_files_root = str(repo_root / "docs" / "ops" / "executions")
 
-    begin_snapshot = collect_snapshot(ctx, files_root=snapshot_files_root)
+    stage_reports_dir = Path(ctx.paths.stage_reports_dir)
+
+    # One filesystem table per run for the snapshots, the tracker and the artifact validator.
+    # It is invalidated whenever the replay may have written files; digests survive that.
+    scan = FileScan(FileDigestCache.default())
+
+    with meter.stage("snapshot_begin"):
+        begin_snapshot = collect_snapshot(ctx, files_root=snapshot_files_root, scan=scan)
+        tracker_baseline = SideEffectTracker.begin(ctx, contract_path=contract_path, scan=scan)
+    scan.invalidate()
     _ensure_dir(ctx.paths.evidence_dir)
     _ensure_dir(ctx.paths.stage_reports_dir)
-    cats_demo_artifact, cats_demo_artifact_path = _run_cats_demo_execution(
-        contract, ctx, frozen_ts
-    )
+    with meter.stage("cats_demo"):
+        cats_demo_artifact, cats_demo_artifact_path = _run_cats_demo_execution(
+            contract, ctx, frozen_ts
+        )
 
-    collector = _collector_stage(ctx, frozen_ts)
+    with meter.stage("collector"):
+        collector = _collector_stage(ctx, frozen_ts)
     write_json(
-        str(Path(ctx.paths.stage_reports_dir) / "01_collector_report.json"),
-        collector,
+        str(stage_reports_dir / "01_collector_report.json"),
+        {**collector, "profile": meter.profile("collector")},
     )
 
-    inspector = _inspector_stage(ctx, collector, frozen_ts)
+    with meter.stage("inspector"):
+        inspector = _inspector_stage(ctx, collector, frozen_ts, scan=scan)
     write_json(
-        str(Path(ctx.paths.stage_reports_dir) / "02_inspector_report.json"),
-        inspector,
+        str(stage_reports_dir / "02_inspector_report.json"),
+        {**inspector, "profile": meter.profile("inspector")},
     )
 
-    commissioner = _commissioner_stage(ctx, inspector, frozen_ts)
+    with meter.stage("commissioner"):
+        commissioner = _commissioner_stage(ctx, inspector, frozen_ts)
     write_json(
-        str(Path(ctx.paths.stage_reports_dir) / "03_commissioner_report.json"),
-        commissioner,
+        str(stage_reports_dir / "03_commissioner_report.json"),
+        {**commissioner, "profile": meter.profile("commissioner")},
     )
 
-    judge = _judge_stage(ctx, collector, commissioner, frozen_ts)
+    with meter.stage("judge"):
+        judge = _judge_stage(ctx, collector, commissioner, frozen_ts)
     write_json(
-        str(Path(ctx.paths.stage_reports_dir) / "04_judge_report.json"),
-        judge,
+        str(stage_reports_dir / "04_judge_report.json"),
+        {**judge, "profile": meter.profile("judge")},
     )
 
-    # Phase-E3-E: Compute side effect drift report (log-only, no enforcement)
-    try:
-        drift_report = SideEffectTracker.validate(ctx, contract_path=contract_path)
-        drift_report_dict = drift_report.to_dict() if hasattr(drift_report, "to_dict") else drift_report
+    profile_dump = (
+        str(Path(ctx.paths.evidence_dir) / PROFILE_DUMP_NAME) if profiled else None
+    )
 
-        # TEST HOOK: Allow injecting delay before end snapshot for testing
-        test_sleep_ms = int(os.environ.get("RGPT_SNAPSHOT_TEST_SLEEP_MS", "0"))
-        if test_sleep_ms > 0:
-            time.sleep(test_sleep_ms / 1000.0)
+    def write_result(result: Dict[str, Any]) -> None:
+        result["profile"] = meter.rollup()
+        result["scan_stats"] = scan.summary()
+        if profile_dump:
+            result["profile_dump_path"] = profile_dump
+        write_json(str(Path(ctx.paths.replay_result_path)), result)
+
+    def outcome(exit_code: int, status: str, reason: str | None) -> ReplayOutcome:
+        return ReplayOutcome(
+            contract_path=contract_path,
+            exit_code=exit_code,
+            status=status,
+            reason=reason,
+            evidence_dir=ctx.paths.evidence_dir,
+            stage_timings_ms=meter.timings_ms(),
+        )
 
-        # Phase-E3-F: Begin/End snapshot drift (begin/end diff)
-        end_snapshot = collect_snapshot(ctx, files_root=snapshot_files_root)
-        snapshot_drift = diff_snapshots(begin_snapshot, end_snapshot)
+    # Phase-E3-E: Compute side effect drift report (log-only, no enforcement)
+    try:
+        with meter.stage("side_effects"):
+            scan.invalidate()
+            drift_report = SideEffectTracker.end(ctx, tracker_baseline, scan=scan)
+            drift_report_dict = drift_report.to_dict() if hasattr(drift_report, "to_dict") else drift_report
+
+            # TEST HOOK: Allow injecting delay before end snapshot for testing
+            test_sleep_ms = int(os.environ.get("RGPT_SNAPSHOT_TEST_SLEEP_MS", "0"))
+            if test_sleep_ms > 0:
+                time.sleep(test_sleep_ms / 1000.0)
+
+            # Phase-E3-F: Begin/End snapshot drift (begin/end diff)
+            end_snapshot = collect_snapshot(
+                ctx, files_root=snapshot_files_root, previous=begin_snapshot, scan=scan
+            )
+            snapshot_drift = diff_snapshots(begin_snapshot, end_snapshot)
 
         # STRICT snapshot drift gate (Phase-E3-F)
         if effective_runtime_mode == "STRICT":
             if bool(snapshot_drift.get("side_effects_detected")):
-                print(
-                    "Replay denied: strict snapshot drift detected.",
-                    file=sys.stderr,
-                )
-                write_json(
-                    str(Path(ctx.paths.replay_result_path)),
+                if verbose:
+                    print(
+                        "Replay denied: strict snapshot drift detected.",
+                        file=sys.stderr,
+                    )
+                write_result(
                     {
                         "status": "DENIED",
                         "reason": "snapshot_drift_strict",
@@ -1051,12 +1330,13 @@ def run(contract_path: str, mode_override: str | None = None) -> int:
                         "drift_report": drift_report_dict,
                         "snapshot_drift": snapshot_drift,
                         "cats_demo_artifact_path": cats_demo_artifact_path,
-                    },
-                )
-                _print_cats_demo_artifact(
-                    cats_demo_artifact, cats_demo_artifact_path
+                    }
                 )
-                return 2
+                if verbose:
+                    _print_cats_demo_artifact(
+                        cats_demo_artifact, cats_demo_artifact_path
+                    )
+                return outcome(2, "DENIED", "snapshot_drift_strict")
     except Exception:
         snapshot_drift = {"side_effects_detected": False, "severity": "UNKNOWN", "notes": "tracker_error"}
         drift_report_dict = {"mode": "UNKNOWN", "drift_class": "D0", "verdict": "PASS", "notes": "tracker_error"}
@@ -1064,12 +1344,12 @@ def run(contract_path: str, mode_override: str | None = None) -> int:
     if commissioner["decision"] != "ALLOW":
         denial_reasons = commissioner.get("denial_reasons", [])
         reasons_msg = ", ".join(str(x) for x in denial_reasons) or "unknown"
-        print(
-            f"Replay denied by commissioner gate: {reasons_msg}",
-            file=sys.stderr,
-        )
-        write_json(
-            str(Path(ctx.paths.replay_result_path)),
+        if verbose:
+            print(
+                f"Replay denied by commissioner gate: {reasons_msg}",
+                file=sys.stderr,
+            )
+        write_result(
             {
                 "status": "DENIED",
                 "reason": "commissioner_gate",
@@ -1078,13 +1358,13 @@ def run(contract_path: str, mode_override: str | None = None) -> int:
                 "drift_report": drift_report_dict,
                 "snapshot_drift": snapshot_drift,
                 "cats_demo_artifact_path": cats_demo_artifact_path,
-            },
+            }
         )
-        _print_cats_demo_artifact(cats_demo_artifact, cats_demo_artifact_path)
-        return 2
+        if verbose:
+            _print_cats_demo_artifact(cats_demo_artifact, cats_demo_artifact_path)
+        return outcome(2, "DENIED", "commissioner_gate")
 
-    write_json(
-        str(Path(ctx.paths.replay_result_path)),
+    write_result(
         {
             "status": "ALLOWED_STAGE_1_3",
             "timestamp_utc": _utc_now_iso(frozen_ts),
@@ -1092,10 +1372,148 @@ def run(contract_path: str, mode_override: str | None = None) -> int:
             "drift_report": drift_report_dict,
             "snapshot_drift": snapshot_drift,
             "cats_demo_artifact_path": cats_demo_artifact_path,
-        },
+        }
     )
-    _print_cats_demo_artifact(cats_demo_artifact, cats_demo_artifact_path)
-    return 0
+    if verbose:
+        _print_cats_demo_artifact(cats_demo_artifact, cats_demo_artifact_path)
+    return outcome(0, "ALLOWED_STAGE_1_3", None)
+
+
+def _batch_worker_init() -> None:
+    # Load the registry once per worker; every contract the worker runs reuses the snapshot
+    # and the static CAT verification cache.
+    current_snapshot(_CATS_ROOT)
+
+
+def _batch_run_labels(contract_paths: Sequence[str]) -> List[str]:
+    """
+    Evidence dir suffix per contract: its path relative to the batch's common directory, without
+    the suffix and with "/" as "__", so same-named files from different subdirectories under a
+    ** glob stay apart. Raises ValueError if two contracts would still share a label.
+    """
+    if not contract_paths:
+        return []
+    resolved = [Path(p).resolve() for p in contract_paths]
+    base = Path(os.path.commonpath([str(p.parent) for p in resolved]))
+    labels = [p.relative_to(base).with_suffix("").as_posix().replace("/", "__") for p in resolved]
+    seen: Dict[str, str] = {}
+    for path, label in zip(contract_paths, labels):
+        other = seen.setdefault(label, str(path))
+        if other != str(path):
+            raise ValueError(f"contracts {other} and {path} share the run label {label!r}")
+    return labels
+
+
+def _batch_run_one(job: Tuple[str, str | None, bool, str]) -> Dict[str, Any]:
+    contract_path, mode_override, profile, run_label = job
+    started = time.perf_counter()
+    try:
+        outcome = run_detailed(
+            contract_path,
+            mode_override,
+            verbose=False,
+            run_label=run_label,
+            profile=profile,
+        )
+    except Exception as exc:
+        outcome = ReplayOutcome(
+            contract_path=contract_path,
+            exit_code=1,
+            status="ERROR",
+            reason=None,
+            evidence_dir=None,
+            stage_timings_ms={},
+            error=f"{type(exc).__name__}: {exc}",
+        )
+    result = outcome.to_dict()
+    result["wall_ms"] = round((time.perf_counter() - started) * 1000.0, 3)
+    return result
+
+
+def _stage_stats(results: Sequence[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    samples: Dict[str, List[float]] = {}
+    for result in results:
+        for stage, ms in result.get("stage_timings_ms", {}).items():
+            samples.setdefault(stage, []).append(float(ms))
+    stats: Dict[str, Dict[str, float]] = {}
+    for stage, values in samples.items():
+        values.sort()
+        stats[stage] = {
+            "count": len(values),
+            "total_ms": round(sum(values), 3),
+            "mean_ms": round(sum(values) / len(values), 3),
+            "p95_ms": values[min(len(values) - 1, int(len(values) * 0.95))],
+            "max_ms": values[-1],
+        }
+    return stats
+
+
+def _batch_exit_code(results: Sequence[Dict[str, Any]]) -> int:
+    codes = {int(r["exit_code"]) for r in results}
+    if codes - {0, 2}:
+        return 1
+    return 2 if 2 in codes else 0
+
+
+def run_batch(
+    contract_paths: Sequence[str],
+    mode_override: str | None = None,
+    workers: int = 1,
+    profile: bool = False,
+) -> Dict[str, Any]:
+    """
+    Replay many contracts in one invocation and return an aggregated summary.
+
+    With workers > 1 the contracts are spread over a process pool; each worker loads the
+    registry once and reuses it for every contract it runs. Each contract keeps its own
+    evidence directory, suffixed with the contract's path relative to the batch's common
+    directory (see _batch_run_labels).
+    """
+    labels = _batch_run_labels(contract_paths)
+    jobs = [(str(path), mode_override, profile, label) for path, label in zip(contract_paths, labels)]
+    workers = max(1, min(int(workers), len(jobs) or 1))
+    started = time.perf_counter()
+    if workers == 1:
+        _batch_worker_init()
+        results = [_batch_run_one(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_batch_worker_init
+        ) as pool:
+            results = list(pool.map(_batch_run_one, jobs))
+    wall_ms = round((time.perf_counter() - started) * 1000.0, 3)
+
+    by_status: Dict[str, int] = {}
+    for result in results:
+        by_status[result["status"]] = by_status.get(result["status"], 0) + 1
+    return {
+        "total": len(results),
+        "workers": workers,
+        "wall_ms": wall_ms,
+        "exit_code": _batch_exit_code(results),
+        "by_status": dict(sorted(by_status.items())),
+        "failures": [
+            {
+                "contract_path": r["contract_path"],
+                "status": r["status"],
+                "reason": r["reason"],
+                "error": r["error"],
+            }
+            for r in results
+            if r["exit_code"] != 0
+        ],
+        "stage_timings_ms": _stage_stats(results),
+        "results": results,
+    }
+
+
+def _collect_contract_paths(contracts_dir: str | None, pattern: str | None) -> List[str]:
+    if contracts_dir:
+        found = Path(contracts_dir).glob(pattern or "*.json")
+        paths = [str(p) for p in found if p.is_file()]
+    else:
+        paths = [p for p in glob.glob(pattern or "", recursive=True) if Path(p).is_file()]
+    return sorted(paths)
 
 
 def main() -> int:
@@ -1104,8 +1522,51 @@ def main() -> int:
         "--contract", default="apps/core-api/replay/replay_contract.json"
     )
     ap.add_argument("--mode", choices=["STRICT", "SANDBOX", "LIVE_ALLOWLIST"])
+    ap.add_argument(
+        "--profile",
+        action="store_true",
+        help=f"Record the run with cProfile into <evidence_dir>/{PROFILE_DUMP_NAME}.",
+    )
+    ap.add_argument(
+        "--contracts-dir",
+        help="Batch mode: replay every contract in this directory (see --contracts-glob).",
+    )
+    ap.add_argument(
+        "--contracts-glob",
+        help="Batch mode: glob for contract files (relative to --contracts-dir if given, "
+        "default *.json there; ** is supported).",
+    )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Batch mode: number of worker processes (default: CPU count).",
+    )
+    ap.add_argument(
+        "--summary-out",
+        help="Batch mode: also write the aggregated summary JSON to this path.",
+    )
     args = ap.parse_args()
-    return run(args.contract, mode_override=args.mode)
+
+    if not args.contracts_dir and not args.contracts_glob:
+        return run(args.contract, mode_override=args.mode, profile=args.profile)
+
+    paths = _collect_contract_paths(args.contracts_dir, args.contracts_glob)
+    if not paths:
+        print("Replay batch: no contracts matched.", file=sys.stderr)
+        return 1
+    try:
+        summary = run_batch(
+            paths, mode_override=args.mode, workers=args.workers, profile=args.profile
+        )
+    except ValueError as exc:
+        print(f"Replay batch: {exc}", file=sys.stderr)
+        return 1
+    if args.summary_out:
+        write_json(args.summary_out, summary)
+    printable = {k: v for k, v in summary.items() if k != "results"}
+    print(json.dumps(printable, indent=2, sort_keys=True))
+    return int(summary["exit_code"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,363 @@
+"""
+Compiled JSON Schemas for the replay engine.
+
+Loads replay/schemas/*.schema.json and cats/schemas/*.schema.json once per process and compiles
+each into a tree of closures, so validating a document walks the instance only. The subset of
+JSON Schema the repo's schemas use is supported (type, enum, const, required, properties,
+additionalProperties, items, min/maxItems, min/maxLength, pattern, minimum/maximum,
+format: date-time, allOf/anyOf/oneOf, and $ref to a sibling file or a local #/ pointer).
+An unsupported keyword fails compilation instead of being silently ignored.
+
+replay/schemas/schema_registry.json maps schema_version strings to schemas:
+  {"versions": {"<schema_version>": {"document": "<file>", "event": "<file>"}},
+   "compatibility": {"<execution ledger version>": ["<decision ledger versions it can be judged against>"]}}
+"""
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# A compiled node yields "<json pointer>: <message>" for every violation.
+Check = Callable[[Any, str], Iterator[str]]
+
+REGISTRY_INDEX = "schema_registry.json"
+
+_ANNOTATIONS = {"$schema", "$id", "title", "description", "default", "examples", "$comment", "definitions", "$defs"}
+_DATE_TIME = re.compile(r"^\d{4}-\d{2}-\d{2}[Tt ]\d{2}:\d{2}:\d{2}(\.\d+)?([Zz]|[+-]\d{2}:\d{2})$")
+_TYPES: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+class SchemaCompileError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class CompiledSchema:
+    name: str
+    check: Check
+
+    def errors(self, instance: Any, limit: int = 20) -> List[str]:
+        found: List[str] = []
+        for error in self.check(instance, ""):
+            found.append(error)
+            if len(found) >= limit:
+                break
+        return found
+
+    def is_valid(self, instance: Any) -> bool:
+        return next(iter(self.check(instance, "")), None) is None
+
+
+@dataclass(frozen=True)
+class VersionSchemas:
+    version: str
+    document: Optional[CompiledSchema]
+    event: Optional[CompiledSchema]
+
+
+def _json_equal(a: Any, b: Any) -> bool:
+    # JSON has no 1 == true.
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    return a == b
+
+
+def _valid_date_time(value: str) -> bool:
+    if not _DATE_TIME.match(value):
+        return False
+    try:
+        datetime.fromisoformat(value.replace("Z", "+00:00").replace("z", "+00:00"))
+    except ValueError:
+        return False
+    return True
+
+
+class SchemaRegistry:
+    def __init__(self, schema_dirs: Sequence[Path], index_path: Optional[Path] = None) -> None:
+        self._raw: Dict[str, Dict[str, Any]] = {}
+        for directory in schema_dirs:
+            for path in sorted(directory.glob("*.schema.json")):
+                self._raw.setdefault(path.name, json.loads(path.read_text(encoding="utf-8-sig")))
+        self._compiled: Dict[str, CompiledSchema] = {}
+        for name in self._raw:
+            self._compiled[name] = CompiledSchema(name=name, check=self._compile(self._raw[name], name))
+
+        index: Dict[str, Any] = {}
+        if index_path is not None and index_path.is_file():
+            index = json.loads(index_path.read_text(encoding="utf-8-sig"))
+        self._versions: Dict[str, VersionSchemas] = {}
+        for version, files in (index.get("versions") or {}).items():
+            self._versions[version] = VersionSchemas(
+                version=version,
+                document=self.schema(files["document"]) if files.get("document") else None,
+                event=self.schema(files["event"]) if files.get("event") else None,
+            )
+        self._compatibility: Dict[str, Tuple[str, ...]] = {
+            version: tuple(others) for version, others in (index.get("compatibility") or {}).items()
+        }
+
+    # -- lookups ---------------------------------------------------------------
+
+    def names(self) -> List[str]:
+        return sorted(self._compiled)
+
+    def schema(self, name: str) -> CompiledSchema:
+        try:
+            return self._compiled[name]
+        except KeyError:
+            raise KeyError(f"Unknown schema '{name}'") from None
+
+    def versions(self) -> List[str]:
+        return sorted(self._versions)
+
+    def for_version(self, version: str) -> Optional[VersionSchemas]:
+        return self._versions.get(version)
+
+    def compatible(self, execution_version: str, decision_version: str) -> bool:
+        if execution_version == decision_version:
+            return execution_version in self._versions
+        return decision_version in self._compatibility.get(execution_version, ())
+
+    def compatibility_matrix(self) -> Dict[str, List[str]]:
+        return {
+            version: sorted(other for other in self._versions if self.compatible(version, other))
+            for version in self.versions()
+        }
+
+    # -- compilation -----------------------------------------------------------
+
+    def _resolve(self, ref: str, current: str) -> Tuple[Dict[str, Any], str]:
+        file_part, _, pointer = ref.partition("#")
+        name = Path(file_part).name if file_part else current
+        if name not in self._raw:
+            raise SchemaCompileError(f"{current}: unresolvable $ref '{ref}'")
+        node: Any = self._raw[name]
+        for token in [t for t in pointer.split("/") if t]:
+            token = token.replace("~1", "/").replace("~0", "~")
+            if not isinstance(node, dict) or token not in node:
+                raise SchemaCompileError(f"{current}: unresolvable $ref '{ref}'")
+            node = node[token]
+        return node, name
+
+    def _compile(self, schema: Any, current: str) -> Check:
+        if schema is True or schema == {}:
+            return lambda value, path: iter(())
+        if schema is False:
+            return lambda value, path: iter((f"{path or '/'}: not allowed",))
+        if not isinstance(schema, dict):
+            raise SchemaCompileError(f"{current}: schema must be an object or boolean")
+
+        checks: List[Check] = []
+        handled = set(_ANNOTATIONS)
+
+        if "$ref" in schema:
+            handled.add("$ref")
+            ref = schema["$ref"]
+            target, target_name = self._resolve(ref, current)
+            cell: Dict[str, Check] = {}
+
+            # Compiled on first use so recursive references terminate.
+            def ref_check(value: Any, path: str) -> Iterator[str]:
+                if "check" not in cell:
+                    whole_file = target is self._raw[target_name] and target_name in self._compiled
+                    cell["check"] = (
+                        self._compiled[target_name].check if whole_file else self._compile(target, target_name)
+                    )
+                return cell["check"](value, path)
+
+            checks.append(ref_check)
+
+        if "type" in schema:
+            handled.add("type")
+            names = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+            unknown = [n for n in names if n not in _TYPES]
+            if unknown:
+                raise SchemaCompileError(f"{current}: unknown type {unknown}")
+            predicates = [_TYPES[n] for n in names]
+            label = "|".join(names)
+
+            def type_check(value: Any, path: str) -> Iterator[str]:
+                if not any(p(value) for p in predicates):
+                    yield f"{path or '/'}: expected {label}"
+
+            checks.append(type_check)
+
+        if "enum" in schema:
+            handled.add("enum")
+            allowed = list(schema["enum"])
+
+            def enum_check(value: Any, path: str) -> Iterator[str]:
+                if not any(_json_equal(value, a) for a in allowed):
+                    yield f"{path or '/'}: not one of {allowed}"
+
+            checks.append(enum_check)
+
+        if "const" in schema:
+            handled.add("const")
+            expected = schema["const"]
+
+            def const_check(value: Any, path: str) -> Iterator[str]:
+                if not _json_equal(value, expected):
+                    yield f"{path or '/'}: expected {expected!r}"
+
+            checks.append(const_check)
+
+        object_keys = {"required", "properties", "additionalProperties"}
+        if object_keys & schema.keys():
+            handled |= object_keys
+            required = list(schema.get("required", []))
+            properties = {k: self._compile(v, current) for k, v in (schema.get("properties") or {}).items()}
+            additional = schema.get("additionalProperties", True)
+            additional_check = None if additional is True else self._compile(additional, current)
+
+            def object_check(value: Any, path: str) -> Iterator[str]:
+                if not isinstance(value, dict):
+                    return
+                for key in required:
+                    if key not in value:
+                        yield f"{path}/{key}: required"
+                for key, item in value.items():
+                    sub = properties.get(key)
+                    if sub is not None:
+                        yield from sub(item, f"{path}/{key}")
+                    elif additional_check is not None:
+                        if additional is False:
+                            yield f"{path}/{key}: additional property not allowed"
+                        else:
+                            yield from additional_check(item, f"{path}/{key}")
+
+            checks.append(object_check)
+
+        array_keys = {"items", "minItems", "maxItems"}
+        if array_keys & schema.keys():
+            handled |= array_keys
+            items = self._compile(schema["items"], current) if "items" in schema else None
+            min_items = schema.get("minItems")
+            max_items = schema.get("maxItems")
+
+            def array_check(value: Any, path: str) -> Iterator[str]:
+                if not isinstance(value, list):
+                    return
+                if min_items is not None and len(value) < min_items:
+                    yield f"{path or '/'}: expected at least {min_items} items"
+                if max_items is not None and len(value) > max_items:
+                    yield f"{path or '/'}: expected at most {max_items} items"
+                if items is not None:
+                    for i, item in enumerate(value):
+                        yield from items(item, f"{path}/{i}")
+
+            checks.append(array_check)
+
+        string_keys = {"minLength", "maxLength", "pattern", "format"}
+        if string_keys & schema.keys():
+            handled |= string_keys
+            min_len = schema.get("minLength")
+            max_len = schema.get("maxLength")
+            pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+            # Unknown formats are annotations only, as in the JSON Schema spec.
+            date_time = schema.get("format") == "date-time"
+
+            def string_check(value: Any, path: str) -> Iterator[str]:
+                if not isinstance(value, str):
+                    return
+                if min_len is not None and len(value) < min_len:
+                    yield f"{path or '/'}: shorter than {min_len}"
+                if max_len is not None and len(value) > max_len:
+                    yield f"{path or '/'}: longer than {max_len}"
+                if pattern is not None and not pattern.search(value):
+                    yield f"{path or '/'}: does not match {pattern.pattern!r}"
+                if date_time and not _valid_date_time(value):
+                    yield f"{path or '/'}: not a date-time"
+
+            checks.append(string_check)
+
+        number_keys = {"minimum", "maximum"}
+        if number_keys & schema.keys():
+            handled |= number_keys
+            minimum = schema.get("minimum")
+            maximum = schema.get("maximum")
+
+            def number_check(value: Any, path: str) -> Iterator[str]:
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    return
+                if minimum is not None and value < minimum:
+                    yield f"{path or '/'}: less than {minimum}"
+                if maximum is not None and value > maximum:
+                    yield f"{path or '/'}: greater than {maximum}"
+
+            checks.append(number_check)
+
+        for keyword in ("allOf", "anyOf", "oneOf"):
+            if keyword not in schema:
+                continue
+            handled.add(keyword)
+            branches = [self._compile(s, current) for s in schema[keyword]]
+            checks.append(_combinator(keyword, branches))
+
+        unsupported = set(schema) - handled
+        if unsupported:
+            raise SchemaCompileError(f"{current}: unsupported keywords {sorted(unsupported)}")
+
+        if len(checks) == 1:
+            return checks[0]
+
+        def all_checks(value: Any, path: str) -> Iterator[str]:
+            for check in checks:
+                yield from check(value, path)
+
+        return all_checks
+
+
+def _combinator(keyword: str, branches: List[Check]) -> Check:
+    def passes(check: Check, value: Any, path: str) -> bool:
+        return next(iter(check(value, path)), None) is None
+
+    def combined(value: Any, path: str) -> Iterator[str]:
+        if keyword == "allOf":
+            for branch in branches:
+                yield from branch(value, path)
+            return
+        matched = sum(1 for branch in branches if passes(branch, value, path))
+        if keyword == "anyOf" and matched == 0:
+            yield f"{path or '/'}: matches none of anyOf"
+        elif keyword == "oneOf" and matched != 1:
+            yield f"{path or '/'}: matches {matched} of oneOf (expected 1)"
+
+    return combined
+
+
+def validate_events(schema: CompiledSchema, events: Iterable[Tuple[int, Any]], limit: int = 20) -> Tuple[int, List[str]]:
+    """Validate streamed (idx, event) pairs; returns (events validated, errors prefixed with the event index)."""
+    count = 0
+    errors: List[str] = []
+    for idx, event in events:
+        count += 1
+        for error in schema.errors(event, limit - len(errors)):
+            errors.append(f"event[{idx}]{error}")
+        if len(errors) >= limit:
+            break
+    return count, errors
+
+
+@lru_cache(maxsize=1)
+def schema_registry() -> SchemaRegistry:
+    """The process-wide registry over replay/schemas and cats/schemas."""
+    replay_schemas = Path(__file__).resolve().parent / "schemas"
+    repo_root = Path(__file__).resolve().parents[3]
+    return SchemaRegistry(
+        [replay_schemas, repo_root / "cats" / "schemas"],
+        index_path=replay_schemas / REGISTRY_INDEX,
+    )
@@ -5,17 +5,28 @@ This module provides a drift report for "side effects" during replay.
 
 Step-1: skeleton (done)
 Step-4A: progressive verdict scaffolding (DEV warn / PROD fail) + minimal file drift detection
+Step-4B: begin()/end() stat baselines; policy evaluated on created/modified/deleted files only
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import fnmatch
-import hashlib
 import json
+import os
+import re
+import time
+
+try:
+    from .utils.fs_scan import FileScan
+    from .utils.hash_cache import RACY_WINDOW_NS, FileKey
+except ImportError:  # pragma: no cover
+    from replay.utils.fs_scan import FileScan
+    from replay.utils.hash_cache import RACY_WINDOW_NS, FileKey
 
 
 @dataclass(frozen=True)
@@ -30,6 +41,10 @@ class DriftReport:
     verdict: str
     generated_at_utc: str
     notes: Optional[str] = None
+    # begin()/end() deltas (empty for a single validate() scan)
+    created_files: List[str] = field(default_factory=list)
+    modified_files: List[str] = field(default_factory=list)
+    deleted_files: List[str] = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -43,9 +58,22 @@ class DriftReport:
             "verdict": self.verdict,
             "generated_at_utc": self.generated_at_utc,
             "notes": self.notes,
+            "created_files": list(self.created_files),
+            "modified_files": list(self.modified_files),
+            "deleted_files": list(self.deleted_files),
         }
 
 
+@dataclass(frozen=True)
+class TrackerBaseline:
+    """Stat-only picture of policy.scan_roots taken by SideEffectTracker.begin()."""
+    policy: Dict[str, Any]
+    files: Dict[str, FileKey]
+    # Digests of files modified too close to the baseline for their stat to be trusted.
+    racy_digests: Dict[str, str]
+    taken_at_ns: int
+
+
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat(timespec="seconds")
 
@@ -125,42 +153,96 @@ def _load_contract_side_effects(ctx: Any, contract_path: str | None = None) -> D
     return default_policy
 
 
-def _hash_file(path: Path) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
-
-
-def _scan_files(roots: List[str]) -> Dict[str, str]:
+def _walk_roots(roots: List[str], scan: FileScan) -> Dict[str, FileKey]:
     """
-    Returns mapping of relative posix path -> sha256.
-    Uses current working directory as base for relative paths.
+    Returns mapping of relative posix path -> FileKey (stat only, nothing is read).
+    Relative roots and returned paths are relative to the repo root.
     """
     base = Path(__file__).resolve().parents[3]  # repo root
-    out: Dict[str, str] = {}
+    keys: Dict[str, FileKey] = {}
     for r in roots:
         root = (base / r).resolve() if not Path(r).is_absolute() else Path(r).resolve()
-        if not root.exists():
-            continue
-        for p in root.rglob("*"):
-            if p.is_file():
-                rel = p.resolve().relative_to(base).as_posix()
-                try:
-                    out[rel] = _hash_file(p)
-                except Exception:
-                    # ignore unreadable files
-                    continue
-    return out
-
-
-def _match_any(path_posix: str, patterns: List[str]) -> bool:
-    for pat in patterns:
+        try:
+            prefix = root.relative_to(base).as_posix()
+        except ValueError:
+            prefix = root.as_posix()
+        for rel, key in scan.walk(str(root)).items():
+            keys[f"{prefix}/{rel}"] = key
+    return keys
+
+
+def _scan_files(roots: List[str], scan: Optional[FileScan] = None) -> Dict[str, str]:
+    """
+    Returns mapping of relative posix path -> sha256.
+    Relative roots and returned paths are relative to the repo root.
+    """
+    scan = scan if scan is not None else FileScan()
+    keys = _walk_roots(roots, scan)
+    found, _ = scan.digests(keys.values())
+    # unreadable files are ignored
+    return {rel: found[key.path] for rel, key in sorted(keys.items()) if key.path in found}
+
+
+class PatternSet:
+    """
+    A policy's allow/block glob list compiled once, with fnmatch.fnmatch semantics.
+
+    Wildcard-free patterns go in a set. The rest are indexed by their literal directory prefix
+    (up to the last "/" before the first wildcard) and then by their literal tail (after the last
+    wildcard), which every match must end with; each (prefix, tail) group is one combined regex.
+    A path only tries the groups keyed by its own ancestor directories and matching tails.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.patterns = tuple(patterns)
+        self._sep = os.path.normcase("/")
+        literals = set()
+        groups: Dict[str, Dict[str, List[str]]] = {}
+        for pat in self.patterns:
+            pat = os.path.normcase(pat)
+            first = min((i for i in (pat.find(ch) for ch in "*?[") if i != -1), default=-1)
+            if first == -1:
+                literals.add(pat)
+                continue
+            prefix = pat[: pat.rfind(self._sep, 0, first) + 1]
+            tail = pat[max(pat.rfind(ch) for ch in "*?]") + 1 :]
+            groups.setdefault(prefix, {}).setdefault(tail, []).append(fnmatch.translate(pat))
+        self._literals = frozenset(literals)
+        self._groups = {
+            prefix: tuple((tail, re.compile("|".join(regexes))) for tail, regexes in by_tail.items())
+            for prefix, by_tail in groups.items()
+        }
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def _group_matches(self, prefix: str, path: str) -> bool:
+        for tail, rx in self._groups.get(prefix, ()):
+            if path.endswith(tail) and rx.match(path):
+                return True
+        return False
+
+    def matches(self, path_posix: str) -> bool:
         # patterns are glob-like; match against posix relpath
-        if fnmatch.fnmatch(path_posix, pat):
+        path = os.path.normcase(path_posix)
+        if path in self._literals:
+            return True
+        if not self._groups:
+            return False
+        if self._group_matches("", path):
             return True
-    return False
+        i = path.find(self._sep)
+        while i != -1:
+            if self._group_matches(path[: i + 1], path):
+                return True
+            i = path.find(self._sep, i + 1)
+        return False
+
+
+@lru_cache(maxsize=64)
+def compile_patterns(patterns: Tuple[str, ...]) -> PatternSet:
+    """PatternSet for a pattern list, built once per distinct policy list."""
+    return PatternSet(patterns)
 
 
 def _classify_and_verdict(
@@ -215,69 +297,162 @@ def _classify_and_verdict(
     return drift_class, score, "FAIL"
 
 
+def _policy_patterns(policy: Dict[str, Any]) -> Tuple[PatternSet, PatternSet]:
+    allowed_files = compile_patterns(tuple(str(p) for p in policy.get("allowed_files", []) or []))
+    blocked_files = compile_patterns(tuple(str(p) for p in policy.get("blocked_files", []) or []))
+    return allowed_files, blocked_files
+
+
+def _is_unexpected(rel: str, allowed_files: PatternSet, blocked_files: PatternSet) -> bool:
+    # If blocked matches => unexpected
+    if blocked_files and blocked_files.matches(rel):
+        return True
+    # If allowed_files present => everything else is unexpected
+    return bool(allowed_files) and not allowed_files.matches(rel)
+
+
+def _stat_changed(before: FileKey, after: FileKey) -> bool:
+    return (before.size, before.mtime_ns, before.inode) != (after.size, after.mtime_ns, after.inode)
+
+
+def _report(
+    mode: str,
+    policy: Dict[str, Any],
+    unexpected_files: List[str],
+    destructive: bool,
+    note: str,
+    created: Optional[List[str]] = None,
+    modified: Optional[List[str]] = None,
+    deleted: Optional[List[str]] = None,
+) -> DriftReport:
+    # Placeholders for future hooks
+    unexpected_tables: List[str] = []
+    network_calls_detected = False
+    runtime_mode_changed = False
+
+    drift_class, severity_score, verdict = _classify_and_verdict(
+        mode=mode,
+        unexpected_count=len(unexpected_files) + len(unexpected_tables),
+        destructive=destructive,
+        policy=policy,
+    )
+
+    return DriftReport(
+        mode=mode,
+        drift_class=drift_class,
+        unexpected_files=unexpected_files,
+        unexpected_tables=unexpected_tables,
+        network_calls_detected=network_calls_detected,
+        runtime_mode_changed=runtime_mode_changed,
+        severity_score=severity_score,
+        verdict=verdict,
+        generated_at_utc=_utc_now_iso(),
+        notes=note,
+        created_files=created or [],
+        modified_files=modified or [],
+        deleted_files=deleted or [],
+    )
+
+
 class SideEffectTracker:
     """
     Progressive-ready tracker.
     Minimal detection implemented: file drift under policy.scan_roots.
 
-    Note: To detect drift, caller should run validate() at least once at end.
-    For richer detection (before/after), a later step will add begin()/end() snapshots.
-    For now, we assume a single end-of-run scan and compare against allow/deny patterns only.
+    Preferred: call begin() before the replay and end() after it. begin() records a stat-only
+    baseline of policy.scan_roots; end() re-walks them and evaluates the allow/block patterns
+    against the created, modified and deleted files only, so cost follows the replay's
+    footprint rather than the size of the scanned tree. Deleting a file the blocklist covers,
+    or one a non-empty allowlist does not cover, is destructive (D3).
+
+    validate() is the single end-of-run scan: every file present under scan_roots is matched
+    against the allow/deny patterns.
     """
 
     @staticmethod
-    def validate(ctx: Any, contract_path: str | None = None) -> DriftReport:
+    def begin(ctx: Any, contract_path: str | None = None, scan: Optional[FileScan] = None) -> TrackerBaseline:
+        policy = _load_contract_side_effects(ctx, contract_path)
+        scan_roots = list(policy.get("scan_roots", []) or [])
+        scan = scan if scan is not None else FileScan()
+        taken_at_ns = time.time_ns()
+        files = _walk_roots(scan_roots, scan) if scan_roots else {}
+
+        # A same-size rewrite within the racy window keeps its mtime, so those few files
+        # are compared by content at end().
+        racy = {rel: key for rel, key in files.items() if key.mtime_ns >= taken_at_ns - RACY_WINDOW_NS}
+        found, _ = scan.digests(racy.values())
+        return TrackerBaseline(
+            policy=policy,
+            files=files,
+            racy_digests={rel: found[key.path] for rel, key in racy.items() if key.path in found},
+            taken_at_ns=taken_at_ns,
+        )
+
+    @staticmethod
+    def end(ctx: Any, baseline: TrackerBaseline, scan: Optional[FileScan] = None) -> DriftReport:
+        mode = _safe_get_mode(ctx)
+        policy = baseline.policy
+        allowed_files, blocked_files = _policy_patterns(policy)
+        scan_roots = list(policy.get("scan_roots", []) or [])
+        if not scan_roots:
+            return _report(mode, policy, [], False, "begin/end tracking: detection disabled (policy.scan_roots empty).")
+
+        scan = scan if scan is not None else FileScan()
+        before = baseline.files
+        after = _walk_roots(scan_roots, scan)
+
+        created = sorted(after.keys() - before.keys())
+        deleted = sorted(before.keys() - after.keys())
+        modified = []
+        recheck = []
+        for rel in before.keys() & after.keys():
+            if _stat_changed(before[rel], after[rel]):
+                modified.append(rel)
+            elif rel in baseline.racy_digests:
+                recheck.append(rel)
+        if recheck:
+            found, _ = scan.digests(after[rel] for rel in recheck)
+            modified.extend(rel for rel in recheck if found.get(after[rel].path) != baseline.racy_digests[rel])
+        modified.sort()
+
+        # Same rule as created/modified files: with no allowlist only blocked deletes count.
+        destructive_deletes = [rel for rel in deleted if _is_unexpected(rel, allowed_files, blocked_files)]
+        unexpected_files = sorted(
+            {rel for rel in created + modified if _is_unexpected(rel, allowed_files, blocked_files)}
+            | set(destructive_deletes)
+        )
+        note = (
+            f"begin/end tracking: {len(created)} created, {len(modified)} modified, "
+            f"{len(deleted)} deleted of {len(before)} baseline files."
+        )
+        return _report(
+            mode,
+            policy,
+            unexpected_files,
+            bool(destructive_deletes),
+            note,
+            created=created,
+            modified=modified,
+            deleted=deleted,
+        )
+
+    @staticmethod
+    def validate(ctx: Any, contract_path: str | None = None, scan: Optional[FileScan] = None) -> DriftReport:
         mode = _safe_get_mode(ctx)
         policy = _load_contract_side_effects(ctx, contract_path)
 
-        allowed_files = list(policy.get("allowed_files", []) or [])
-        blocked_files = list(policy.get("blocked_files", []) or [])
+        allowed_files, blocked_files = _policy_patterns(policy)
         scan_roots = list(policy.get("scan_roots", []) or [])
 
         # Minimal filesystem scan (end-of-run only).
         # If scan_roots is empty, we do not scan to avoid overhead.
         unexpected_files: List[str] = []
         if scan_roots:
-            files = _scan_files(scan_roots)
-            for rel in sorted(files.keys()):
-                # If blocked matches => unexpected
-                if blocked_files and _match_any(rel, blocked_files):
-                    unexpected_files.append(rel)
-                    continue
-                # If allowed_files present => everything else is unexpected
-                if allowed_files and not _match_any(rel, allowed_files):
-                    unexpected_files.append(rel)
-
-        # Placeholders for future hooks
-        unexpected_tables: List[str] = []
-        network_calls_detected = False
-        runtime_mode_changed = False
-
-        destructive = False  # reserved for future (e.g., deletes outside allowlist)
-
-        drift_class, severity_score, verdict = _classify_and_verdict(
-            mode=mode,
-            unexpected_count=len(unexpected_files) + len(unexpected_tables),
-            destructive=destructive,
-            policy=policy,
-        )
+            files = _scan_files(scan_roots, scan)
+            unexpected_files = [rel for rel in sorted(files) if _is_unexpected(rel, allowed_files, blocked_files)]
 
-        note = "progressive scaffolding: file-pattern evaluation only; no begin/end snapshot yet."
+        note = "progressive scaffolding: file-pattern evaluation only; no begin/end snapshot."
         if not scan_roots:
             note = "progressive scaffolding: detection disabled (policy.scan_roots empty)."
 
-        return DriftReport(
-            mode=mode,
-            drift_class=drift_class,
-            unexpected_files=unexpected_files,
-            unexpected_tables=unexpected_tables,
-            network_calls_detected=network_calls_detected,
-            runtime_mode_changed=runtime_mode_changed,
-            severity_score=severity_score,
-            verdict=verdict,
-            generated_at_utc=_utc_now_iso(),
-            notes=note,
-        )
-
-
-
+        return _report(mode, policy, unexpected_files, False, note)
@@ -1,10 +1,39 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
 import hashlib
 import json
 import os
+import time
+
+try:
+    from .utils.fs_scan import FileScan
+    from .utils.hash_cache import RACY_WINDOW_NS, FileDigestCache, FileKey
+except ImportError:  # pragma: no cover
+    from replay.utils.fs_scan import FileScan
+    from replay.utils.hash_cache import RACY_WINDOW_NS, FileDigestCache, FileKey
+
+
+# Per-kind cap on the file paths reported in snapshot_drift.file_changes.
+MAX_DRIFT_PATHS = 500
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    """Stat identity and content digest of one snapshotted file."""
+    size: int
+    mtime_ns: int
+    inode: int
+    digest: str
+
+
+@dataclass(frozen=True)
+class DirNode:
+    """One directory of the snapshot's Merkle tree: its digest and immediate children's names."""
+    digest: str
+    files: Tuple[str, ...]
+    dirs: Tuple[str, ...]
 
 
 @dataclass(frozen=True)
@@ -13,6 +42,12 @@ class Snapshot:
     ledger_hash: str
     file_hash: str
     context_hash: str
+    # rel path -> FileEntry; the stat cache an incremental END snapshot reuses.
+    files: Dict[str, FileEntry] = field(default_factory=dict, compare=False, repr=False)
+    # rel dir ("" is the root) -> DirNode; file_hash is the root digest.
+    tree: Dict[str, DirNode] = field(default_factory=dict, compare=False, repr=False)
+    taken_at_ns: int = field(default=0, compare=False)
+    stats: Dict[str, Any] = field(default_factory=dict, compare=False)
 
 
 def _sha256_bytes(data: bytes) -> str:
@@ -24,41 +59,175 @@ def _hash_dict(data: Dict[str, Any]) -> str:
     return _sha256_bytes(payload)
 
 
-def _hash_files(root: str) -> str:
+def _snapshot_mode() -> str:
+    """RGPT_REPLAY_SNAPSHOT_MODE: "incremental" (default) reuses cached digests; "full" re-reads every file."""
+    mode = os.environ.get("RGPT_REPLAY_SNAPSHOT_MODE", "").strip().lower()
+    return "full" if mode == "full" else "incremental"
+
+
+def _build_tree(files: Dict[str, FileEntry]) -> Dict[str, DirNode]:
+    """
+    Per-directory Merkle tree: a directory's digest covers its files' (name, digest) and its
+    subdirectories' (name, digest), in name order. Directories without files are not represented.
+    """
+    child_files: Dict[str, List[str]] = {"": []}
+    child_dirs: Dict[str, List[str]] = {"": []}
+    for rel in files:
+        parent, _, name = rel.rpartition("/")
+        child_files.setdefault(parent, []).append(name)
+        d = parent
+        while d not in child_dirs:
+            child_dirs[d] = []
+            child_files.setdefault(d, [])
+            d = d.rpartition("/")[0]
+    for d in child_dirs:
+        if d:
+            up, _, name = d.rpartition("/")
+            child_dirs[up].append(name)
+
+    tree: Dict[str, DirNode] = {}
+    # Deepest first, so every subdirectory digest exists before its parent's.
+    for d in sorted(child_dirs, key=lambda k: k.count("/") + bool(k), reverse=True):
+        prefix = f"{d}/" if d else ""
+        entries = [(name, b"f", files[prefix + name].digest) for name in child_files[d]]
+        entries += [(name, b"d", tree[prefix + name].digest) for name in child_dirs[d]]
+        sha = hashlib.sha256()
+        for name, kind, digest in sorted(entries):
+            sha.update(kind)
+            sha.update(b"\0")
+            sha.update(name.encode("utf-8"))
+            sha.update(b"\0")
+            sha.update(digest.encode("ascii"))
+            sha.update(b"\0")
+        tree[d] = DirNode(
+            digest=sha.hexdigest(),
+            files=tuple(sorted(child_files[d])),
+            dirs=tuple(sorted(child_dirs[d])),
+        )
+    return tree
+
+
+def _subtree_files(tree: Dict[str, DirNode], top: str) -> List[str]:
+    out: List[str] = []
+    stack = [top]
+    while stack:
+        d = stack.pop()
+        node = tree[d]
+        prefix = f"{d}/" if d else ""
+        out.extend(prefix + name for name in node.files)
+        stack.extend(prefix + name for name in node.dirs)
+    return out
+
+
+def diff_trees(begin: Snapshot, end: Snapshot) -> Dict[str, List[str]]:
+    """
+    Added, removed and modified file paths between two snapshots, descending only into
+    directories whose Merkle digests differ.
+    """
+    added: List[str] = []
+    removed: List[str] = []
+    modified: List[str] = []
+    stack = [""]
+    while stack:
+        d = stack.pop()
+        b = begin.tree.get(d)
+        e = end.tree.get(d)
+        if b is None and e is None:
+            continue
+        if b is None:
+            added.extend(_subtree_files(end.tree, d))
+            continue
+        if e is None:
+            removed.extend(_subtree_files(begin.tree, d))
+            continue
+        if b.digest == e.digest:
+            continue
+        prefix = f"{d}/" if d else ""
+        before, after = set(b.files), set(e.files)
+        added.extend(prefix + name for name in after - before)
+        removed.extend(prefix + name for name in before - after)
+        modified.extend(
+            prefix + name
+            for name in before & after
+            if begin.files[prefix + name].digest != end.files[prefix + name].digest
+        )
+        stack.extend(prefix + name for name in set(b.dirs) | set(e.dirs))
+    return {"added": sorted(added), "removed": sorted(removed), "modified": sorted(modified)}
+
+
+def _reusable(entry: Optional[FileEntry], key: FileKey, taken_at_ns: int) -> bool:
+    # An entry hashed within RACY_WINDOW_NS of its mtime may predate a same-size rewrite
+    # in the same timestamp tick, so it is never trusted.
+    return (
+        entry is not None
+        and entry.size == key.size
+        and entry.mtime_ns == key.mtime_ns
+        and entry.inode == key.inode
+        and entry.mtime_ns < taken_at_ns - RACY_WINDOW_NS
+    )
+
+
+def _snapshot_files(
+    root: str,
+    previous: Optional[Snapshot],
+    scan: FileScan,
+) -> Tuple[str, Dict[str, FileEntry], Dict[str, DirNode], Dict[str, Any]]:
     """
     Hash file contents under a controlled directory.
     Deterministic ordering; ignores unreadable files.
     Includes relative file paths to reduce collision risk.
+
+    A file whose (size, mtime_ns, inode) matches the previous snapshot's entry, the run's scan
+    table, or the persistent digest cache, keeps its digest without being read; only new or
+    changed files are hashed.
     """
+    stats: Dict[str, Any] = {"files": 0, "reused": 0, "cache_hits": 0, "hashed": 0, "bytes_hashed": 0}
     if not os.path.exists(root):
-        return "EMPTY"
-
-    sha = hashlib.sha256()
+        return "EMPTY", {}, {}, stats
 
-    for dirpath, _, filenames in os.walk(root):
-        for name in sorted(filenames):
-            full = os.path.join(dirpath, name)
-            rel = os.path.relpath(full, root).replace("\\", "/")
-            try:
-                with open(full, "rb") as f:
-                    content = f.read()
-            except OSError:
-                continue
+    prior = previous.files if previous is not None else {}
+    prior_taken_at = previous.taken_at_ns if previous is not None else 0
+    files: Dict[str, FileEntry] = {}
+    misses: List[Tuple[str, FileKey]] = []
+    for rel, key in scan.walk(root).items():
+        entry = prior.get(rel)
+        if _reusable(entry, key, prior_taken_at):
+            files[rel] = entry  # type: ignore[assignment]
+            stats["reused"] += 1
+        else:
+            misses.append((rel, key))
 
-            sha.update(rel.encode("utf-8"))
-            sha.update(b"\0")
-            sha.update(content)
-            sha.update(b"\0")
+    found, batch = scan.digests(key for _, key in misses)
+    stats["reused"] += batch["memo_hits"]
+    stats["cache_hits"] = batch["cache_hits"]
+    stats["hashed"] = batch["hashed"]
+    stats["bytes_hashed"] = batch["bytes_hashed"]
+    for rel, key in misses:
+        if key.path in found:
+            files[rel] = FileEntry(size=key.size, mtime_ns=key.mtime_ns, inode=key.inode, digest=found[key.path])
 
-    return sha.hexdigest()
+    stats["files"] = len(files)
+    tree = _build_tree(files)
+    return tree[""].digest, files, tree, stats
 
 
-def collect_snapshot(ctx: Any, files_root: str = "docs/ops/executions") -> Snapshot:
+def collect_snapshot(
+    ctx: Any,
+    files_root: str = "docs/ops/executions",
+    previous: Optional[Snapshot] = None,
+    cache: Optional[FileDigestCache] = None,
+    scan: Optional[FileScan] = None,
+) -> Snapshot:
     """
     Collect a BEGIN/END snapshot for drift detection.
     - ledger_hash: based on ctx.ledger.export_state() if present
     - file_hash: hash of controlled execution artifacts directory
     - context_hash: small stable subset of ctx fields
+
+    In incremental mode (the default) pass the BEGIN snapshot as `previous` when taking the END
+    snapshot: unchanged files are then verified by stat alone. `cache` defaults to the persistent
+    FileDigestCache, which makes BEGIN snapshots of an unchanged tree cheap across runs too.
+    Pass the run's FileScan as `scan` to share its walk and digests with the other consumers.
     """
     ledger_state: Dict[str, Any] = {}
     ledger = getattr(ctx, "ledger", None)
@@ -74,10 +243,21 @@ def collect_snapshot(ctx: Any, files_root: str = "docs/ops/executions") -> Snaps
         "contract_hash": getattr(ctx, "contract_hash", None),
     }
 
+    taken_at_ns = time.time_ns()
+    if _snapshot_mode() == "full":
+        previous, scan = None, FileScan(cache=None)
+    elif scan is None:
+        scan = FileScan(cache if cache is not None else FileDigestCache.default())
+    file_hash, files, tree, stats = _snapshot_files(files_root, previous, scan)
+
     return Snapshot(
         ledger_hash=_hash_dict(ledger_state),
-        file_hash=_hash_files(files_root),
+        file_hash=file_hash,
         context_hash=_hash_dict(context_state),
+        files=files,
+        tree=tree,
+        taken_at_ns=taken_at_ns,
+        stats=stats,
     )
 
 
@@ -107,6 +287,7 @@ def _classify_drift(ledger_drift: bool, file_drift: bool, context_drift: bool) -
 def diff_snapshots(begin: Snapshot, end: Snapshot) -> Dict[str, Any]:
     ledger_drift = begin.ledger_hash != end.ledger_hash
     file_drift = begin.file_hash != end.file_hash
+    changes = diff_trees(begin, end) if file_drift else {"added": [], "removed": [], "modified": []}
     context_drift = begin.context_hash != end.context_hash
 
     cls = _classify_drift(ledger_drift, file_drift, context_drift)
@@ -119,6 +300,11 @@ def diff_snapshots(begin: Snapshot, end: Snapshot) -> Dict[str, Any]:
         "drift_class": cls["drift_class"],
         "severity": cls["severity"],
         "severity_score": cls["severity_score"],
+        "file_changes": {
+            **{kind: paths[:MAX_DRIFT_PATHS] for kind, paths in changes.items()},
+            "counts": {kind: len(paths) for kind, paths in changes.items()},
+            "truncated": any(len(paths) > MAX_DRIFT_PATHS for paths in changes.values()),
+        },
     }
 
     return drift
@@ -0,0 +1,144 @@
+"""
+Per-run filesystem scan shared by the replay snapshots, the side-effect tracker and the artifact
+manifest validator.
+
+Each root is walked once per phase with os.scandir into a path -> FileKey table; a root nested
+under one already walked is served from the parent's table. Digests are memoized per FileKey for
+the whole run (with the same racy-mtime rule as the persistent cache), then looked up in the
+FileDigestCache, and only then hashed. Call invalidate() once the tree may have changed, e.g.
+between the BEGIN and END snapshots; digests survive it because they are keyed by stat.
+"""
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .hash_cache import RACY_WINDOW_NS, FileDigestCache, FileKey
+from .hashing import hash_files
+
+
+def walk_files(root: str) -> Iterator[Tuple[str, str, os.stat_result]]:
+    """(posix rel, full, stat) for every regular file under root, via scandir; unreadable dirs are skipped."""
+    stack = [(root, "")]
+    while stack:
+        path, prefix = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            rel = f"{prefix}{entry.name}"
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, rel + "/"))
+                elif entry.is_file():
+                    yield rel, entry.path, entry.stat()
+            except OSError:
+                continue
+
+
+class FileScan:
+    def __init__(self, cache: Optional[FileDigestCache] = None, workers: Optional[int] = None) -> None:
+        self.cache = cache
+        self.workers = workers
+        self._walks: Dict[str, Dict[str, FileKey]] = {}
+        self._keys: Dict[str, FileKey] = {}
+        # key -> (digest, time it was computed)
+        self._digests: Dict[FileKey, Tuple[str, int]] = {}
+        self.counters: Dict[str, int] = {
+            "walks": 0,
+            "files_visited": 0,
+            "stat_calls": 0,
+            "memo_hits": 0,
+            "cache_hits": 0,
+            "hashed": 0,
+            "bytes_hashed": 0,
+        }
+
+    def invalidate(self) -> None:
+        """Forget walked trees and stats; the next walk re-reads the filesystem."""
+        self._walks.clear()
+        self._keys.clear()
+
+    def walk(self, root: str) -> Dict[str, FileKey]:
+        """posix path relative to root -> FileKey for every file under root (empty if root is missing)."""
+        root = os.path.abspath(root)
+        table = self._walks.get(root)
+        if table is not None:
+            return table
+        for walked, parent_table in self._walks.items():
+            if root.startswith(walked.rstrip(os.sep) + os.sep):
+                prefix = os.path.relpath(root, walked).replace(os.sep, "/") + "/"
+                table = {rel[len(prefix) :]: key for rel, key in parent_table.items() if rel.startswith(prefix)}
+                self._walks[root] = table
+                return table
+
+        table = {}
+        for rel, full, st in walk_files(root):
+            key = FileKey.from_stat(full, st)
+            table[rel] = key
+            self._keys[full] = key
+        self.counters["walks"] += 1
+        self.counters["files_visited"] += len(table)
+        self._walks[root] = table
+        return table
+
+    def stat(self, path: str) -> FileKey:
+        """FileKey for one path, from a walked table when possible. Raises OSError like os.stat."""
+        path = os.path.abspath(path)
+        key = self._keys.get(path)
+        if key is None:
+            self.counters["stat_calls"] += 1
+            self.counters["files_visited"] += 1
+            key = FileKey.from_stat(path, os.stat(path))
+            self._keys[path] = key
+        return key
+
+    def digests(self, keys: Iterable[FileKey]) -> Tuple[Dict[str, str], Dict[str, int]]:
+        """
+        path -> sha256 for each key (unreadable files are left out), plus this batch's
+        memo_hits / cache_hits / hashed / bytes_hashed counts.
+        """
+        batch = {"memo_hits": 0, "cache_hits": 0, "hashed": 0, "bytes_hashed": 0}
+        found: Dict[str, str] = {}
+        misses: List[FileKey] = []
+        for key in keys:
+            memo = self._digests.get(key)
+            if memo is not None and key.mtime_ns < memo[1] - RACY_WINDOW_NS:
+                found[key.path] = memo[0]
+                batch["memo_hits"] += 1
+            else:
+                misses.append(key)
+
+        cached = self.cache.get_many(misses) if self.cache is not None and misses else {}
+        batch["cache_hits"] = len(cached)
+        now = time.time_ns()
+        for key in misses:
+            if key.path in cached:
+                found[key.path] = cached[key.path]
+                self._digests[key] = (cached[key.path], now)
+
+        to_hash = [key for key in misses if key.path not in cached]
+        if to_hash:
+            hashed_at = time.time_ns()
+            computed: List[Tuple[FileKey, str]] = []
+            results = hash_files([key.path for key in to_hash], [key.size for key in to_hash], self.workers)
+            for key, digest in zip(to_hash, results):
+                if digest is None:
+                    continue
+                found[key.path] = digest
+                self._digests[key] = (digest, hashed_at)
+                computed.append((key, digest))
+                batch["bytes_hashed"] += key.size
+            batch["hashed"] = len(to_hash)
+            if self.cache is not None and computed:
+                self.cache.put_many(computed)
+
+        for name, value in batch.items():
+            self.counters[name] += value
+        return found, batch
+
+    def summary(self) -> Dict[str, Any]:
+        return dict(self.counters)
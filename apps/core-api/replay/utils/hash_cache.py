@@ -0,0 +1,143 @@
+"""
+Persistent file-digest cache for the replay validators.
+
+Maps (path, size, mtime_ns, inode) -> sha256 in a small SQLite database so an unchanged file is
+verified from its stat alone. A file whose mtime is within RACY_WINDOW_NS of "now" is not stored:
+a same-size rewrite inside the filesystem's timestamp granularity would otherwise be trusted.
+
+The database lives at RGPT_REPLAY_HASH_CACHE_PATH (default
+$XDG_CACHE_HOME/rocketgpt/replay_hash_cache.sqlite3, i.e. ~/.cache/... when XDG_CACHE_HOME is
+unset, or the system temp dir if there is no home); set it to "off" to disable caching. Each
+FileDigestCache keeps one connection open and looks keys up in batches of LOOKUP_BATCH.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+RACY_WINDOW_NS = 2_000_000_000
+# Stays under SQLite's default limit of 999 bound parameters per statement.
+LOOKUP_BATCH = 500
+
+
+@dataclass(frozen=True)
+class FileKey:
+    path: str
+    size: int
+    mtime_ns: int
+    inode: int
+
+    @classmethod
+    def from_stat(cls, path: str, st: os.stat_result) -> "FileKey":
+        return cls(path=path, size=st.st_size, mtime_ns=st.st_mtime_ns, inode=st.st_ino)
+
+
+def default_cache_path() -> Optional[Path]:
+    configured = os.getenv("RGPT_REPLAY_HASH_CACHE_PATH", "").strip()
+    if configured.lower() == "off":
+        return None
+    if configured:
+        return Path(configured)
+    cache_home = os.getenv("XDG_CACHE_HOME", "").strip()
+    if cache_home:
+        base = Path(cache_home)
+    else:
+        try:
+            base = Path.home() / ".cache"
+        except RuntimeError:
+            base = Path(tempfile.gettempdir())
+    return base / "rocketgpt" / "replay_hash_cache.sqlite3"
+
+
+class FileDigestCache:
+    def __init__(self, db_path: Optional[Path]) -> None:
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+
+    @classmethod
+    def default(cls) -> "FileDigestCache":
+        return cls(default_cache_path())
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """The shared connection, opened on first use (and again in a forked child). Call under _lock."""
+        if self.db_path is None:
+            return None
+        if self._conn is not None and self._conn_pid == os.getpid():
+            return self._conn
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS file_digests ("
+                " path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,"
+                " inode INTEGER NOT NULL, sha256 TEXT NOT NULL)"
+            )
+        except sqlite3.Error:
+            conn.close()
+            raise
+        self._conn, self._conn_pid = conn, os.getpid()
+        return conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._conn_pid = None
+
+    def get_many(self, keys: Iterable[FileKey]) -> Dict[str, str]:
+        """path -> cached sha256 for every key whose stored stat matches exactly."""
+        wanted: Dict[str, FileKey] = {key.path: key for key in keys}
+        if not wanted:
+            return {}
+        paths: List[str] = list(wanted)
+        found: Dict[str, str] = {}
+        with self._lock:
+            try:
+                conn = self._connection()
+                if conn is None:
+                    return {}
+                for start in range(0, len(paths), LOOKUP_BATCH):
+                    chunk = paths[start : start + LOOKUP_BATCH]
+                    rows = conn.execute(
+                        "SELECT path, size, mtime_ns, inode, sha256 FROM file_digests"
+                        f" WHERE path IN ({','.join('?' * len(chunk))})",
+                        chunk,
+                    )
+                    for path, size, mtime_ns, inode, digest in rows:
+                        key = wanted[path]
+                        if (key.size, key.mtime_ns, key.inode) == (size, mtime_ns, inode):
+                            found[path] = digest
+            except (sqlite3.Error, OSError):
+                return {}
+        return found
+
+    def put_many(self, entries: Iterable[Tuple[FileKey, str]]) -> int:
+        """Store digests, skipping racily-recent files; returns the number stored. Never raises."""
+        cutoff = time.time_ns() - RACY_WINDOW_NS
+        rows = [
+            (key.path, key.size, key.mtime_ns, key.inode, digest)
+            for key, digest in entries
+            if key.mtime_ns < cutoff
+        ]
+        if not rows:
+            return 0
+        with self._lock:
+            try:
+                conn = self._connection()
+                if conn is None:
+                    return 0
+                with conn:
+                    conn.executemany("INSERT OR REPLACE INTO file_digests VALUES (?, ?, ?, ?, ?)", rows)
+            except (sqlite3.Error, OSError):
+                return 0
+        return len(rows)
@@ -0,0 +1,80 @@
+"""
+File hashing engine shared by the replay snapshots, the side-effect tracker and the artifact
+manifest validator.
+
+Files are streamed in READ_CHUNK_BYTES pieces through a reused buffer, or mmap'd from
+MMAP_MIN_BYTES up, so memory stays bounded whatever the file size. hashlib releases the GIL
+while digesting, so batches are hashed on a thread pool (RGPT_REPLAY_HASH_WORKERS threads by
+default); results always come back in input order.
+"""
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
+READ_CHUNK_BYTES = 1024 * 1024
+MMAP_MIN_BYTES = 8 * 1024 * 1024
+
+
+def hash_workers() -> int:
+    raw = os.environ.get("RGPT_REPLAY_HASH_WORKERS", "").strip()
+    if raw:
+        try:
+            return max(int(raw), 1)
+        except ValueError:
+            pass
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def hash_file(path: str, size: Optional[int] = None) -> str:
+    """sha256 of a file with bounded memory: mmap'd slices for large files, a reused buffer otherwise."""
+    digest = hashlib.sha256()
+    with open(path, "rb", buffering=0) as fh:
+        if size is None:
+            size = os.fstat(fh.fileno()).st_size
+        if size >= MMAP_MIN_BYTES:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, len(view), READ_CHUNK_BYTES):
+                        digest.update(view[offset : offset + READ_CHUNK_BYTES])
+                finally:
+                    view.release()
+        else:
+            buf = bytearray(READ_CHUNK_BYTES)
+            view = memoryview(buf)
+            while True:
+                n = fh.readinto(buf)
+                if not n:
+                    break
+                digest.update(view[:n])
+    return digest.hexdigest()
+
+
+def _hash_or_none(path: str, size: Optional[int]) -> Optional[str]:
+    try:
+        return hash_file(path, size)
+    except (OSError, ValueError):
+        return None
+
+
+def hash_files(
+    paths: Sequence[str],
+    sizes: Optional[Sequence[int]] = None,
+    workers: Optional[int] = None,
+) -> List[Optional[str]]:
+    """
+    sha256 of each path, in input order; None where a file could not be read. `sizes`, when the
+    caller already has them from a stat, saves an fstat per file.
+    """
+    if not paths:
+        return []
+    size_list: Sequence[Optional[int]] = sizes if sizes is not None else [None] * len(paths)
+    n_workers = min(workers or hash_workers(), len(paths))
+    if n_workers <= 1:
+        return [_hash_or_none(p, s) for p, s in zip(paths, size_list)]
+    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+        return list(pool.map(_hash_or_none, paths, size_list))
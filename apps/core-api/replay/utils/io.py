@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import json
+import re
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict
+from typing import IO, Any, Dict, Iterator, Optional, Tuple
 
 
 def read_json(path: str) -> Dict[str, Any]:
@@ -14,3 +16,283 @@ def write_json(path: str, obj: Dict[str, Any]) -> None:
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
     p.write_text(json.dumps(obj, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Streaming ledger reads
+#
+# Ledgers come in three shapes:
+#   ndjson  one event per line (*.ndjson / *.jsonl, or sniffed from the first line)
+#   array   a top-level JSON array of events
+#   object  {"schema_version": ..., "events": [...], ...}
+# Events are decoded one at a time, so memory is bounded by the largest single event.
+# Event indexes are 0-based positions in the ledger; windows are inclusive on both ends.
+# ---------------------------------------------------------------------------
+
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+_CHUNK_CHARS = 1 << 16
+_WS = " \t\r\n"
+_STRUCTURAL = re.compile(r'[\[\]{}"]')
+_STRING_STOP = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r"[,\]}\s]")
+
+
+@dataclass(frozen=True)
+class LedgerSummary:
+    format: str
+    fields: Dict[str, Any]
+    # Events inside the window; None when the ledger has no events array.
+    event_count: Optional[int]
+
+
+class _JsonScanner:
+    """Pull parser over a text stream: decodes one JSON value at a time from a sliding buffer."""
+
+    def __init__(self, fh: IO[str], chunk_chars: int = _CHUNK_CHARS) -> None:
+        self._fh = fh
+        self._chunk = chunk_chars
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        # Read at least as much as is already pending so a large value is retried O(log n) times.
+        data = self._fh.read(max(self._chunk, len(self._buf) - self._pos))
+        if not data:
+            self._eof = True
+            return False
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        self._buf += data
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it; "" at end of input."""
+        while True:
+            buf, pos = self._buf, self._pos
+            end = len(buf)
+            while pos < end and buf[pos] in _WS:
+                pos += 1
+            self._pos = pos
+            if pos < end:
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        got = self.peek()
+        if got != char:
+            raise ValueError(f"Invalid ledger JSON: expected {char!r}, found {got or 'end of input'!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        if not self.peek():
+            raise ValueError("Invalid ledger JSON: unexpected end of input")
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            if end == len(self._buf) and self._fill():
+                # A number or literal at the end of the buffer may continue in the next chunk.
+                continue
+            self._pos = end
+            return obj
+
+    def skip(self) -> None:
+        """
+        Step over one value without building it. Only strings and bracket depth are tracked, so a
+        value that is malformed but balanced is skipped rather than rejected.
+        """
+        first = self.peek()
+        if not first:
+            raise ValueError("Invalid ledger JSON: unexpected end of input")
+        if first == '"':
+            self._pos += 1
+            self._skip_string()
+            return
+        if first not in "[{":
+            self._advance_to(_SCALAR_END, at_eof_ok=True)
+            return
+        depth = 0
+        while True:
+            char = self._advance_to(_STRUCTURAL)
+            self._pos += 1
+            if char == '"':
+                self._skip_string()
+            elif char in "[{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def _skip_string(self) -> None:
+        """Consume the rest of a string whose opening quote was consumed."""
+        while True:
+            char = self._advance_to(_STRING_STOP)
+            if char == '"':
+                self._pos += 1
+                return
+            # Backslash: drop it and the escaped character, which may be in the next chunk.
+            while len(self._buf) - self._pos < 2:
+                if not self._fill():
+                    raise ValueError("Invalid ledger JSON: unexpected end of input")
+            self._pos += 2
+
+    def _advance_to(self, pattern: "re.Pattern[str]", at_eof_ok: bool = False) -> str:
+        """Move to the next match of `pattern` and return that character ("" at EOF if allowed)."""
+        while True:
+            match = pattern.search(self._buf, self._pos)
+            if match is not None:
+                self._pos = match.start()
+                return match.group()
+            self._pos = len(self._buf)
+            if not self._fill():
+                if at_eof_ok:
+                    return ""
+                raise ValueError("Invalid ledger JSON: unexpected end of input")
+
+    def items(self, close: str) -> Iterator[None]:
+        """Drive the comma-separated members of an array/object whose opener was consumed."""
+        if self.peek() == close:
+            self._pos += 1
+            return
+        while True:
+            yield None
+            char = self.peek()
+            if char == ",":
+                self._pos += 1
+            elif char == close:
+                self._pos += 1
+                return
+            else:
+                raise ValueError(f"Invalid ledger JSON: expected ',' or {close!r}, found {char or 'end of input'!r}")
+
+
+def ledger_format(path: str) -> str:
+    """"ndjson", "array" or "object"; sniffs at most the first 64 KiB."""
+    if Path(path).suffix.lower() in NDJSON_SUFFIXES:
+        return "ndjson"
+    with open(path, "r", encoding="utf-8-sig") as fh:
+        head = fh.read(_CHUNK_CHARS)
+    stripped = head.lstrip(_WS)
+    if stripped.startswith("["):
+        return "array"
+    first_line, newline, rest = stripped.partition("\n")
+    if newline and rest.strip(_WS):
+        try:
+            json.loads(first_line)
+        except ValueError:
+            return "object"
+        # A complete value on the first line followed by more content can only be NDJSON.
+        return "ndjson"
+    return "object"
+
+
+def walk_ledger(path: str, to_event_idx: Optional[int] = None) -> Iterator[Tuple[str, Any, Any]]:
+    """
+    Yield ("format", name, None), then in file order ("field", key, value), ("events", None, None)
+    where the events array opens, and ("event", idx, event). Events past `to_event_idx` are not
+    decoded: array and NDJSON ledgers stop there, and an object ledger skips over the rest of
+    its events array so the fields that follow it are still yielded.
+    """
+    fmt = ledger_format(path)
+    yield "format", fmt, None
+    if fmt == "ndjson":
+        with open(path, "rb") as fh:
+            idx = 0
+            for raw in fh:
+                if idx == 0 and raw.startswith(b"\xef\xbb\xbf"):
+                    raw = raw[3:]
+                if not raw.strip():
+                    continue
+                if to_event_idx is not None and idx > to_event_idx:
+                    return
+                yield "event", idx, json.loads(raw)
+                idx += 1
+        return
+
+    with open(path, "r", encoding="utf-8-sig") as fh:
+        scanner = _JsonScanner(fh)
+        if fmt == "array":
+            scanner.expect("[")
+            for idx, _ in enumerate(scanner.items("]")):
+                if to_event_idx is not None and idx > to_event_idx:
+                    return
+                yield "event", idx, scanner.value()
+            return
+
+        scanner.expect("{")
+        for _ in scanner.items("}"):
+            key = scanner.value()
+            scanner.expect(":")
+            if key == "events" and scanner.peek() == "[":
+                scanner.expect("[")
+                yield "events", None, None
+                for idx, _ in enumerate(scanner.items("]")):
+                    if to_event_idx is not None and idx > to_event_idx:
+                        scanner.skip()
+                    else:
+                        yield "event", idx, scanner.value()
+            else:
+                yield "field", key, scanner.value()
+
+
+def _window(from_event_idx: Any, to_event_idx: Any) -> Tuple[int, Optional[int]]:
+    start = max(int(from_event_idx or 0), 0)
+    stop = None if to_event_idx is None else int(to_event_idx)
+    return start, stop
+
+
+def iter_ledger_events(
+    path: str, from_event_idx: Any = 0, to_event_idx: Any = None
+) -> Iterator[Tuple[int, Any]]:
+    """
+    Yield (idx, event) for events with from_event_idx <= idx <= to_event_idx.
+    Reading stops as soon as the window is passed.
+    """
+    start, stop = _window(from_event_idx, to_event_idx)
+    walk = walk_ledger(path, stop)
+    try:
+        for kind, idx, event in walk:
+            if kind != "event" or idx < start:
+                continue
+            yield idx, event
+            if stop is not None and idx >= stop:
+                return
+    finally:
+        walk.close()
+
+
+def summarize_ledger(
+    path: str, from_event_idx: Any = 0, to_event_idx: Any = None
+) -> LedgerSummary:
+    """
+    Top-level fields (everything but the events array) plus the number of events in the window.
+    Fields that follow the events array are reached by decoding and discarding the events one at
+    a time, so memory stays bounded even though the whole file is read; events past
+    `to_event_idx` are only skipped over, never decoded.
+    """
+    start, stop = _window(from_event_idx, to_event_idx)
+    fmt = "object"
+    fields: Dict[str, Any] = {}
+    count: Optional[int] = None
+    for kind, key, value in walk_ledger(path, stop):
+        if kind == "format":
+            fmt = key
+            if fmt != "object":
+                count = 0
+        elif kind == "field":
+            fields[key] = value
+        elif kind == "events":
+            count = 0
+        elif start <= key:
+            count = (count or 0) + 1
+    return LedgerSummary(format=fmt, fields=fields, event_count=count)
@@ -1,20 +1,111 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..models import TriState
+from ..utils.fs_scan import FileScan
+from ..utils.hash_cache import FileDigestCache, FileKey
+from ..utils.io import read_json
+
+# Manifest format:
+#   {"schema_version": "...", "base_dir": "<optional, relative to the manifest>",
+#    "artifacts": [{"path": "<relative or absolute>", "sha256": "<hex>", "size": <optional int>}, ...]}
+MAX_REPORTED_ERRORS = 100
 
 
 @dataclass(frozen=True)
 class ArtifactManifestResult:
     artifact_hashes_valid: TriState
     errors: List[str]
+    stats: Dict[str, Any] = field(default_factory=dict)
+
 
+def _expected_digest(entry: Dict[str, Any]) -> Optional[str]:
+    value = entry.get("sha256")
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip().lower()
+    return value[len("sha256:") :] if value.startswith("sha256:") else value
 
-def validate_artifacts_manifest(artifacts_manifest_path: str) -> ArtifactManifestResult:
+
+def validate_artifacts_manifest(
+    artifacts_manifest_path: str,
+    cache: Optional[FileDigestCache] = None,
+    workers: Optional[int] = None,
+    scan: Optional[FileScan] = None,
+) -> ArtifactManifestResult:
     """
-    Placeholder.
-    Later: verify every artifact exists + hash matches manifest.
+    Verify every artifact in the manifest exists and matches its sha256 (and size, if given).
+
+    Files are stat'ed first; those whose (path, size, mtime_ns, inode) is in the persistent
+    digest cache are verified without being read. The rest are hashed on a thread pool and
+    their digests cached. `stats` reports the cache hit rate and bytes hashed. Pass the run's
+    FileScan as `scan` to share its stat table and digests; `cache`/`workers` then come from it.
     """
-    return ArtifactManifestResult(artifact_hashes_valid="UNKNOWN", errors=["not_implemented"])
+    if scan is None:
+        scan = FileScan(cache if cache is not None else FileDigestCache.default(), workers)
+    try:
+        manifest = read_json(artifacts_manifest_path)
+    except (OSError, ValueError) as exc:
+        return ArtifactManifestResult(artifact_hashes_valid="FAIL", errors=[f"manifest_unreadable:{type(exc).__name__}"])
+    artifacts = manifest.get("artifacts") if isinstance(manifest, dict) else None
+    if not isinstance(artifacts, list):
+        return ArtifactManifestResult(artifact_hashes_valid="FAIL", errors=["manifest_invalid:artifacts"])
+    if not artifacts:
+        return ArtifactManifestResult(artifact_hashes_valid="UNKNOWN", errors=["no_artifacts"], stats={"artifacts": 0})
+
+    base = Path(artifacts_manifest_path).resolve().parent
+    if isinstance(manifest.get("base_dir"), str) and manifest["base_dir"].strip():
+        base = (base / manifest["base_dir"]).resolve()
+
+    errors: List[str] = []
+    # (manifest path, resolved key, expected sha256)
+    pending: List[Tuple[str, FileKey, str]] = []
+    for i, entry in enumerate(artifacts):
+        rel = entry.get("path") if isinstance(entry, dict) else None
+        expected = _expected_digest(entry) if isinstance(entry, dict) else None
+        if not isinstance(rel, str) or not rel.strip() or expected is None:
+            errors.append(f"invalid_entry:{i}")
+            continue
+        full = str((base / rel).resolve())
+        try:
+            key = scan.stat(full)
+        except FileNotFoundError:
+            errors.append(f"missing:{rel}")
+            continue
+        except OSError:
+            errors.append(f"unreadable:{rel}")
+            continue
+        declared_size = entry.get("size")
+        if isinstance(declared_size, int) and declared_size != key.size:
+            errors.append(f"size_mismatch:{rel}")
+            continue
+        pending.append((rel, key, expected))
+
+    found, batch = scan.digests(key for _, key, _ in pending)
+    for rel, key, expected in pending:
+        actual = found.get(key.path)
+        if actual is None:
+            errors.append(f"unreadable:{rel}")
+        elif actual != expected:
+            errors.append(f"sha256_mismatch:{rel}")
+
+    checked = len(pending)
+    hits = batch["memo_hits"] + batch["cache_hits"]
+    stats = {
+        "artifacts": len(artifacts),
+        "checked": checked,
+        "cache_hits": hits,
+        "cache_misses": batch["hashed"],
+        "cache_hit_rate": round(hits / checked, 4) if checked else None,
+        "bytes_hashed": batch["bytes_hashed"],
+    }
+    if len(errors) > MAX_REPORTED_ERRORS:
+        errors = errors[:MAX_REPORTED_ERRORS] + [f"more_errors:{len(errors) - MAX_REPORTED_ERRORS}"]
+    return ArtifactManifestResult(
+        artifact_hashes_valid="FAIL" if errors else "PASS",
+        errors=errors,
+        stats=stats,
+    )
@@ -1,21 +1,211 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import List, Literal, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from ..models import TriState
+from ..utils.io import iter_ledger_events, ledger_format
+
+# Chain format: every event carries "prev_hash" (the previous event's "hash"; GENESIS_HASH for
+# event 0) and "hash" = sha256 of the event's canonical JSON without its own "hash" field
+# (sorted keys, compact separators, UTF-8). A ledger whose first event has neither field is
+# treated as unchained and reported UNKNOWN.
+GENESIS_HASH = "0" * 64
+HASH_FIELD = "hash"
+PREV_HASH_FIELD = "prev_hash"
+
+# NDJSON ledgers at least this large are split into byte ranges verified in worker processes.
+PARALLEL_MIN_BYTES = 32 * 1024 * 1024
+READ_CHUNK_BYTES = 1024 * 1024
 
 
 @dataclass(frozen=True)
 class HashChainResult:
     ledger_hash_chain_valid: TriState
     errors: List[str]
+    events_checked: int = 0
+    first_broken_index: Optional[int] = None
+    segments: int = 1
+
+
+@dataclass
+class _Segment:
+    """Verification state of a contiguous run of events; the first link is checked when stitching."""
+
+    count: int = 0
+    first_prev: Optional[str] = None
+    last_hash: Optional[str] = None
+    # (index within the segment, reason) of the first problem; checking stops there.
+    error: Optional[Tuple[int, str]] = None
+
+    def fail(self, reason: str) -> bool:
+        self.error = (self.count, reason)
+        return False
+
+    def feed(self, event: Any) -> bool:
+        if not isinstance(event, dict):
+            return self.fail("event_not_object")
+        claimed = event.get(HASH_FIELD)
+        prev = event.get(PREV_HASH_FIELD)
+        if not isinstance(claimed, str) or not isinstance(prev, str):
+            return self.fail("missing_hash_fields")
+        if self.count == 0:
+            self.first_prev = prev
+        elif prev != self.last_hash:
+            return self.fail("prev_hash_mismatch")
+        if compute_event_hash(event) != claimed:
+            return self.fail("hash_mismatch")
+        self.last_hash = claimed
+        self.count += 1
+        return True
+
+
+def compute_event_hash(event: Dict[str, Any]) -> str:
+    body = {k: v for k, v in event.items() if k != HASH_FIELD}
+    payload = json.dumps(body, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def chain_events(events: Iterable[Dict[str, Any]], prev_hash: str = GENESIS_HASH) -> Iterator[Dict[str, Any]]:
+    """Yield copies of `events` with prev_hash/hash filled in (for writers, fixtures and benchmarks)."""
+    for event in events:
+        linked = dict(event)
+        linked.pop(HASH_FIELD, None)
+        linked[PREV_HASH_FIELD] = prev_hash
+        prev_hash = linked[HASH_FIELD] = compute_event_hash(linked)
+        yield linked
+
 
+def _verify_byte_range(job: Tuple[str, int, int]) -> _Segment:
+    """Verify the NDJSON lines that start inside [start, end) of the file."""
+    path, start, end = job
+    segment = _Segment()
+    with open(path, "rb", buffering=READ_CHUNK_BYTES) as fh:
+        pos = start
+        if start > 0:
+            fh.seek(start - 1)
+            if fh.read(1) != b"\n":
+                # The line straddling `start` belongs to the previous range.
+                pos += len(fh.readline())
+        else:
+            fh.seek(0)
+        while pos < end:
+            line = fh.readline()
+            if not line:
+                break
+            pos += len(line)
+            if pos == len(line) and line.startswith(b"\xef\xbb\xbf"):
+                line = line[3:]
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                segment.fail("invalid_json")
+                break
+            if not segment.feed(event):
+                break
+    return segment
 
-def validate_hash_chain(execution_ledger_path: str) -> HashChainResult:
+
+def _verify_events(path: str) -> _Segment:
+    segment = _Segment()
+    try:
+        for _, event in iter_ledger_events(path):
+            if not segment.feed(event):
+                break
+    except ValueError:
+        segment.fail("invalid_json")
+    return segment
+
+
+def _stitch(segments: List[_Segment]) -> HashChainResult:
+    expected_prev = GENESIS_HASH
+    offset = 0
+    for segment in segments:
+        if segment.count == 0 and segment.error is None:
+            continue
+        broken: Optional[Tuple[int, str]] = None
+        if segment.first_prev is not None and segment.first_prev != expected_prev:
+            broken = (offset, "prev_hash_mismatch")
+        elif segment.error is not None:
+            broken = (offset + segment.error[0], segment.error[1])
+        if broken is not None:
+            index, reason = broken
+            if index == 0 and reason == "missing_hash_fields":
+                return HashChainResult(
+                    ledger_hash_chain_valid="UNKNOWN",
+                    errors=["no_hash_chain"],
+                    segments=len(segments),
+                )
+            return HashChainResult(
+                ledger_hash_chain_valid="FAIL",
+                errors=[f"broken_link_at:{index}:{reason}"],
+                events_checked=index,
+                first_broken_index=index,
+                segments=len(segments),
+            )
+        expected_prev = segment.last_hash or expected_prev
+        offset += segment.count
+    if offset == 0:
+        return HashChainResult(ledger_hash_chain_valid="UNKNOWN", errors=["empty_ledger"], segments=len(segments))
+    return HashChainResult(
+        ledger_hash_chain_valid="PASS",
+        errors=[],
+        events_checked=offset,
+        segments=len(segments),
+    )
+
+
+def _default_workers() -> int:
+    raw = os.environ.get("RGPT_REPLAY_HASH_CHAIN_WORKERS", "").strip()
+    if raw:
+        try:
+            return max(int(raw), 1)
+        except ValueError:
+            pass
+    return min(os.cpu_count() or 1, 8)
+
+
+def validate_hash_chain(
+    execution_ledger_path: str,
+    workers: Optional[int] = None,
+    parallel_min_bytes: int = PARALLEL_MIN_BYTES,
+) -> HashChainResult:
     """
-    Placeholder.
-    Later: validate per-line hash chain of EXECUTION ledger.
-    Return PASS/FAIL/UNKNOWN with detailed errors.
+    Verify the per-event hash chain of the EXECUTION ledger without loading it into memory.
+
+    NDJSON ledgers of at least `parallel_min_bytes` are split into byte ranges (two per worker)
+    verified in worker processes; each range checks its internal links and the ranges are
+    stitched by matching every range's first prev_hash to the previous range's last hash.
+    Other ledger shapes are verified serially through the streaming reader.
+    FAIL reports the first broken link as `broken_link_at:<event index>:<reason>`.
     """
-    return HashChainResult(ledger_hash_chain_valid="UNKNOWN", errors=["not_implemented"])
+    try:
+        size = os.path.getsize(execution_ledger_path)
+        fmt = ledger_format(execution_ledger_path)
+    except (OSError, ValueError) as exc:
+        return HashChainResult(ledger_hash_chain_valid="UNKNOWN", errors=[f"unreadable:{type(exc).__name__}"])
+
+    if fmt != "ndjson":
+        try:
+            return _stitch([_verify_events(execution_ledger_path)])
+        except OSError as exc:
+            return HashChainResult(ledger_hash_chain_valid="UNKNOWN", errors=[f"unreadable:{type(exc).__name__}"])
+
+    workers = _default_workers() if workers is None else max(int(workers), 1)
+    # Pool workers are daemonic and cannot start their own pools (e.g. under run_batch).
+    if workers == 1 or size < parallel_min_bytes or multiprocessing.current_process().daemon:
+        return _stitch([_verify_byte_range((execution_ledger_path, 0, size))])
+
+    parts = workers * 2
+    bounds = [size * i // parts for i in range(parts + 1)]
+    jobs = [(execution_ledger_path, bounds[i], bounds[i + 1]) for i in range(parts)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        segments = list(pool.map(_verify_byte_range, jobs))
+    return _stitch(segments)
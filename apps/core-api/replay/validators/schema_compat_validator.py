@@ -1,20 +1,127 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 from ..models import TriState
+from ..schema_registry import SchemaRegistry, VersionSchemas, schema_registry, validate_events
+from ..utils.io import iter_ledger_events, walk_ledger
+
+MAX_REPORTED_ERRORS = 20
 
 
 @dataclass(frozen=True)
 class SchemaCompatResult:
     schema_versions_compatible: TriState
     errors: List[str]
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class _LedgerCheck:
+    version: Optional[str] = None
+    events_validated: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def _check_ledger(label: str, path: str, registry: SchemaRegistry) -> _LedgerCheck:
+    """
+    Validate one ledger in a single streaming pass when its schema_version is known before the
+    events (header first, or carried by the first NDJSON/array event). A document that puts
+    schema_version after the events array gets a second, events-only pass.
+    """
+    result = _LedgerCheck()
+    header: Dict[str, Any] = {}
+    schemas: Optional[VersionSchemas] = None
+    has_header = True
+    deferred = False
+
+    def resolve() -> Optional[VersionSchemas]:
+        found = registry.for_version(result.version) if result.version else None
+        if result.version and found is None:
+            result.errors.append(f"{label}:unsupported_schema_version:{result.version}")
+        return found
+
+    def add(errors: List[str]) -> None:
+        result.errors.extend(f"{label}:{e}" for e in errors)
+
+    try:
+        for kind, key, value in walk_ledger(path):
+            if kind == "format":
+                has_header = key == "object"
+            elif kind == "field":
+                header[key] = value
+                if key == "schema_version" and result.version is None and isinstance(value, str):
+                    result.version = value
+            elif kind == "event":
+                if key == 0 and result.version is None and not header and isinstance(value, dict):
+                    embedded = value.get("schema_version")
+                    result.version = embedded if isinstance(embedded, str) else None
+                if result.version is None:
+                    if not has_header:
+                        # NDJSON / array ledgers have nowhere else to declare a version.
+                        return result
+                    deferred = True
+                    continue
+                if schemas is None:
+                    schemas = resolve()
+                    if schemas is None:
+                        return result
+                if schemas.event is not None:
+                    result.events_validated += 1
+                    add([f"event[{key}]{e}" for e in schemas.event.errors(value, MAX_REPORTED_ERRORS)])
+                    if len(result.errors) >= MAX_REPORTED_ERRORS:
+                        return result
+        if result.version is None:
+            return result
+        if schemas is None:
+            schemas = resolve()
+            if schemas is None:
+                return result
+        if has_header and schemas.document is not None:
+            add(schemas.document.errors(header, MAX_REPORTED_ERRORS))
+        if deferred and schemas.event is not None:
+            count, errors = validate_events(
+                schemas.event, iter_ledger_events(path), MAX_REPORTED_ERRORS - len(result.errors)
+            )
+            result.events_validated += count
+            add(errors)
+    except ValueError:
+        result.errors.append(f"{label}:invalid_json")
+    except OSError as exc:
+        result.errors.append(f"{label}:unreadable:{type(exc).__name__}")
+    return result
 
 
 def validate_schema_compatibility(execution_ledger_path: str, decision_ledger_path: str) -> SchemaCompatResult:
     """
-    Placeholder.
-    Later: compare schema versions embedded in ledgers vs current supported versions.
+    Check both ledgers' schema_version against the compiled schema registry: each version must be
+    known, every header and event must validate, and the decision ledger's version must be
+    compatible with the execution ledger's. Events are streamed, never materialized.
     """
-    return SchemaCompatResult(schema_versions_compatible="UNKNOWN", errors=["not_implemented"])
+    registry = schema_registry()
+    execution = _check_ledger("execution", execution_ledger_path, registry)
+    decision = _check_ledger("decision", decision_ledger_path, registry)
+    errors = (execution.errors + decision.errors)[:MAX_REPORTED_ERRORS]
+    stats = {
+        "execution": {"schema_version": execution.version, "events_validated": execution.events_validated},
+        "decision": {"schema_version": decision.version, "events_validated": decision.events_validated},
+    }
+
+    if errors:
+        return SchemaCompatResult(schema_versions_compatible="FAIL", errors=errors, stats=stats)
+    missing = [label for label, check in (("execution", execution), ("decision", decision)) if check.version is None]
+    if missing:
+        return SchemaCompatResult(
+            schema_versions_compatible="UNKNOWN",
+            errors=[f"{label}:no_schema_version" for label in missing],
+            stats=stats,
+        )
+    assert execution.version is not None and decision.version is not None
+    if not registry.compatible(execution.version, decision.version):
+        return SchemaCompatResult(
+            schema_versions_compatible="FAIL",
+            errors=[f"incompatible:{execution.version}->{decision.version}"],
+            stats=stats,
+        )
+    return SchemaCompatResult(schema_versions_compatible="PASS", errors=[], stats=stats)
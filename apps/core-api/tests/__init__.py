@@ -1 +1,6 @@
 """Core API tests."""
+import os
+
+# Keep the replay digest cache out of the developer's cache dir; tests that exercise it pass
+# their own FileDigestCache.
+os.environ["RGPT_REPLAY_HASH_CACHE_PATH"] = "off"
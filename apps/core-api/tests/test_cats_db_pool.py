@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from api.cats_db_pool import ConnectionPool, PoolClosedError, PoolTimeoutError
+from api.cats_db_profile import (
+    CheckpointScheduler,
+    StorageConfigError,
+    apply_connection_settings,
+    apply_database_settings,
+    resolve_profile,
+)
+
+
+class ConnectionPoolTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.mkdtemp(prefix="cats_pool_test_")
+        self.db_path = Path(self._tmp) / "pool.sqlite3"
+        self.setup_calls = 0
+
+        def on_connect(conn: sqlite3.Connection) -> None:
+            self.setup_calls += 1
+            conn.execute("pragma foreign_keys = on;")
+
+        self.pool = ConnectionPool(self.db_path, size=2, timeout=0.2, health_check_interval=0.0, on_connect=on_connect)
+
+    def tearDown(self) -> None:
+        self.pool.close()
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def test_reuses_connections_and_runs_setup_once(self) -> None:
+        for _ in range(5):
+            with self.pool.connection() as conn:
+                self.assertEqual(conn.execute("pragma foreign_keys").fetchone()[0], 1)
+        metrics = self.pool.metrics()
+        self.assertEqual(self.setup_calls, 1)
+        self.assertEqual(metrics["misses"], 1)
+        self.assertEqual(metrics["hits"], 4)
+        self.assertEqual(metrics["open"], 1)
+
+    def test_reentrant_checkout_shares_connection(self) -> None:
+        with self.pool.connection() as outer:
+            with self.pool.connection() as inner:
+                self.assertIs(outer, inner)
+        self.assertEqual(self.pool.metrics()["inUse"], 0)
+
+    def test_exhausted_pool_waits_then_times_out(self) -> None:
+        checked_out = threading.Event()
+        release = threading.Event()
+
+        def hold() -> None:
+            with self.pool.connection():
+                checked_out.set()
+                release.wait(5)
+
+        holders = [threading.Thread(target=hold) for _ in range(2)]
+        for t in holders:
+            checked_out.clear()
+            t.start()
+            checked_out.wait(5)
+        try:
+            with self.assertRaises(PoolTimeoutError):
+                with self.pool.connection():
+                    pass
+        finally:
+            release.set()
+            for t in holders:
+                t.join(5)
+        metrics = self.pool.metrics()
+        self.assertEqual(metrics["waits"], 1)
+        self.assertEqual(metrics["timeouts"], 1)
+
+    def test_broken_idle_connection_is_replaced(self) -> None:
+        with self.pool.connection() as conn:
+            first = conn
+        first.close()
+        with self.pool.connection() as conn:
+            self.assertIsNot(conn, first)
+            conn.execute("select 1")
+        self.assertEqual(self.pool.metrics()["healthCheckFailures"], 1)
+
+    def test_rollback_on_error_and_close(self) -> None:
+        with self.pool.connection() as conn:
+            conn.execute("create table t (x integer)")
+        with self.assertRaises(RuntimeError):
+            with self.pool.connection() as conn:
+                conn.execute("insert into t values (1)")
+                raise RuntimeError("boom")
+        with self.pool.connection() as conn:
+            self.assertEqual(conn.execute("select count(1) from t").fetchone()[0], 0)
+        self.pool.close()
+        with self.assertRaises(PoolClosedError):
+            with self.pool.connection():
+                pass
+
+
+class StorageProfileTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.mkdtemp(prefix="cats_profile_test_")
+        self.db_path = Path(self._tmp) / "profile.sqlite3"
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def test_unknown_profile_is_rejected(self) -> None:
+        with self.assertRaises(StorageConfigError) as caught:
+            resolve_profile("turbo")
+        # Must not be mistaken for a request-level validation error.
+        self.assertNotIsInstance(caught.exception, ValueError)
+
+    def test_high_throughput_enables_wal_and_checkpoints(self) -> None:
+        profile = resolve_profile("high-throughput")
+        pool = ConnectionPool(self.db_path, size=1, on_connect=lambda conn: apply_connection_settings(conn, profile))
+        try:
+            with pool.connection() as conn:
+                apply_database_settings(conn, profile)
+                self.assertEqual(conn.execute("pragma journal_mode").fetchone()[0], "wal")
+                self.assertEqual(conn.execute("pragma synchronous").fetchone()[0], 1)
+                conn.execute("create table t (x integer)")
+            self.assertTrue(CheckpointScheduler.enabled_for(profile))
+            result = CheckpointScheduler(pool.connection, profile).checkpoint()
+            self.assertEqual(result["busy"], 0)
+        finally:
+            pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
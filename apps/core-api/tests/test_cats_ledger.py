@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from api.cats_ledger import (
+    append_cats_event,
+    append_cats_events,
+    close_ledger_writer,
+    get_ledger_writer_metrics,
+    iter_cats_events,
+)
+from api.cats_ledger_segments import SegmentedLedger, iter_ledger_lines, list_sealed_segments, read_index
+
+
+def _append_from_process(path: str, worker: int, count: int) -> None:
+    ledger = SegmentedLedger(Path(path), max_bytes=4000, index_every=4)
+    for n in range(count):
+        ledger.append(json.dumps({"ts": "2026-01-01T00:00:00+00:00", "w": worker, "n": n}).encode("utf-8") + b"\n")
+    ledger.close()
+
+
+class GroupCommitLedgerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.mkdtemp(prefix="cats_ledger_test_")
+        self.ledger_path = Path(self._tmp) / "cats_governance.jsonl"
+        os.environ["RGPT_CATS_LEDGER_PATH"] = str(self.ledger_path)
+        os.environ["RGPT_CATS_LEDGER_MODE"] = "group"
+        os.environ["RGPT_CATS_LEDGER_FLUSH_MS"] = "20"
+
+    def tearDown(self) -> None:
+        close_ledger_writer()
+        for name in ("RGPT_CATS_LEDGER_PATH", "RGPT_CATS_LEDGER_MODE", "RGPT_CATS_LEDGER_FLUSH_MS", "RGPT_CATS_LEDGER_FSYNC"):
+            os.environ.pop(name, None)
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def test_event_is_on_disk_when_append_returns(self) -> None:
+        self.assertTrue(append_cats_event({"event_type": "cats.created", "payload": {"catId": "c1"}}))
+        lines = self.ledger_path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(json.loads(lines[0])["payload"], {"catId": "c1"})
+
+    def test_concurrent_appends_are_batched(self) -> None:
+        os.environ["RGPT_CATS_LEDGER_FSYNC"] = "none"
+        results = []
+
+        def append(i: int) -> None:
+            results.append(append_cats_event({"event_type": "cats.updated", "payload": {"n": i}}))
+
+        threads = [threading.Thread(target=append, args=(i,)) for i in range(40)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(results), 40)
+        self.assertTrue(all(results))
+        lines = self.ledger_path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(sorted(json.loads(line)["payload"]["n"] for line in lines), list(range(40)))
+        writer = get_ledger_writer_metrics()["writer"]
+        self.assertEqual(writer["entries"], 40)
+        self.assertLess(writer["batches"], 40)
+        self.assertEqual(writer["fsyncs"], 0)
+
+
+class SegmentedLedgerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.mkdtemp(prefix="cats_ledger_segments_test_")
+        self.ledger_path = Path(self._tmp) / "cats_governance.jsonl"
+        os.environ["RGPT_CATS_LEDGER_PATH"] = str(self.ledger_path)
+        os.environ["RGPT_CATS_LEDGER_SEGMENT_MAX_BYTES"] = "2000"
+        os.environ["RGPT_CATS_LEDGER_INDEX_EVERY"] = "4"
+
+    def tearDown(self) -> None:
+        close_ledger_writer()
+        for name in ("RGPT_CATS_LEDGER_PATH", "RGPT_CATS_LEDGER_SEGMENT_MAX_BYTES", "RGPT_CATS_LEDGER_INDEX_EVERY"):
+            os.environ.pop(name, None)
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def test_rotation_and_indexed_seek(self) -> None:
+        for i in range(100):
+            self.assertTrue(append_cats_events([{"event_type": "cats.updated", "payload": {"n": i}}]))
+
+        sealed = list_sealed_segments(self.ledger_path)
+        self.assertGreater(len(sealed), 1)
+        self.assertEqual(sealed[0][0], 0)
+        for first_seq, path in sealed:
+            entries = read_index(path)
+            self.assertEqual(entries[0].seq, first_seq)
+            self.assertEqual(entries[0].offset, 0)
+        self.assertEqual(get_ledger_writer_metrics()["segments"]["nextSeq"], 100)
+
+        everything = [(seq, json.loads(line)["payload"]["n"]) for seq, line in iter_cats_events()]
+        self.assertEqual(everything, [(n, n) for n in range(100)])
+        tail = [seq for seq, _ in iter_cats_events(from_seq=57)]
+        self.assertEqual(tail, list(range(57, 100)))
+
+    def test_reopen_continues_sequence_and_drops_torn_tail(self) -> None:
+        ledger = SegmentedLedger(self.ledger_path, max_bytes=500, index_every=3)
+        for i in range(20):
+            ledger.append(json.dumps({"ts": f"2026-01-01T00:00:{i:02d}+00:00", "n": i}).encode("utf-8") + b"\n")
+        ledger.close()
+        with self.ledger_path.open("ab") as handle:
+            handle.write(b'{"ts":"2026-01-01T00:00:59+00:00","n":')
+
+        reopened = SegmentedLedger(self.ledger_path, max_bytes=500, index_every=3)
+        self.assertEqual(reopened.next_seq, 20)
+        reopened.append(json.dumps({"ts": "2026-01-01T00:01:00+00:00", "n": 20}).encode("utf-8") + b"\n")
+        reopened.close()
+
+        seqs = [seq for seq, _ in iter_ledger_lines(self.ledger_path)]
+        self.assertEqual(seqs, list(range(21)))
+        since = [json.loads(line)["n"] for _, line in iter_ledger_lines(self.ledger_path, since="2026-01-01T00:00:15Z")]
+        self.assertLessEqual(since[0], 15)
+        self.assertEqual(since[-1], 20)
+
+    def test_reads_never_write_index_sidecars(self) -> None:
+        ledger = SegmentedLedger(self.ledger_path, max_bytes=500, index_every=3)
+        for i in range(20):
+            ledger.append(json.dumps({"ts": f"2026-01-01T00:00:{i:02d}+00:00", "n": i}).encode("utf-8") + b"\n")
+        ledger.close()
+        self.assertTrue(list_sealed_segments(self.ledger_path))
+        for sidecar in Path(self._tmp).glob("*.idx"):
+            sidecar.unlink()
+
+        seqs = [seq for seq, _ in iter_ledger_lines(self.ledger_path)]
+        self.assertEqual(seqs, list(range(20)))
+        self.assertEqual(sorted(Path(self._tmp).glob("*.idx*")), [])
+
+        reopened = SegmentedLedger(self.ledger_path, max_bytes=500, index_every=3)
+        self.assertEqual(reopened.next_seq, 20)
+        reopened.close()
+        last_first, last_path = list_sealed_segments(self.ledger_path)[-1]
+        self.assertEqual(read_index(last_path)[0].seq, last_first)
+        self.assertEqual(sorted(Path(self._tmp).glob("*.tmp")), [])
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs fork")
+    def test_concurrent_writer_processes_share_one_sequence(self) -> None:
+        ctx = multiprocessing.get_context("fork")
+        procs = [ctx.Process(target=_append_from_process, args=(str(self.ledger_path), w, 150)) for w in range(4)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join(60)
+            self.assertEqual(proc.exitcode, 0)
+
+        rows = [(seq, json.loads(line)) for seq, line in iter_ledger_lines(self.ledger_path)]
+        self.assertEqual([seq for seq, _ in rows], list(range(600)))
+        for w in range(4):
+            self.assertEqual([e["n"] for _, e in rows if e["w"] == w], list(range(150)))
+        self.assertGreater(len(list_sealed_segments(self.ledger_path)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import json
 import os
 import shutil
 import tempfile
 import unittest
 from pathlib import Path
 
+from unittest import mock
+
 from fastapi.testclient import TestClient
 
+from api.cats_db_profile import StorageConfigError
+from api.cats_ledger import close_ledger_writer
+from api.cats_store import close_pool
 from main import app
 
 
@@ -22,10 +28,47 @@ class CatsLifecycleApiTests(unittest.TestCase):
         self.headers = {"x-org-id": "org_test", "x-user-id": "usr_test"}
 
     def tearDown(self) -> None:
+        close_pool()
+        close_ledger_writer()
         os.environ.pop("RGPT_CATS_DB_PATH", None)
         os.environ.pop("RGPT_CATS_LEDGER_PATH", None)
         shutil.rmtree(self._tmp, ignore_errors=True)
 
+    def test_unknown_storage_profile_is_a_config_error_not_a_bad_request(self) -> None:
+        with mock.patch.dict(os.environ, {"RGPT_CATS_DB_PROFILE": "turbo"}):
+            with self.assertRaises(StorageConfigError):
+                with TestClient(app):
+                    pass
+            client = TestClient(app, raise_server_exceptions=False)
+            response = client.get("/api/cats", headers=self.headers)
+        self.assertEqual(response.status_code, 500)
+
+    def test_store_pool_metrics_need_an_operator_and_never_open_the_pool(self) -> None:
+        self.assertEqual(self.client.get("/api/cats/_store/pool").status_code, 403)
+        with mock.patch.dict(os.environ, {"RGPT_OPS_TOKEN": "s3cret"}):
+            denied = self.client.get("/api/cats/_store/pool", headers={**self.headers, "x-ops-token": "nope"})
+            self.assertEqual(denied.status_code, 403)
+            ops = {"x-ops-token": "s3cret"}
+            idle = self.client.get("/api/cats/_store/pool", headers=ops)
+            self.assertEqual((idle.status_code, idle.json()), (200, {}))
+            self.assertFalse(self.db_path.exists())
+
+            self.client.get("/api/cats", headers=self.headers)
+            metrics = self.client.get("/api/cats/_store/pool", headers=ops).json()
+        self.assertNotIn("path", metrics)
+        self.assertGreaterEqual(metrics["open"], 1)
+
+    def test_store_ledger_metrics_need_an_operator_and_hide_the_path(self) -> None:
+        self.assertEqual(self.client.get("/api/cats/_store/ledger").status_code, 403)
+        with mock.patch.dict(os.environ, {"RGPT_OPS_TOKEN": "s3cret", "RGPT_CATS_LEDGER_MODE": "group"}):
+            self.client.post("/api/cats", headers=self.headers, json={"name": "Ledger Bot"})
+            response = self.client.get("/api/cats/_store/ledger", headers={"x-ops-token": "s3cret"})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["mode"], "group")
+        self.assertIsNotNone(body["writer"])
+        self.assertNotIn(str(self.ledger_path), response.text)
+
     def test_create_publish_transition_and_list(self) -> None:
         created = self.client.post(
             "/api/cats",
@@ -100,6 +143,168 @@ class CatsLifecycleApiTests(unittest.TestCase):
         self.assertEqual(updated.status_code, 409, updated.text)
         self.assertIn("Draft/Review", updated.json()["detail"])
 
+        published = self.client.post(
+            f"/api/cats/{cat_id}/versions",
+            headers=self.headers,
+            json={"version": "1.0.0", "commandBundleRef": "cats/bundles/immutable"},
+        )
+        self.assertEqual(published.status_code, 409, published.text)
+
+        reopened = self.client.post(
+            f"/api/cats/{cat_id}/transition",
+            headers=self.headers,
+            json={"targetStatus": "Draft"},
+        )
+        self.assertEqual(reopened.status_code, 409, reopened.text)
+        self.assertIn("Archived -> Draft", reopened.json()["detail"])
+
+        unknown = self.client.post(
+            "/api/cats/missing-cat/transition",
+            headers=self.headers,
+            json={"targetStatus": "Bogus"},
+        )
+        self.assertEqual(unknown.status_code, 404, unknown.text)
+
+    def test_publish_checks_existence_and_status_before_the_version_format(self) -> None:
+        bad = {"version": "not-semver", "commandBundleRef": "cats/bundles/x"}
+        missing = self.client.post("/api/cats/missing-cat/versions", headers=self.headers, json=bad)
+        self.assertEqual(missing.status_code, 404, missing.text)
+
+        cat_id = self.client.post("/api/cats", headers=self.headers, json={"name": "Semver CAT"}).json()["catId"]
+        invalid = self.client.post(f"/api/cats/{cat_id}/versions", headers=self.headers, json=bad)
+        self.assertEqual(invalid.status_code, 422, invalid.text)
+
+        self.client.post(f"/api/cats/{cat_id}/transition", headers=self.headers, json={"targetStatus": "Archived"})
+        archived = self.client.post(f"/api/cats/{cat_id}/versions", headers=self.headers, json=bad)
+        self.assertEqual(archived.status_code, 409, archived.text)
+
+    def test_cursor_pagination_matches_page_order(self) -> None:
+        for i in range(7):
+            created = self.client.post("/api/cats", headers=self.headers, json={"name": f"Paged CAT {i}"})
+            self.assertEqual(created.status_code, 201, created.text)
+
+        by_page = []
+        for page in (1, 2, 3):
+            listed = self.client.get(f"/api/cats?page={page}&pageSize=3", headers=self.headers)
+            self.assertEqual(listed.status_code, 200, listed.text)
+            self.assertEqual(listed.json()["total"], 7)
+            by_page.extend(item["catId"] for item in listed.json()["items"])
+
+        by_cursor = []
+        cursor = None
+        while True:
+            query = "pageSize=3&includeTotal=false" + (f"&cursor={cursor}" if cursor else "")
+            listed = self.client.get(f"/api/cats?{query}", headers=self.headers)
+            self.assertEqual(listed.status_code, 200, listed.text)
+            body = listed.json()
+            self.assertIsNone(body["total"])
+            by_cursor.extend(item["catId"] for item in body["items"])
+            cursor = body["nextCursor"]
+            if not cursor:
+                break
+
+        self.assertEqual(len(by_page), 7)
+        self.assertEqual(by_cursor, by_page)
+
+        invalid = self.client.get("/api/cats?cursor=not-a-cursor", headers=self.headers)
+        self.assertEqual(invalid.status_code, 400, invalid.text)
+
+    def test_batch_create_and_publish_report_per_item_results(self) -> None:
+        existing = self.client.post("/api/cats", headers=self.headers, json={"name": "Existing CAT"})
+        self.assertEqual(existing.status_code, 201, existing.text)
+        ledger_lines_before = len(self.ledger_path.read_text(encoding="utf-8").splitlines())
+
+        batch = self.client.post(
+            "/api/cats:batch",
+            headers=self.headers,
+            json={
+                "items": [
+                    {"name": "Bulk A", "description": "first"},
+                    {"name": "Existing CAT"},
+                    {"name": ""},
+                    {"name": "Bulk A"},
+                    {"name": "Bulk B"},
+                ]
+            },
+        )
+        self.assertEqual(batch.status_code, 200, batch.text)
+        body = batch.json()
+        self.assertEqual([item["result"] for item in body["items"]], ["created", "conflict", "invalid", "conflict", "created"])
+        self.assertEqual(body["summary"], {"created": 2, "conflict": 2, "invalid": 1})
+        self.assertTrue(body["ledgerWritten"])
+        ledger_lines = self.ledger_path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(ledger_lines) - ledger_lines_before, 2)
+
+        cat_id = body["items"][0]["cat"]["catId"]
+        fetched = self.client.get(f"/api/cats/{cat_id}", headers=self.headers)
+        self.assertEqual(fetched.json()["name"], "Bulk A")
+
+        versions = self.client.post(
+            f"/api/cats/{cat_id}/versions:batch",
+            headers=self.headers,
+            json={
+                "items": [
+                    {"version": "1.0.0", "commandBundleRef": "cats/bundles/a-1"},
+                    {"version": "1.0.0", "commandBundleRef": "cats/bundles/a-dup"},
+                    {"version": "not-semver", "commandBundleRef": "cats/bundles/a-bad"},
+                    {"version": "1.1.0", "commandBundleRef": "cats/bundles/a-2", "manifestJson": {"entrypoint": "run"}},
+                ]
+            },
+        )
+        self.assertEqual(versions.status_code, 200, versions.text)
+        self.assertEqual([item["result"] for item in versions.json()["items"]], ["created", "conflict", "invalid", "created"])
+        listed = self.client.get(f"/api/cats/{cat_id}/versions", headers=self.headers)
+        self.assertEqual(sorted(v["version"] for v in listed.json()["items"]), ["1.0.0", "1.1.0"])
+
+        missing = self.client.post(
+            "/api/cats/missing-cat/versions:batch",
+            headers=self.headers,
+            json={"items": [{"version": "1.0.0", "commandBundleRef": "x"}]},
+        )
+        self.assertEqual(missing.status_code, 404, missing.text)
+
+    def test_event_queries_stream_filtered_ndjson_with_cursor(self) -> None:
+        cat_a = self.client.post("/api/cats", headers=self.headers, json={"name": "Events A"}).json()["catId"]
+        cat_b = self.client.post("/api/cats", headers=self.headers, json={"name": "Events B"}).json()["catId"]
+        other_org = {"x-org-id": "org_other", "x-user-id": "usr_other"}
+        self.client.post("/api/cats", headers=other_org, json={"name": "Events A"})
+        for name in ("Events A v2", "Events A v3"):
+            self.client.put(f"/api/cats/{cat_a}", headers=self.headers, json={"name": name})
+        self.client.post(f"/api/cats/{cat_b}/transition", headers=self.headers, json={"targetStatus": "Review"})
+
+        def read(url: str, headers=None):
+            response = self.client.get(url, headers=headers or self.headers)
+            self.assertEqual(response.status_code, 200, response.text)
+            self.assertTrue(response.headers["content-type"].startswith("application/x-ndjson"))
+            lines = [json.loads(line) for line in response.text.splitlines()]
+            return lines[:-1], lines[-1]
+
+        events, trailer = read(f"/api/cats/{cat_a}/events")
+        self.assertEqual([e["event_type"] for e in events], ["cats.created", "cats.updated", "cats.updated"])
+        self.assertTrue(all(e["payload"]["catId"] == cat_a for e in events))
+        self.assertFalse(trailer["hasMore"])
+
+        first_page, trailer = read(f"/api/cats/{cat_a}/events?eventType=cats.updated&limit=1")
+        self.assertEqual(len(first_page), 1)
+        self.assertTrue(trailer["hasMore"])
+        second_page, trailer = read(f"/api/cats/{cat_a}/events?eventType=cats.updated&limit=1&cursor={trailer['nextCursor']}")
+        self.assertEqual([e["payload"]["name"] for e in first_page + second_page], ["Events A v2", "Events A v3"])
+
+        created, _ = read("/api/ledger/events?orgId=org_test&eventType=cats.created")
+        self.assertEqual(sorted(e["payload"]["catId"] for e in created), sorted([cat_a, cat_b]))
+        future, _ = read("/api/ledger/events?since=2999-01-01T00:00:00Z")
+        self.assertEqual(future, [])
+
+        # Another org only ever sees its own events and cannot ask for someone else's.
+        foreign, _ = read("/api/ledger/events", headers=other_org)
+        self.assertEqual({e["org_id"] for e in foreign}, {"org_other"})
+        denied = self.client.get("/api/ledger/events?orgId=org_test", headers=other_org)
+        self.assertEqual(denied.status_code, 403, denied.text)
+
+        self.assertEqual(self.client.get("/api/ledger/events?since=yesterday", headers=self.headers).status_code, 400)
+        self.assertEqual(self.client.get("/api/ledger/events?cursor=-1", headers=self.headers).status_code, 400)
+        self.assertEqual(self.client.get("/api/cats/missing-cat/events", headers=self.headers).status_code, 404)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from api.cats_registry_cache import DocumentCache
+from api.cats_registry_index import police_register_index
+from api.cats_registry_snapshot import RegistryWatcher
+from main import app
+
+
+class DocumentCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.mkdtemp(prefix="cats_registry_cache_test_")
+        self.path = Path(self._tmp) / "registry_index.json"
+        self.path.write_text(json.dumps({"namespaces": {"a": 1}}), encoding="utf-8")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def test_revalidates_on_stat_change_only(self) -> None:
+        cache = DocumentCache(ttl_s=0.0)
+        first = cache.get(self.path)
+        self.assertIs(cache.get(self.path), first)
+        self.assertEqual(cache.metrics()["loads"], 1)
+        self.assertEqual(cache.metrics()["revalidations"], 1)
+
+        self.path.write_text(json.dumps({"namespaces": {"a": 1, "b": 2}}), encoding="utf-8")
+        stat = self.path.stat()
+        os.utime(self.path, ns=(stat.st_atime_ns, first.mtime_ns + 1_000_000))
+        self.assertEqual(cache.get(self.path).data["namespaces"], {"a": 1, "b": 2})
+        self.assertEqual(cache.metrics()["loads"], 2)
+
+    def test_ttl_skips_stat_and_clear_forces_reload(self) -> None:
+        cache = DocumentCache(ttl_s=3600.0)
+        first = cache.get(self.path)
+        self.path.unlink()
+        self.assertIs(cache.get(self.path), first)
+        self.assertEqual(cache.metrics()["hits"], 1)
+        self.assertEqual(cache.clear(), 1)
+        with self.assertRaises(FileNotFoundError):
+            cache.get(self.path)
+
+    def test_reload_endpoint_swaps_in_a_new_generation(self) -> None:
+        client = TestClient(app)
+        before = client.get("/cats/registry")
+        self.assertEqual(before.status_code, 200)
+        self.assertEqual(client.post("/cats/registry/reload").status_code, 403)
+        with mock.patch.dict(os.environ, {"RGPT_OPS_TOKEN": "s3cret"}):
+            reloaded = client.post("/cats/registry/reload", headers={"x-ops-token": "s3cret"})
+        self.assertEqual(reloaded.status_code, 200, reloaded.text)
+        self.assertNotIn("root", reloaded.json()["watcher"])
+        self.assertGreaterEqual(reloaded.json()["dropped"], 1)
+        generation = reloaded.json()["watcher"]["generation"]
+        self.assertGreater(generation, int(before.headers["x-registry-generation"]))
+        self.assertEqual(client.get("/cats/registry").headers["x-registry-generation"], str(generation))
+
+    def test_passport_index_is_built_once_per_load(self) -> None:
+        register = {
+            "passports": [
+                {"passport_id": "P-1", "cat_id": "CAT-1"},
+                {"passport_id": "P-1", "cat_id": "CAT-dup"},
+                "not-a-passport",
+                {"passport_id": "P-2", "cat_id": "CAT-2"},
+            ]
+        }
+        self.path.write_text(json.dumps(register), encoding="utf-8")
+        cache = DocumentCache(ttl_s=3600.0)
+        index = police_register_index(cache.get(self.path))
+        self.assertIs(police_register_index(cache.get(self.path)), index)
+        self.assertEqual(index.passports_by_id["P-1"]["cat_id"], "CAT-1")
+        self.assertEqual(index.passports_by_cat_id["CAT-2"]["passport_id"], "P-2")
+
+        client = TestClient(app)
+        passport = client.get("/cats/RGPT-CAT-02/passport")
+        self.assertEqual(passport.status_code, 200, passport.text)
+        self.assertEqual(passport.json()["cat_id"], "RGPT-CAT-02")
+        self.assertEqual(client.get("/cats/RGPT-CAT-99/passport").status_code, 404)
+
+
+    def test_documents_are_served_with_strong_etags(self) -> None:
+        client = TestClient(app)
+        passport = client.get("/cats/RGPT-CAT-01/passport").json()
+        definition = client.get("/cats/RGPT-CAT-01/definition")
+        self.assertEqual(definition.status_code, 200, definition.text)
+        self.assertEqual(definition.headers["etag"], f'"{passport["bundle_digest"]}"')
+        self.assertIn("must-revalidate", definition.headers["cache-control"])
+        self.assertEqual(definition.json()["cat_id"], "RGPT-CAT-01")
+
+        for url in ("/cats/registry", "/cats/police-register", "/cats/RGPT-CAT-01/definition"):
+            etag = client.get(url).headers["etag"]
+            cached = client.get(url, headers={"If-None-Match": f'"other", {etag}'})
+            self.assertEqual(cached.status_code, 304, url)
+            self.assertEqual(cached.content, b"")
+            self.assertEqual(cached.headers["etag"], etag)
+            self.assertEqual(client.get(url, headers={"If-None-Match": '"stale"'}).status_code, 200)
+
+
+class RegistryWatcherTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.root = Path(tempfile.mkdtemp(prefix="cats_registry_watch_test_"))
+        (self.root / "definitions").mkdir()
+        self._write("registry_index.json", {"namespaces": {"acme/bot": {"cat_id": "CAT-1"}}})
+        self._write("police_register.demo.json", {"passports": [{"passport_id": "P-1", "cat_id": "CAT-1"}]})
+        self._write("definitions/CAT-1.json", {"cat_id": "CAT-1"})
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _write(self, relative: str, payload, raw: str = None) -> None:
+        path = self.root / relative
+        previous = path.stat().st_mtime_ns if path.exists() else 0
+        path.write_text(raw if raw is not None else json.dumps(payload), encoding="utf-8")
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, max(st.st_mtime_ns, previous + 1_000_000)))
+
+    def test_swaps_consistent_generations_and_keeps_last_good_tree(self) -> None:
+        watcher = RegistryWatcher(self.root, interval_s=0)
+        first = watcher.current()
+        self.assertEqual(first.generation, 1)
+        self.assertEqual(first.police_index.passports_by_cat_id["CAT-1"]["passport_id"], "P-1")
+        self.assertFalse(watcher.refresh())
+
+        self._write("police_register.demo.json", {"passports": [{"passport_id": "P-2", "cat_id": "CAT-1"}]})
+        self._write("definitions/CAT-2.json", {"cat_id": "CAT-2"})
+        self.assertTrue(watcher.refresh())
+        second = watcher.current()
+        self.assertEqual(second.generation, 2)
+        self.assertEqual(second.police_index.passports_by_cat_id["CAT-1"]["passport_id"], "P-2")
+        self.assertIs(second.definitions["CAT-1"], first.definitions["CAT-1"])
+        self.assertEqual(sorted(second.definitions), ["CAT-1", "CAT-2"])
+        self.assertEqual(first.police_index.passports_by_cat_id["CAT-1"]["passport_id"], "P-1")
+
+        self._write("registry_index.json", None, raw="{ half written")
+        self.assertFalse(watcher.refresh())
+        self.assertIs(watcher.current(), second)
+        self.assertEqual(watcher.metrics()["lastError"], {"registry_index.json": "invalid"})
+
+    def test_concurrent_first_reads_load_once_and_start_one_poller(self) -> None:
+        def pollers() -> set:
+            return {t for t in threading.enumerate() if t.name == "cats-registry-watcher"}
+
+        watcher = RegistryWatcher(self.root, interval_s=3600)
+        before = pollers()
+        barrier = threading.Barrier(8)
+        seen = []
+
+        def first_read() -> None:
+            barrier.wait()
+            seen.append(watcher.current())
+
+        readers = [threading.Thread(target=first_read) for _ in range(8)]
+        for reader in readers:
+            reader.start()
+        for reader in readers:
+            reader.join()
+        started = pollers() - before
+        self.assertEqual(watcher.metrics()["swaps"], 1)
+        self.assertEqual(len({id(snapshot) for snapshot in seen}), 1)
+        self.assertEqual(started, {watcher._thread})
+
+        watcher.stop()
+        self.assertFalse(any(t.is_alive() for t in started))
+
+    def test_current_rechecks_the_tree_when_no_poller_runs(self) -> None:
+        watcher = RegistryWatcher(self.root, interval_s=0)
+        first = watcher.current()
+        self.assertFalse(watcher.metrics()["running"])
+        self.assertIs(watcher.current(), first)
+
+        self._write("police_register.demo.json", {"passports": []})
+        second = watcher.current()
+        self.assertEqual(second.generation, first.generation + 1)
+        self.assertNotIn("CAT-1", second.police_index.passports_by_cat_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from replay.utils.hash_cache import FileDigestCache
+from replay.utils.hashing import MMAP_MIN_BYTES
+from replay.validators import artifact_manifest_validator as amv
+
+
+class ArtifactManifestValidatorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = Path(tempfile.mkdtemp(prefix="replay_artifacts_test_"))
+        self.cache = FileDigestCache(self._tmp / "cache.sqlite3")
+        old = time.time() - 60
+        entries = []
+        for name, data in (
+            ("a.txt", b"alpha\n"),
+            ("sub/b.bin", os.urandom(4096)),
+            ("big.bin", os.urandom(MMAP_MIN_BYTES + 12345)),
+        ):
+            path = self._tmp / "artifacts" / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            os.utime(path, (old, old))
+            entries.append({"path": name, "sha256": hashlib.sha256(data).hexdigest(), "size": len(data)})
+        self.manifest = self._tmp / "manifest.json"
+        self.manifest.write_text(json.dumps({"base_dir": "artifacts", "artifacts": entries}), encoding="utf-8")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def _validate(self) -> amv.ArtifactManifestResult:
+        return amv.validate_artifacts_manifest(str(self.manifest), cache=self.cache, workers=2)
+
+    def test_second_run_is_served_from_the_cache(self) -> None:
+        first = self._validate()
+        self.assertEqual((first.artifact_hashes_valid, first.errors), ("PASS", []))
+        self.assertEqual(first.stats["cache_hits"], 0)
+        self.assertGreater(first.stats["bytes_hashed"], MMAP_MIN_BYTES)
+
+        second = self._validate()
+        self.assertEqual(second.artifact_hashes_valid, "PASS")
+        self.assertEqual(second.stats["cache_hit_rate"], 1.0)
+        self.assertEqual(second.stats["bytes_hashed"], 0)
+
+    def test_changed_missing_and_recent_files(self) -> None:
+        self._validate()
+        a = self._tmp / "artifacts" / "a.txt"
+        a.write_bytes(b"ALPHA\n")  # same size, new mtime
+        (self._tmp / "artifacts" / "sub" / "b.bin").unlink()
+
+        result = self._validate()
+        self.assertEqual(result.artifact_hashes_valid, "FAIL")
+        self.assertEqual(sorted(result.errors), ["missing:sub/b.bin", "sha256_mismatch:a.txt"])
+        self.assertEqual(result.stats["cache_misses"], 1)
+        # a.txt was just written, so it is not trusted from the cache on the next run.
+        self.assertEqual(self._validate().stats["cache_misses"], 1)
+
+    def test_empty_manifest_is_unknown(self) -> None:
+        self.manifest.write_text(json.dumps({"artifacts": []}), encoding="utf-8")
+        self.assertEqual(self._validate().artifact_hashes_valid, "UNKNOWN")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from replay import replay_runner
+
+
+class ReplayBatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = Path(tempfile.mkdtemp(prefix="replay_batch_test_"))
+        template = json.loads(
+            (Path(replay_runner.__file__).resolve().parent / "replay_contract.cats_demo.json").read_text(encoding="utf-8")
+        )
+        for name in ("a", "b", "c"):
+            contract = json.loads(json.dumps(template))
+            contract["replay"]["outputs"] = {"evidence_dir": str(self._tmp / "evidence" / name)}
+            (self._tmp / f"{name}.json").write_text(json.dumps(contract), encoding="utf-8")
+        (self._tmp / "broken.json").write_text("{not json", encoding="utf-8")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def test_batch_summary_counts_statuses_and_stage_timings(self) -> None:
+        paths = replay_runner._collect_contract_paths(str(self._tmp), "*.json")
+        self.assertEqual([Path(p).name for p in paths], ["a.json", "b.json", "broken.json", "c.json"])
+
+        summary = replay_runner.run_batch(paths, workers=2)
+
+        self.assertEqual(summary["total"], 4)
+        self.assertEqual(summary["workers"], 2)
+        self.assertEqual(summary["by_status"].get("ERROR"), 1)
+        self.assertEqual(sum(summary["by_status"].values()), 4)
+        self.assertEqual(summary["exit_code"], 1)
+        self.assertIn(str(self._tmp / "broken.json"), [f["contract_path"] for f in summary["failures"]])
+        self.assertEqual(summary["stage_timings_ms"]["judge"]["count"], 3)
+        evidence_dirs = {r["evidence_dir"] for r in summary["results"] if r["evidence_dir"]}
+        self.assertEqual(len(evidence_dirs), 3)
+        for name in ("a", "b", "c"):
+            self.assertTrue((self._tmp / "evidence" / name / "replay_result.json").is_file())
+
+    def test_nested_contracts_with_the_same_name_get_distinct_labels(self) -> None:
+        for sub in ("one", "two"):
+            (self._tmp / sub).mkdir()
+            shutil.copy(self._tmp / "a.json", self._tmp / sub / "a.json")
+        paths = replay_runner._collect_contract_paths(str(self._tmp), "**/a.json")
+        self.assertEqual(len(paths), 3)
+        self.assertEqual(replay_runner._batch_run_labels(paths), ["a", "one__a", "two__a"])
+
+        (self._tmp / "a.yaml").write_text("{}", encoding="utf-8")
+        with self.assertRaises(ValueError):
+            replay_runner._batch_run_labels([str(self._tmp / "a.json"), str(self._tmp / "a.yaml")])
+
+
+if __name__ == "__main__":
+    unittest.main()
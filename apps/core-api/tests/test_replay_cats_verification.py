@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+from api.cats_registry_snapshot import registry_watcher
+from replay import replay_runner
+from replay.models import ReplayConfig, ReplayContext, ReplayPaths
+
+
+class CatsVerificationCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.mkdtemp(prefix="replay_cats_verify_test_")
+        paths = ReplayPaths(
+            execution_ledger_path="",
+            decision_ledger_path="",
+            artifacts_manifest_path="",
+            evidence_dir=self._tmp,
+            stage_reports_dir=self._tmp,
+            diff_report_path=str(Path(self._tmp) / "diff.json"),
+            replay_result_path=str(Path(self._tmp) / "result.json"),
+        )
+        self.ctx = ReplayContext(config=ReplayConfig(target_execution_id="test"), paths=paths)
+        replay_runner._CATS_VERIFICATION_CACHE.clear()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def _run(self, cat_id: str, now: datetime) -> dict:
+        contract = {"replay": {"inputs": {"source": "cats-demo", "cat_id": cat_id, "payload_json": "{}"}}}
+        artifact, _ = replay_runner._run_cats_demo_execution(contract, self.ctx, frozen_ts=now)
+        return artifact
+
+    def test_static_checks_are_cached_and_expiry_is_rechecked(self) -> None:
+        cache = replay_runner._CATS_VERIFICATION_CACHE
+        hits_before = cache.hits
+        valid = self._run("RGPT-CAT-01", datetime(2026, 3, 1, tzinfo=timezone.utc))
+        self.assertEqual(valid["passport_verification"]["status"], "OK")
+        expired = self._run("RGPT-CAT-01", datetime(2027, 1, 1, tzinfo=timezone.utc))
+        self.assertEqual(expired["passport_verification"]["status"], "EXPIRED")
+        self.assertEqual(cache.hits, hits_before + 1)
+        self.assertEqual(
+            expired["passport_verification_internal"]["bundle_digest_computed"],
+            valid["passport_verification_internal"]["bundle_digest_computed"],
+        )
+
+        missing = self._run("RGPT-CAT-99", datetime(2026, 3, 1, tzinfo=timezone.utc))
+        self.assertEqual(missing["passport_verification"]["status"], "MISSING")
+        self.assertIn("missing_file:", missing["passport_verification_internal"]["notes"][0])
+
+    def test_revocation_between_runs_is_seen_by_the_next_run(self) -> None:
+        cats_root = Path(self._tmp) / "cats"
+        shutil.copytree(replay_runner._CATS_ROOT, cats_root)
+        register_path = cats_root / "police_register.demo.json"
+        now = datetime(2026, 3, 1, tzinfo=timezone.utc)
+        self.addCleanup(lambda: registry_watcher(cats_root).stop())
+        with mock.patch.object(replay_runner, "_CATS_ROOT", cats_root):
+            # Make sure the background poller would not get there first.
+            with mock.patch.dict(os.environ, {"RGPT_CATS_REGISTRY_WATCH_INTERVAL_S": "3600"}):
+                first = self._run("RGPT-CAT-01", now)
+                self.assertEqual(first["passport_verification"]["status"], "OK")
+
+                register = json.loads(register_path.read_text(encoding="utf-8"))
+                for passport in register["passports"]:
+                    if passport["cat_id"] == "RGPT-CAT-01":
+                        passport["status"] = "REVOKED"
+                previous = register_path.stat().st_mtime_ns
+                register_path.write_text(json.dumps(register), encoding="utf-8")
+                st = register_path.stat()
+                os.utime(register_path, ns=(st.st_atime_ns, max(st.st_mtime_ns, previous + 1_000_000)))
+
+                second = self._run("RGPT-CAT-01", now)
+                self.assertEqual(second["passport_verification"]["status"], "REVOKED")
+
+
+if __name__ == "__main__":
+    unittest.main()
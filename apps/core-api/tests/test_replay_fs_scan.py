@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from replay.side_effect_tracker import _scan_files
+from replay.side_effects_snapshot import collect_snapshot
+from replay.utils.fs_scan import FileScan
+from replay.utils.hash_cache import LOOKUP_BATCH, FileDigestCache, FileKey, default_cache_path
+
+
+class FileScanTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = Path(tempfile.mkdtemp(prefix="replay_fs_scan_test_"))
+        old = time.time() - 60
+        for name in ("top.txt", "runs/a.txt", "runs/deep/b.txt"):
+            path = self._tmp / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(name, encoding="utf-8")
+            os.utime(path, (old, old))
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def test_nested_roots_and_stats_come_from_one_walk(self) -> None:
+        scan = FileScan()
+        self.assertEqual(sorted(scan.walk(str(self._tmp))), ["runs/a.txt", "runs/deep/b.txt", "top.txt"])
+        self.assertEqual(sorted(scan.walk(str(self._tmp / "runs"))), ["a.txt", "deep/b.txt"])
+        self.assertEqual(scan.stat(str(self._tmp / "runs" / "a.txt")).size, len("runs/a.txt"))
+        self.assertEqual(scan.summary()["walks"], 1)
+        self.assertEqual(scan.summary()["files_visited"], 3)
+        self.assertEqual(scan.summary()["stat_calls"], 0)
+
+        scan.invalidate()
+        scan.walk(str(self._tmp / "runs"))
+        self.assertEqual((scan.summary()["walks"], scan.summary()["files_visited"]), (2, 5))
+
+    def test_digests_are_computed_once_per_run(self) -> None:
+        scan = FileScan()
+        ctx = object()
+        snapshot = collect_snapshot(ctx, files_root=str(self._tmp), scan=scan)
+        self.assertEqual(snapshot.stats["hashed"], 3)
+
+        files = _scan_files([str(self._tmp / "runs")], scan)
+        self.assertEqual(
+            sorted(files.values()),
+            sorted(hashlib.sha256(n.encode()).hexdigest() for n in ("runs/a.txt", "runs/deep/b.txt")),
+        )
+        self.assertEqual(scan.summary()["hashed"], 3)
+        self.assertEqual(scan.summary()["memo_hits"], 2)
+
+    def test_recent_files_are_rehashed(self) -> None:
+        scan = FileScan()
+        fresh = self._tmp / "top.txt"
+        fresh.write_text("new", encoding="utf-8")
+        key = scan.stat(str(fresh))
+        scan.digests([key])
+        _, batch = scan.digests([key])
+        self.assertEqual((batch["memo_hits"], batch["hashed"]), (0, 1))
+
+
+class FileDigestCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = Path(tempfile.mkdtemp(prefix="replay_hash_cache_test_"))
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def test_batched_lookup_matches_exact_stats_over_one_connection(self) -> None:
+        cache = FileDigestCache(self._tmp / "cache.sqlite3")
+        self.addCleanup(cache.close)
+        old = time.time_ns() - 60 * 1_000_000_000
+        keys = [FileKey(f"/f{i}", i, old, i) for i in range(LOOKUP_BATCH * 2 + 1)]
+        self.assertEqual(cache.put_many((key, f"d{key.size}") for key in keys), len(keys))
+        conn = cache._conn
+
+        touched = FileKey(keys[1].path, keys[1].size, old + 1, keys[1].inode)
+        found = cache.get_many([touched, FileKey("/missing", 0, old, 0)] + keys[2:])
+        self.assertIs(cache._conn, conn)
+        self.assertEqual(len(found), len(keys) - 2)
+        self.assertNotIn(touched.path, found)
+        self.assertEqual(found[keys[-1].path], f"d{keys[-1].size}")
+
+    def test_default_path_is_outside_the_source_tree(self) -> None:
+        with mock.patch.dict(os.environ, {"RGPT_REPLAY_HASH_CACHE_PATH": "", "XDG_CACHE_HOME": str(self._tmp)}):
+            self.assertEqual(default_cache_path(), self._tmp / "rocketgpt" / "replay_hash_cache.sqlite3")
+        with mock.patch.dict(os.environ, {"RGPT_REPLAY_HASH_CACHE_PATH": "off"}):
+            self.assertIsNone(default_cache_path())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from replay.validators.hash_chain_validator import GENESIS_HASH, chain_events, validate_hash_chain
+
+
+def _events(n: int) -> list:
+    return list(chain_events({"idx": i, "type": "STEP", "pad": "x" * (i % 7)} for i in range(n)))
+
+
+class HashChainValidatorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = Path(tempfile.mkdtemp(prefix="replay_hash_chain_test_"))
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def _ndjson(self, name: str, events: list) -> str:
+        path = self._tmp / name
+        path.write_text("".join(json.dumps(e) + "\n" for e in events), encoding="utf-8")
+        return str(path)
+
+    def test_valid_chain_passes_serially_and_in_segments(self) -> None:
+        events = _events(500)
+        self.assertEqual(events[0]["prev_hash"], GENESIS_HASH)
+        path = self._ndjson("good.ndjson", events)
+        serial = validate_hash_chain(path, workers=1)
+        parallel = validate_hash_chain(path, workers=2, parallel_min_bytes=0)
+        for result in (serial, parallel):
+            self.assertEqual(result.ledger_hash_chain_valid, "PASS")
+            self.assertEqual(result.events_checked, 500)
+        self.assertEqual(parallel.segments, 4)
+
+    def test_first_broken_link_is_reported(self) -> None:
+        events = _events(500)
+        tampered = [dict(e) for e in events]
+        tampered[321]["pad"] = "changed"
+        dropped = events[:200] + events[201:]
+        for events_, index, reason in ((tampered, 321, "hash_mismatch"), (dropped, 200, "prev_hash_mismatch")):
+            path = self._ndjson(f"bad_{index}.ndjson", events_)
+            for workers in (1, 2):
+                result = validate_hash_chain(path, workers=workers, parallel_min_bytes=0)
+                self.assertEqual(result.ledger_hash_chain_valid, "FAIL")
+                self.assertEqual(result.first_broken_index, index)
+                self.assertEqual(result.errors, [f"broken_link_at:{index}:{reason}"])
+
+    def test_json_document_ledgers_are_streamed(self) -> None:
+        path = self._tmp / "ledger.json"
+        path.write_text(json.dumps({"schema_version": "v1", "events": _events(50)}), encoding="utf-8")
+        self.assertEqual(validate_hash_chain(str(path)).ledger_hash_chain_valid, "PASS")
+
+    def test_unchained_and_empty_ledgers_are_unknown(self) -> None:
+        plain = self._ndjson("plain.ndjson", [{"idx": 0}, {"idx": 1}])
+        self.assertEqual(validate_hash_chain(plain).errors, ["no_hash_chain"])
+        empty = self._ndjson("empty.ndjson", [])
+        result = validate_hash_chain(empty)
+        self.assertEqual((result.ledger_hash_chain_valid, result.errors), ("UNKNOWN", ["empty_ledger"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
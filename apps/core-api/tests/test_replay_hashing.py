@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from replay.utils.hashing import MMAP_MIN_BYTES, READ_CHUNK_BYTES, hash_file, hash_files
+
+
+class HashingEngineTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = Path(tempfile.mkdtemp(prefix="replay_hashing_test_"))
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def _file(self, name: str, data: bytes) -> str:
+        path = self._tmp / name
+        path.write_bytes(data)
+        return str(path)
+
+    def test_streamed_and_mmapped_digests_match_hashlib(self) -> None:
+        for name, size in (("empty", 0), ("chunked", READ_CHUNK_BYTES * 2 + 7), ("mapped", MMAP_MIN_BYTES + 1)):
+            data = os.urandom(size)
+            path = self._file(name, data)
+            self.assertEqual(hash_file(path), hashlib.sha256(data).hexdigest(), name)
+
+    def test_results_keep_input_order(self) -> None:
+        blobs = [os.urandom(1000 + i) for i in range(40)]
+        paths = [self._file(f"f{i}", blob) for i, blob in enumerate(blobs)]
+        paths.insert(5, str(self._tmp / "missing"))
+        expected = [hashlib.sha256(blob).hexdigest() for blob in blobs]
+        expected.insert(5, None)
+        self.assertEqual(hash_files(paths, workers=8), expected)
+        self.assertEqual(hash_files(paths, workers=1), expected)
+        self.assertEqual(hash_files([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from replay.judge.judge_engine import compare_ledger_files
+from replay.utils.io import _JsonScanner, iter_ledger_events, ledger_format, summarize_ledger
+
+
+def _events(n: int) -> list:
+    return [{"idx": i, "type": "STEP", "note": "a,]}\"b", "big": 10**20 + i} for i in range(n)]
+
+
+class StreamingLedgerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = Path(tempfile.mkdtemp(prefix="replay_ledger_io_test_"))
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def _write(self, name: str, text: str) -> str:
+        path = self._tmp / name
+        path.write_text(text, encoding="utf-8")
+        return str(path)
+
+    def test_all_formats_yield_the_same_window(self) -> None:
+        events = _events(300)
+        paths = {
+            "object": self._write(
+                "object.json",
+                json.dumps({"schema_version": "v1", "events": events, "execution_id": "x"}, indent=2),
+            ),
+            "array": self._write("array.json", json.dumps(events)),
+            "ndjson": self._write("ledger.ndjson", "\n".join(json.dumps(e) for e in events) + "\n"),
+        }
+        for fmt, path in paths.items():
+            self.assertEqual(ledger_format(path), fmt)
+            window = list(iter_ledger_events(path, 10, 12))
+            self.assertEqual([idx for idx, _ in window], [10, 11, 12])
+            self.assertEqual(window[0][1], events[10])
+            self.assertEqual(summarize_ledger(path).event_count, 300)
+            self.assertEqual(summarize_ledger(path, 290).event_count, 10)
+        self.assertEqual(summarize_ledger(paths["object"]).fields, {"schema_version": "v1", "execution_id": "x"})
+
+    def test_reading_stops_after_the_window(self) -> None:
+        good = ",".join(json.dumps(e) for e in _events(5))
+        path = self._write("truncated.json", '{"events": [' + good + ", {broken")
+        self.assertEqual([idx for idx, _ in iter_ledger_events(path, 0, 4)], [0, 1, 2, 3, 4])
+        with self.assertRaises(ValueError):
+            list(iter_ledger_events(path))
+
+    def test_summary_and_judge_never_decode_events_beyond_the_window(self) -> None:
+        good = ",".join(json.dumps(e) for e in _events(5))
+        # Balanced but not valid JSON: only skipped over, never decoded.
+        bad_tail = ', {"bad": tru, "s": "]}\\"{"}, [01, {"x": }]'
+        exec_path = self._write(
+            "exec.json", '{"events": [' + good + bad_tail + '], "schema_version": "v1", "execution_id": "x"}'
+        )
+        dec_path = self._write(
+            "dec.ndjson", "\n".join(json.dumps(e) for e in _events(5)) + "\n{broken\n"
+        )
+        for path in (exec_path, dec_path):
+            self.assertEqual(summarize_ledger(path, 1, 4).event_count, 4)
+            with self.assertRaises(ValueError):
+                summarize_ledger(path)
+        self.assertEqual(summarize_ledger(exec_path, 0, 4).fields, {"schema_version": "v1", "execution_id": "x"})
+        clean_path = self._write(
+            "clean.json", '{"schema_version": "v1", "execution_id": "x", "events": [' + good + "]}"
+        )
+        mismatch, fields, _ = compare_ledger_files(exec_path, clean_path, 0, 4)
+        self.assertFalse(mismatch, fields)
+
+    def test_windowed_judge_compares_fields_after_the_events(self) -> None:
+        paths = [
+            self._write(
+                f"{name}.json",
+                json.dumps({"events": _events(10), "schema_version": "v1", "execution_id": name}),
+            )
+            for name in ("A", "B")
+        ]
+        for window in ((), (0, 3)):
+            mismatch, fields, _ = compare_ledger_files(*paths, *window)
+            self.assertEqual((mismatch, fields), (True, ["execution_id"]))
+
+    def test_skip_steps_over_values_split_across_small_chunks(self) -> None:
+        values = [{"a": ["]", "\\\"", {"b": "}"}]}, "x\\\\", 12345, [[], {}], True]
+        path = self._write("skip.json", json.dumps(values) + "\n")
+        with open(path, "r", encoding="utf-8") as fh:
+            scanner = _JsonScanner(fh, chunk_chars=3)
+            scanner.expect("[")
+            seen = 0
+            for idx, _ in enumerate(scanner.items("]")):
+                if idx % 2:
+                    self.assertEqual(scanner.value(), values[idx])
+                else:
+                    scanner.skip()
+                seen += 1
+            self.assertEqual((seen, scanner.peek()), (len(values), ""))
+
+    def test_values_split_across_small_chunks(self) -> None:
+        values = [1, 22, 333, "x" * 50, {"k": [1, 2]}, 4444.5, None, True]
+        path = self._write("values.json", json.dumps(values))
+        with open(path, "r", encoding="utf-8") as fh:
+            scanner = _JsonScanner(fh, chunk_chars=3)
+            scanner.expect("[")
+            decoded = [scanner.value() for _ in scanner.items("]")]
+        self.assertEqual(decoded, values)
+
+    def test_judge_compares_counts_inside_the_window(self) -> None:
+        exec_path = self._write("exec.json", json.dumps({"schema_version": "v1", "events": _events(10)}))
+        dec_path = self._write("dec.ndjson", "\n".join(json.dumps(e) for e in _events(6)))
+        mismatched, fields, _ = compare_ledger_files(exec_path, dec_path)
+        self.assertTrue(mismatched)
+        self.assertEqual(fields, ["schema_version", "events.count"])
+        _, fields, notes = compare_ledger_files(exec_path, dec_path, 0, 5)
+        self.assertEqual(fields, ["schema_version"])
+        self.assertIn("window[0..5]", notes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import fnmatch
+import itertools
+import unittest
+
+from replay.side_effect_tracker import PatternSet, compile_patterns
+
+PATTERNS = [
+    "apps/core-api/replay/evidence/**",
+    "docs/ops/executions/RGPT-*/*.json",
+    "docs/*/notes?.md",
+    "**/*.tmp",
+    "*.log",
+    "cats/[a-c]*/def[0-9].json",
+    "cats/[!x]/keep",
+    "weird/[a]]",
+    "weird/open[bracket",
+    "exact/file.txt",
+]
+PATHS = [
+    "apps/core-api/replay/evidence/run/x.json",
+    "apps/core-api/replay/evidence",
+    "docs/ops/executions/RGPT-S4/a.json",
+    "docs/ops/executions/RGPT-S4/deep/a.json",
+    "docs/ops/notes1.md",
+    "docs/ops/notes12.md",
+    "a/b/c.tmp",
+    "c.tmp",
+    "top.log",
+    "nested/dir/top.log",
+    "cats/abc/def7.json",
+    "cats/zzz/def7.json",
+    "cats/y/keep",
+    "cats/x/keep",
+    "weird/a]",
+    "weird/open[bracket",
+    "exact/file.txt",
+    "exact/file.txt.bak",
+    "",
+]
+
+
+class PatternSetTests(unittest.TestCase):
+    def test_agrees_with_fnmatch(self) -> None:
+        for size in (1, 2, len(PATTERNS)):
+            for subset in itertools.combinations(PATTERNS, size) if size < 3 else [PATTERNS]:
+                compiled = PatternSet(subset)
+                for path in PATHS:
+                    expected = any(fnmatch.fnmatch(path, pat) for pat in subset)
+                    self.assertEqual(compiled.matches(path), expected, (subset, path))
+
+    def test_empty_set_matches_nothing(self) -> None:
+        self.assertFalse(PatternSet([]))
+        self.assertFalse(PatternSet([]).matches("anything"))
+
+    def test_compiled_once_per_pattern_list(self) -> None:
+        self.assertIs(compile_patterns(("a/**",)), compile_patterns(("a/**",)))
+
+
+if __name__ == "__main__":
+    unittest.main()
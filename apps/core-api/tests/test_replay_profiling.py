@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from replay import replay_runner
+from replay.profiling import StageMeter
+
+
+class StageMeterTests(unittest.TestCase):
+    def test_read_bytes_exclude_meter_overhead(self) -> None:
+        meter = StageMeter()
+        with meter.stage("noop"):
+            pass
+        with meter.stage("read"):
+            size = len(Path(replay_runner.__file__).read_bytes())
+        noop, read = meter.stages["noop"], meter.stages["read"]
+        if noop.read_bytes is None:
+            self.skipTest("/proc/self/io is not available")
+        self.assertEqual(noop.read_bytes, 0)
+        self.assertGreaterEqual(read.read_bytes, size)
+        self.assertEqual(meter.rollup()["total"]["read_bytes"], read.read_bytes)
+
+
+class ReplayProfileTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = Path(tempfile.mkdtemp(prefix="replay_profile_test_"))
+        contract = json.loads(
+            (Path(replay_runner.__file__).resolve().parent / "replay_contract.cats_demo.json").read_text(encoding="utf-8")
+        )
+        contract["replay"]["outputs"] = {"evidence_dir": str(self._tmp / "evidence")}
+        self.contract_path = self._tmp / "contract.json"
+        self.contract_path.write_text(json.dumps(contract), encoding="utf-8")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def test_stage_reports_carry_profiles_and_pstats_is_dumped(self) -> None:
+        outcome = replay_runner.run_detailed(str(self.contract_path), verbose=False, profile=True)
+
+        evidence = self._tmp / "evidence"
+        for name, stage in (
+            ("01_collector_report.json", "collector"),
+            ("02_inspector_report.json", "inspector"),
+            ("03_commissioner_report.json", "commissioner"),
+            ("04_judge_report.json", "judge"),
+        ):
+            report = json.loads((evidence / "stage_reports" / name).read_text(encoding="utf-8"))
+            self.assertEqual(report["profile"]["stage"], stage)
+            self.assertGreaterEqual(report["profile"]["wall_ms"], 0)
+
+        result = json.loads((evidence / "replay_result.json").read_text(encoding="utf-8"))
+        stages = [s["stage"] for s in result["profile"]["stages"]]
+        self.assertEqual(stages[0], "snapshot_begin")
+        self.assertIn("side_effects", stages)
+        self.assertEqual(set(outcome.stage_timings_ms), set(stages))
+        self.assertEqual(result["profile_dump_path"], outcome.profile_dump_path)
+        self.assertTrue(Path(outcome.profile_dump_path).is_file())
+
+
+if __name__ == "__main__":
+    unittest.main()
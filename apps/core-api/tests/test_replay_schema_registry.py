@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from replay.schema_registry import SchemaCompileError, SchemaRegistry, schema_registry
+from replay.validators.schema_compat_validator import validate_schema_compatibility
+
+SAMPLES = Path(__file__).resolve().parents[1] / "replay" / "sample_inputs"
+
+
+class SchemaRegistryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = Path(tempfile.mkdtemp(prefix="replay_schema_test_"))
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def _write(self, name: str, obj: object) -> str:
+        path = self._tmp / name
+        path.write_text(json.dumps(obj), encoding="utf-8")
+        return str(path)
+
+    def test_registry_is_compiled_once_and_maps_versions(self) -> None:
+        registry = schema_registry()
+        self.assertIs(registry, schema_registry())
+        self.assertIn("rgpt-cat-definition.schema.json", registry.names())
+        self.assertEqual(registry.compatibility_matrix()["rgpt.replay.ledger.v1"], ["rgpt.replay.ledger.v1"])
+        judge = registry.schema("judge_report.schema.json")
+        self.assertTrue(
+            judge.is_valid({"stage": "judge", "verdict": "MATCH", "divergence_detected": False, "timestamp_utc": "2026-02-13T00:00:00Z"})
+        )
+        self.assertEqual(
+            judge.errors({"stage": "judge", "verdict": "MATCH", "divergence_detected": 0, "timestamp_utc": "x"}),
+            ["/divergence_detected: expected boolean", "/timestamp_utc: not a date-time"],
+        )
+
+    def test_unsupported_keywords_fail_compilation(self) -> None:
+        (self._tmp / "odd.schema.json").write_text(json.dumps({"type": "object", "dependentRequired": {}}), encoding="utf-8")
+        with self.assertRaises(SchemaCompileError):
+            SchemaRegistry([self._tmp])
+
+    def test_sample_ledgers_are_compatible(self) -> None:
+        result = validate_schema_compatibility(
+            str(SAMPLES / "execution_ledger.sample.json"), str(SAMPLES / "decision_ledger.sample.json")
+        )
+        self.assertEqual((result.schema_versions_compatible, result.errors), ("PASS", []))
+        self.assertEqual(result.stats["execution"]["events_validated"], 2)
+
+    def test_streamed_events_are_validated(self) -> None:
+        good = self._write("good.json", [{"schema_version": "rgpt.replay.ledger.v1", "type": "START", "idx": 0}])
+        bad = self._write("bad.json", [{"schema_version": "rgpt.replay.ledger.v1", "type": "START"}, {"idx": -1}])
+        result = validate_schema_compatibility(good, bad)
+        self.assertEqual(result.schema_versions_compatible, "FAIL")
+        self.assertEqual(result.errors, ["decision:event[1]/type: required", "decision:event[1]/idx: less than 0"])
+
+    def test_missing_unsupported_and_incompatible_versions(self) -> None:
+        good = self._write("good.json", {"schema_version": "rgpt.replay.ledger.v1", "events": []})
+        plain = self._write("plain.json", {"events": [{"type": "START"}]})
+        self.assertEqual(validate_schema_compatibility(good, plain).errors, ["decision:no_schema_version"])
+        future = self._write("future.json", {"schema_version": "rgpt.replay.ledger.v9", "events": []})
+        result = validate_schema_compatibility(good, future)
+        self.assertEqual(result.errors, ["decision:unsupported_schema_version:rgpt.replay.ledger.v9"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from replay.side_effect_tracker import SideEffectTracker
+
+
+class SideEffectTrackerBeginEndTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = Path(tempfile.mkdtemp(prefix="replay_tracker_test_")).resolve()
+        self.root = self._tmp / "scan"
+        old = time.time() - 60
+        for name in ("keep/a.txt", "keep/b.txt", "out/old.json"):
+            path = self.root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(name, encoding="utf-8")
+            os.utime(path, (old, old))
+        self.prefix = self.root.as_posix()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def _ctx(self, **policy) -> SimpleNamespace:
+        side_effects = {"scan_roots": [str(self.root)], **policy}
+        return SimpleNamespace(runtime_mode="DEV", contract={"side_effects": side_effects})
+
+    def test_only_changes_are_evaluated(self) -> None:
+        ctx = self._ctx(allowed_files=[f"{self.prefix}/out/**"], max_unexpected_effects=0)
+        baseline = SideEffectTracker.begin(ctx)
+        self.assertEqual(len(baseline.files), 3)
+        (self.root / "out" / "new.json").write_text("{}", encoding="utf-8")
+
+        report = SideEffectTracker.end(ctx, baseline)
+        # keep/* exist but were not touched, so they are not unexpected
+        self.assertEqual((report.drift_class, report.verdict), ("D0", "PASS"))
+        self.assertEqual(report.created_files, [f"{self.prefix}/out/new.json"])
+        self.assertEqual(SideEffectTracker.validate(ctx).drift_class, "D2")
+
+    def test_changes_outside_allowlist_are_unexpected(self) -> None:
+        ctx = self._ctx(allowed_files=[f"{self.prefix}/out/**"], max_unexpected_effects=0)
+        baseline = SideEffectTracker.begin(ctx)
+        (self.root / "keep" / "a.txt").write_text("changed!", encoding="utf-8")
+        report = SideEffectTracker.end(ctx, baseline)
+        self.assertEqual(report.modified_files, [f"{self.prefix}/keep/a.txt"])
+        self.assertEqual(report.unexpected_files, [f"{self.prefix}/keep/a.txt"])
+        self.assertEqual((report.drift_class, report.verdict), ("D2", "FAIL"))
+
+    def test_deletes_outside_allowlist_are_destructive(self) -> None:
+        ctx = self._ctx(allowed_files=[f"{self.prefix}/out/**"], max_unexpected_effects=5)
+        baseline = SideEffectTracker.begin(ctx)
+        (self.root / "out" / "old.json").unlink()
+        self.assertEqual(SideEffectTracker.end(ctx, baseline).drift_class, "D0")
+
+        baseline = SideEffectTracker.begin(ctx)
+        (self.root / "keep" / "b.txt").unlink()
+        report = SideEffectTracker.end(ctx, baseline)
+        self.assertEqual(report.deleted_files, [f"{self.prefix}/keep/b.txt"])
+        self.assertEqual((report.drift_class, report.verdict), ("D3", "FAIL"))
+
+    def test_blocklist_only_policy_flags_only_blocked_deletes(self) -> None:
+        ctx = self._ctx(blocked_files=[f"{self.prefix}/keep/b.txt"], max_unexpected_effects=0)
+        baseline = SideEffectTracker.begin(ctx)
+        (self.root / "out" / "old.json").unlink()
+        report = SideEffectTracker.end(ctx, baseline)
+        self.assertEqual(report.deleted_files, [f"{self.prefix}/out/old.json"])
+        self.assertEqual((report.drift_class, report.verdict), ("D0", "PASS"))
+
+        baseline = SideEffectTracker.begin(ctx)
+        (self.root / "keep" / "b.txt").unlink()
+        report = SideEffectTracker.end(ctx, baseline)
+        self.assertEqual(report.unexpected_files, [f"{self.prefix}/keep/b.txt"])
+        self.assertEqual((report.drift_class, report.verdict), ("D3", "FAIL"))
+
+    def test_racy_same_size_rewrite_is_detected(self) -> None:
+        path = self.root / "keep" / "a.txt"
+        path.write_text("aaaa", encoding="utf-8")
+        ctx = self._ctx()
+        baseline = SideEffectTracker.begin(ctx)
+        st = path.stat()
+        path.write_text("bbbb", encoding="utf-8")
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        report = SideEffectTracker.end(ctx, baseline)
+        self.assertEqual(report.modified_files, [f"{self.prefix}/keep/a.txt"])
+
+    def test_disabled_without_scan_roots(self) -> None:
+        ctx = SimpleNamespace(runtime_mode="DEV", contract={"side_effects": {}})
+        report = SideEffectTracker.end(ctx, SideEffectTracker.begin(ctx))
+        self.assertEqual(report.drift_class, "D0")
+        self.assertIn("detection disabled", report.notes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from replay.side_effects_snapshot import collect_snapshot, diff_snapshots, diff_trees
+from replay.utils.hash_cache import FileDigestCache
+
+CTX = SimpleNamespace(runtime_mode="STRICT", policy_version="p1", contract_hash="c1")
+
+
+class SideEffectsSnapshotTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = Path(tempfile.mkdtemp(prefix="replay_snapshot_test_"))
+        self.root = self._tmp / "executions"
+        self.cache = FileDigestCache(self._tmp / "cache.sqlite3")
+        old = time.time() - 60
+        for name in ("a.json", "run-1/b.json", "run-1/deep/c.log"):
+            path = self.root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(name, encoding="utf-8")
+            os.utime(path, (old, old))
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def _snap(self, previous=None, cache=None):
+        return collect_snapshot(CTX, files_root=str(self.root), previous=previous, cache=cache)
+
+    def test_end_snapshot_reuses_begin_digests(self) -> None:
+        begin = self._snap()
+        self.assertEqual(begin.stats["hashed"], 3)
+        end = self._snap(previous=begin)
+        self.assertEqual((end.stats["reused"], end.stats["hashed"]), (3, 0))
+        self.assertEqual(end.file_hash, begin.file_hash)
+        self.assertFalse(diff_snapshots(begin, end)["file_drift"])
+
+    def test_changed_files_are_rehashed(self) -> None:
+        begin = self._snap()
+        (self.root / "run-1" / "b.json").write_text("B-CHANGED", encoding="utf-8")
+        (self.root / "run-1" / "new.json").write_text("{}", encoding="utf-8")
+        end = self._snap(previous=begin)
+        self.assertEqual((end.stats["reused"], end.stats["hashed"]), (2, 2))
+        self.assertEqual(diff_snapshots(begin, end)["drift_class"], "D1")
+
+    def test_recently_written_files_are_not_trusted_by_stat(self) -> None:
+        fresh = self.root / "a.json"
+        fresh.write_text("a.json", encoding="utf-8")
+        begin = self._snap()
+        end = self._snap(previous=begin)
+        self.assertEqual((end.stats["reused"], end.stats["hashed"]), (2, 1))
+        self.assertEqual(end.file_hash, begin.file_hash)
+
+    def test_persistent_cache_and_full_mode(self) -> None:
+        first = self._snap(cache=self.cache)
+        second = self._snap(cache=self.cache)
+        self.assertEqual((second.stats["cache_hits"], second.stats["hashed"]), (3, 0))
+        with mock.patch.dict(os.environ, {"RGPT_REPLAY_SNAPSHOT_MODE": "full"}):
+            full = self._snap(previous=second, cache=self.cache)
+        self.assertEqual(full.stats["hashed"], 3)
+        self.assertEqual({first.file_hash, second.file_hash, full.file_hash}, {full.file_hash})
+
+    def test_diff_reports_changed_paths(self) -> None:
+        begin = self._snap()
+        (self.root / "run-1" / "b.json").write_text("B-CHANGED", encoding="utf-8")
+        (self.root / "run-1" / "deep" / "c.log").unlink()
+        (self.root / "run-2" / "x").mkdir(parents=True)
+        (self.root / "run-2" / "x" / "d.json").write_text("{}", encoding="utf-8")
+        end = self._snap(previous=begin)
+        changes = diff_snapshots(begin, end)["file_changes"]
+        self.assertEqual(changes["added"], ["run-2/x/d.json"])
+        self.assertEqual(changes["removed"], ["run-1/deep/c.log"])
+        self.assertEqual(changes["modified"], ["run-1/b.json"])
+        self.assertEqual(changes["counts"], {"added": 1, "removed": 1, "modified": 1})
+        self.assertFalse(changes["truncated"])
+
+    def test_diff_skips_unchanged_subtrees(self) -> None:
+        begin = self._snap()
+        (self.root / "a.json").write_text("A", encoding="utf-8")
+        end = self._snap(previous=begin)
+        self.assertEqual(begin.tree["run-1"], end.tree["run-1"])
+        self.assertNotEqual(begin.tree[""].digest, end.tree[""].digest)
+        self.assertEqual(end.file_hash, end.tree[""].digest)
+        with mock.patch("replay.side_effects_snapshot._subtree_files") as subtree:
+            self.assertEqual(diff_trees(begin, end), {"added": [], "removed": [], "modified": ["a.json"]})
+        subtree.assert_not_called()
+
+    def test_missing_root_is_empty(self) -> None:
+        begin = self._snap()
+        shutil.rmtree(self.root)
+        end = self._snap()
+        self.assertEqual(end.file_hash, "EMPTY")
+        self.assertEqual(diff_snapshots(begin, end)["file_changes"]["counts"]["removed"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()